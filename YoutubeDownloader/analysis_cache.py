@@ -0,0 +1,174 @@
+"""
+Analysis Cache - Persistent SQLite cache of Gemini video analyses
+
+A response is keyed by the content hash of the video, the normalised prompt
+text, the model name and the generation config, so re-running a prompt on
+the same video (under any file name) returns the stored response without an
+upload, a processing wait or inference. Entries hold the response text and
+the scenes parsed from it, expire after max_age and are evicted least
+recently used first once the cache outgrows max_bytes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from YoutubeDownloader.definitions import CACHE_FOLDER
+from YoutubeDownloader.sqlite_lru import LRUStore
+from YoutubeDownloader.youtube_utils import parse_timestamp
+
+ANALYSIS_DB_FILE = "analysis.sqlite"
+DEFAULT_MAX_AGE = 180 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+SCENE_HEADER = re.compile(r"^\s*\**\s*Scene\s+(\d+)\s*[:.\-]?\s*(.*?)\**\s*$", re.IGNORECASE)
+SCENE_TIME = re.compile(
+    r"Time\**\s*:?\**\s*([\d:.]+)\s*(?:-|–|to)\s*([\d:.]+)", re.IGNORECASE
+)
+SCENE_DESCRIPTION = re.compile(r"Description\**\s*:?\**\s*(.+)$", re.IGNORECASE)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompt text with whitespace differences removed"""
+    lines = [" ".join(line.split()) for line in prompt.strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def analysis_key(
+    content_hash: str, prompt: str, model_name: str, generation_config: Optional[Dict] = None
+) -> str:
+    """Cache key of one analysis request"""
+    payload = json.dumps(
+        [content_hash, normalize_prompt(prompt), model_name, generation_config or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_scenes(text: str) -> List[Dict]:
+    """
+    Scenes of a response in the "**Scene N: Title**" / "* **Time:** 00:00 - 00:06"
+    layout the scene prompts produce
+
+    Returns:
+        Dicts with index, title, start and end (seconds) and description;
+        scenes without a time range are skipped
+    """
+    scenes = []
+    current = None
+    for line in text.splitlines():
+        header = SCENE_HEADER.match(line)
+        if header:
+            current = {"index": int(header.group(1)), "title": header.group(2).strip(" *")}
+            continue
+        if current is None:
+            continue
+        times = SCENE_TIME.search(line)
+        if times and "start" not in current:
+            try:
+                current["start"] = parse_timestamp(times.group(1))
+                current["end"] = parse_timestamp(times.group(2))
+            except ValueError:
+                continue
+            scenes.append(current)
+            continue
+        description = SCENE_DESCRIPTION.search(line)
+        if description and "start" in current:
+            current["description"] = description.group(1).strip()
+    return scenes
+
+
+class AnalysisCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize the analysis cache
+
+        Args:
+            path: SQLite file (default: CACHE_FOLDER/analysis.sqlite)
+            max_age: Seconds a response is served from the cache
+            max_bytes: Total payload size above which least recently used
+                entries are evicted
+        """
+        if path is None:
+            os.makedirs(CACHE_FOLDER, exist_ok=True)
+            path = os.path.join(CACHE_FOLDER, ANALYSIS_DB_FILE)
+        self.path = path
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.store = LRUStore(
+            path,
+            "analyses",
+            (
+                "key TEXT NOT NULL",
+                "content_hash TEXT NOT NULL",
+                "model TEXT NOT NULL",
+                "response TEXT NOT NULL",
+                "scenes TEXT NOT NULL",
+                "size INTEGER NOT NULL",
+                "created_at REAL NOT NULL",
+                "accessed_at REAL NOT NULL",
+            ),
+            ("key",),
+            max_bytes,
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached analysis
+
+        Returns:
+            {"response": text, "scenes": [...]} or None on a miss
+        """
+        now = time.time()
+        with self.store.lock:
+            row = self.store.read(("response", "scenes", "created_at"), key=key)
+            if row is None or now - row[2] > self.max_age:
+                self.store.miss()
+                return None
+            self.store.hit(now, key=key)
+        return {"response": row[0], "scenes": json.loads(row[1])}
+
+    def put(self, key: str, content_hash: str, model_name: str, response: str) -> Dict:
+        """Store a response together with the scenes parsed from it"""
+        scenes = parse_scenes(response)
+        data = json.dumps(scenes, ensure_ascii=False)
+        now = time.time()
+        self.store.write(
+            [{"key": key, "content_hash": content_hash, "model": model_name,
+              "response": response, "scenes": data,
+              "size": len(response.encode()) + len(data.encode()),
+              "created_at": now, "accessed_at": now}],
+            expired=("created_at", now - self.max_age),
+        )
+        return {"response": response, "scenes": scenes}
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size of the cache"""
+        return self.store.stats()
+
+    def clear(self):
+        """Remove every cached analysis"""
+        self.store.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Return the process-wide analysis cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnalysisCache()
+        return _cache
@@ -0,0 +1,293 @@
+"""
+Async Downloader - asyncio API over the blocking downloader and extractor
+
+yt-dlp is synchronous, so every call runs on a thread pool owned by the
+AsyncYouTubeDownloader; callers await probe, extract and download and can
+schedule hundreds of jobs without managing threads. Progress reaches the
+event loop through an asyncio.Queue fed with call_soon_threadsafe, and a
+cancelled download is stopped from its own progress hook, after which the
+partial files it left behind are removed.
+
+    async with AsyncYouTubeDownloader("downloads", "720p") as dl:
+        async for event in dl.download_stream(url):
+            print(event["status"], event["downloaded_bytes"])
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from colorama import Fore, Style
+
+from YoutubeDownloader.channel_extractor import YouTubeChannelExtractor
+from YoutubeDownloader.channel_sync import iter_channel_entries
+from YoutubeDownloader.library_manifest import is_partial_file
+from YoutubeDownloader.youtube_downloader import YouTubeDownloader, video_id_of
+
+# Seconds between "downloading" events of one download on a progress stream
+PROGRESS_INTERVAL = 0.25
+# Statuses that end a progress stream
+TERMINAL_STATUSES = ("done", "cancelled")
+
+
+class DownloadCancelled(Exception):
+    """Raised from the progress hook to stop a cancelled download"""
+
+
+class _DownloadJob:
+    def __init__(
+        self,
+        url: str,
+        loop: asyncio.AbstractEventLoop,
+        queue: Optional[asyncio.Queue],
+        info: Optional[Dict] = None,
+    ):
+        self.url = url
+        self.video_id = video_id_of(url, info)
+        # Same key download_video queues the merge under
+        self.merge_key = self.video_id or url
+        self.loop = loop
+        self.queue = queue
+        self.cancelled = threading.Event()
+        self._last_event = 0.0
+
+    def hook(self, d: Dict):
+        """yt-dlp progress hook, called on a worker thread"""
+        if not self.video_id:
+            # Unrecognised URL: the partial files carry the extracted ID
+            self.video_id = (d.get("info_dict") or {}).get("id") or ""
+        if self.cancelled.is_set():
+            raise DownloadCancelled(self.url)
+        if self.queue is None:
+            return
+        now = time.monotonic()
+        if d["status"] == "downloading" and now - self._last_event < PROGRESS_INTERVAL:
+            return
+        self._last_event = now
+        self.publish({
+            "status": d["status"],
+            "downloaded_bytes": d.get("downloaded_bytes") or 0,
+            "total_bytes": d.get("total_bytes") or d.get("total_bytes_estimate"),
+            "speed": d.get("speed"),
+            "eta": d.get("eta"),
+            "filename": d.get("filename"),
+        })
+
+    def publish(self, event: Dict):
+        if self.queue is None:
+            return
+        event = dict(event, url=self.url)
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+        except RuntimeError:
+            # The event loop is already closed; nobody is listening
+            pass
+
+
+class AsyncYouTubeDownloader:
+    def __init__(
+        self,
+        output_dir: str = "downloads",
+        format_preference: str = "best",
+        max_workers: int = 8,
+        verbose: bool = False,
+        extract_dir: str = "extracted_urls",
+        **downloader_options,
+    ):
+        """
+        Initialize the async downloader
+
+        Args:
+            output_dir: Directory to save downloaded videos
+            format_preference: Preferred format (best, worst, mp4, 720p, etc.)
+            max_workers: Threads running blocking yt-dlp calls; further jobs
+                wait in the executor queue
+            verbose: Enable verbose logging for debugging
+            extract_dir: Directory the channel extractor writes URL lists to
+            **downloader_options: Further YouTubeDownloader options
+                (per_host_limit, max_video_bytes, concurrent_fragments, ...)
+        """
+        self.downloader = YouTubeDownloader(
+            output_dir, format_preference, verbose=verbose, **downloader_options
+        )
+        self.extract_dir = extract_dir
+        self._extractor: Optional[YouTubeChannelExtractor] = None
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="async-youtube")
+
+    async def __aenter__(self) -> "AsyncYouTubeDownloader":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Wait for running jobs and shut the executor down"""
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._executor.shutdown, True
+        )
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def probe(self, url: str) -> Optional[Dict]:
+        """Awaitable YouTubeDownloader.probe: the info dict, or None on failure"""
+        return await self._run(self.downloader.probe, url)
+
+    async def extract(
+        self, channel_url: str, max_videos: Optional[int] = None, incremental: bool = False
+    ) -> List[str]:
+        """Awaitable YouTubeChannelExtractor.extract_channel_urls"""
+        if self._extractor is None:
+            self._extractor = YouTubeChannelExtractor(self.extract_dir)
+        return await self._run(
+            self._extractor.extract_channel_urls, channel_url, max_videos, incremental
+        )
+
+    async def iter_channel_entries(
+        self, channel_url: str, max_videos: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield flat video entries of a channel as yt-dlp pages through it
+
+        Each page is fetched on the executor when the consumer asks for the
+        next entry; breaking out of the loop stops paging.
+
+        Args:
+            channel_url: YouTube channel, tab or playlist URL
+            max_videos: Stop after this many entries (None for all)
+        """
+        entries = iter_channel_entries(channel_url)
+        done = object()
+        count = 0
+        try:
+            while max_videos is None or count < max_videos:
+                entry = await self._run(next, entries, done)
+                if entry is done:
+                    break
+                count += 1
+                yield entry
+        finally:
+            # Returns the pooled session; run off the loop like the paging itself
+            await self._run(entries.close)
+
+    async def download(
+        self,
+        url: str,
+        format_id: Optional[str] = None,
+        info: Optional[Dict] = None,
+        progress: Optional[asyncio.Queue] = None,
+        clips: Optional[List[Tuple[float, float]]] = None,
+    ) -> bool:
+        """
+        Download a single video
+
+        Cancelling the awaiting task stops the download at its next progress
+        callback and removes its partial files before CancelledError
+        propagates.
+
+        Args:
+            url: YouTube URL
+            format_id: Specific format ID to download (optional)
+            info: Info dict from probe(); skips a second extraction when given
+            progress: Queue receiving progress events, ending with a "done"
+                (or "cancelled") event
+            clips: (start, end) ranges in seconds to download instead of
+                the whole video
+
+        Returns:
+            bool: True if download successful, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        job = _DownloadJob(url, loop, progress, info)
+
+        def run():
+            if job.cancelled.is_set():
+                raise DownloadCancelled(url)
+            return self.downloader.download_video(
+                url, format_id, info, extra_hooks=[job.hook], clips=clips
+            )
+
+        future = self._executor.submit(run)
+        try:
+            success = await asyncio.shield(asyncio.wrap_future(future))
+        except asyncio.CancelledError:
+            job.cancelled.set()
+            if not future.cancel():
+                # Already running: wait for the hook to stop it before cleaning up
+                try:
+                    await asyncio.wrap_future(future)
+                except Exception:
+                    pass
+                removed = remove_partial_files(self.downloader.output_dir, job.video_id)
+                if removed:
+                    print(f"{Fore.YELLOW}Cancelled {url}, removed {removed} partial file(s){Style.RESET_ALL}")
+            job.publish({"status": "cancelled"})
+            raise
+        except Exception:
+            success = False
+        postprocess = self.downloader.postprocess
+        merge = postprocess.pending(job.merge_key) if success and postprocess else None
+        if merge is not None:
+            # The streams are in; the video is done once the pool has merged them
+            try:
+                await asyncio.wrap_future(merge)
+            except Exception:
+                success = False
+        job.publish({"status": "done", "success": success})
+        return success
+
+    async def download_stream(
+        self, url: str, format_id: Optional[str] = None, info: Optional[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Download a video and yield its progress events
+
+        Events carry status, downloaded_bytes, total_bytes, speed, eta and
+        filename; the last one has status "done" and the success flag.
+        Leaving the loop early cancels the download.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.ensure_future(self.download(url, format_id, info, progress=queue))
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["status"] in TERMINAL_STATUSES:
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    async def download_many(
+        self, urls: List[str], format_id: Optional[str] = None
+    ) -> Dict[str, bool]:
+        """
+        Download many videos concurrently, bounded by the executor size
+
+        Returns:
+            Dict mapping each URL to whether its download succeeded
+        """
+        results = await asyncio.gather(*(self.download(url, format_id) for url in urls))
+        return dict(zip(urls, results))
+
+
+def remove_partial_files(output_dir: Path, video_id: str) -> int:
+    """Delete the .part/.ytdl files of one video; returns how many were removed"""
+    if not video_id:
+        return 0
+    removed = 0
+    for path in Path(output_dir).glob(f"*{video_id}*"):
+        if is_partial_file(path.name):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+    return removed
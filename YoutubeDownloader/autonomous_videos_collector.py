@@ -1,27 +1,39 @@
-from YoutubeDownloader.definitions import PROJECT_ROOT_DIR
+from YoutubeDownloader.definitions import PROJECT_ROOT_DIR, FORMAT_OPTIONS
+from YoutubeDownloader.bandwidth import configure_bandwidth, get_bandwidth_governor
+from YoutubeDownloader.metadata_cache import extract_info, video_id_from_url
+from YoutubeDownloader.metrics import configure_metrics, get_run_metrics, timed
+from YoutubeDownloader.postprocess import (
+    create_postprocess_pool,
+    download_streams,
+    parse_postprocess_workers,
+)
+from YoutubeDownloader.session_pool import get_session_pool
+from YoutubeDownloader.video_store import STORE_FOLDER, VideoStore, rendition_key
+from YoutubeDownloader.channel_sync import sync_channel_urls, record_full_listing
+from YoutubeDownloader.concurrency import map_bounded
+from YoutubeDownloader.format_selection import StorageBudget, parse_size
+from YoutubeDownloader.harvest import AUTO, JSONL, PARQUET, CorpusWriter, Harvester
+from YoutubeDownloader.library_manifest import (
+    MANIFEST_FILE,
+    VIDEO_EXTENSIONS,
+    LibraryManifest,
+    is_partial_file,
+    video_id_from_filename,
+)
 import os
+import copy
+import time
 import yaml
 import argparse
 import sys
-import yt_dlp
-from urllib.parse import urlparse, parse_qs
 from colorama import init, Fore, Style
 
 
 MAIN_FOLDER = "ZDataVideos"
 MAIN_YAML_FILE = "main.yaml"
+CORPUS_FOLDER = "corpus"
 
-FORMAT_OPTIONS = {
-    "best": "bestvideo+bestaudio/best",
-    "worst": "worstvideo+worstaudio/worst",
-    "mp4": "best[ext=mp4]/best",
-    "webm": "best[ext=webm]/best",
-    "360p": "best[height<=360]/best",
-    "720p": "best[height<=720]/best",
-    "1080p": "best[height<=1080]/best",
-    "audio_only": "bestaudio[ext=m4a]/bestaudio",
-    "audio_mp3": "bestaudio[ext=mp3]/bestaudio",
-}
+DEFAULT_PARTIAL_MAX_AGE = 7 * 24 * 3600
 
 EXAMPLE_FILE = """test:
 - https://www.youtube.com/watch?v=09839DpTctU
@@ -34,7 +46,12 @@ channel:
 """
 
 
-def get_channel_urls(channel_url, max_videos=None):
+@timed("flat_extract")
+def get_channel_urls(channel_url, max_videos=None, incremental=False):
+    if incremental:
+        # Page only until the last known videos of the channel
+        return sync_channel_urls(channel_url, max_videos)
+
     try:
         # Configure yt-dlp options for channel extraction
         ydl_opts = {
@@ -48,38 +65,39 @@ def get_channel_urls(channel_url, max_videos=None):
             ydl_opts["playlistend"] = max_videos
 
         urls = []
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # Extract channel info
-            info = ydl.extract_info(channel_url, download=False)
-
-            if not info:
-                print(
-                    f"{Fore.RED}Error: Could not extract channel information{Style.RESET_ALL}"
-                )
-                return None
-
-            # Get channel title
-            channel_title = info.get("title", "Unknown Channel")
-            print(f"{Fore.GREEN}Channel: {channel_title}{Style.RESET_ALL}")
-
-            # Extract video URLs from entries
-            entries = info.get("entries", [])
-            if not entries:
-                print(f"{Fore.YELLOW}No videos found in channel{Style.RESET_ALL}")
-                return []
-
-            print(f"{Fore.CYAN}Found {len(entries)} videos{Style.RESET_ALL}")
-
-            for i, entry in enumerate(entries, 1):
-                if entry and "url" in entry:
-                    video_url = entry["url"]
-                    video_title = entry.get("title", "Unknown Title")
-                    urls.append(video_url)
-                    print(f"{Fore.GREEN}[{i}] {video_title}{Style.RESET_ALL}")
-                    print(f"    URL: {video_url}")
-
-                    if max_videos and i >= max_videos:
-                        break
+        # Extract channel info (flat listings go through the metadata cache)
+        info = extract_info(channel_url, ydl_opts)
+
+        if not info:
+            print(
+                f"{Fore.RED}Error: Could not extract channel information{Style.RESET_ALL}"
+            )
+            return None
+
+        # Get channel title
+        channel_title = info.get("title", "Unknown Channel")
+        print(f"{Fore.GREEN}Channel: {channel_title}{Style.RESET_ALL}")
+
+        # Extract video URLs from entries
+        entries = info.get("entries", [])
+        if not entries:
+            print(f"{Fore.YELLOW}No videos found in channel{Style.RESET_ALL}")
+            return []
+
+        print(f"{Fore.CYAN}Found {len(entries)} videos{Style.RESET_ALL}")
+
+        for i, entry in enumerate(entries, 1):
+            if entry and "url" in entry:
+                video_url = entry["url"]
+                video_title = entry.get("title", "Unknown Title")
+                urls.append(video_url)
+                print(f"{Fore.GREEN}[{i}] {video_title}{Style.RESET_ALL}")
+                print(f"    URL: {video_url}")
+
+                if max_videos and i >= max_videos:
+                    break
+        # Seed the sync cursor so later incremental runs can stop early
+        record_full_listing(channel_url, urls, complete=not max_videos)
         return urls
 
     except Exception as e:
@@ -107,22 +125,40 @@ def get_default_yaml_file():
     return f"{PROJECT_ROOT_DIR}/{MAIN_FOLDER}/configs/{MAIN_YAML_FILE}"
 
 
+def get_library_manifest(main_path=f"{PROJECT_ROOT_DIR}/{MAIN_FOLDER}"):
+    return LibraryManifest(f"{main_path}/configs/{MANIFEST_FILE}")
+
+
+def get_video_store(main_path=f"{PROJECT_ROOT_DIR}/{MAIN_FOLDER}"):
+    return VideoStore(f"{main_path}/{STORE_FOLDER}")
+
+
 def process_channel_name(channel_url):
     if channel_url.startswith("https://www.youtube.com/@"):
         return channel_url.split("/")[-1][1:]
     return channel_url.split("/")[-1]
 
 
-def read_yaml_into_dict(file=get_default_yaml_file(), max_videos=None):
+def read_yaml_into_dict(file=None, max_videos=None, incremental=False, workers=1):
+    if file is None:
+        file = get_default_yaml_file()
     with open(file, "r") as f:
         data = yaml.safe_load(f)
         if data is None:
             return {}
 
         channels, data = get_videos_and_channels_from_dict(data)
-        for channel in channels:
+
+        def extract(channel):
             print(f"channel: {channel}")
-            videos = get_channel_urls(channel, max_videos)
+            try:
+                return get_channel_urls(channel, max_videos, incremental)
+            except Exception as e:
+                print(f"{Fore.RED}✗ Error extracting {channel}: {e}{Style.RESET_ALL}")
+                return []
+
+        # Channels are extracted concurrently; results keep the yaml order
+        for channel, videos in zip(channels, map_bounded(extract, channels, workers)):
             data[process_channel_name(channel)] = videos
         # Pretty print the data
         print(yaml.dump(data, indent=4))
@@ -152,121 +188,447 @@ def add_topic_url(topic_url):
         yaml.dump(yaml_dict, f)
 
 
-def download_video(video_url, save_path, format):
+def download_video(
+    video_url,
+    save_path,
+    format,
+    manifest=None,
+    topic=None,
+    postprocess=None,
+    store=None,
+    budget=None,
+    estimated_size=0,
+):
     """
     Downloads a YouTube video in the best available video and audio quality.
 
     Args:
         video_url (str): URL of the YouTube video.
         save_path (str): Directory to save the downloaded video.
+        format (str): yt-dlp format selector.
+        manifest (LibraryManifest): Records the finished file when given.
+        topic (str): Topic the download is recorded under.
+        postprocess (PostProcessPool): Merges video and audio on this pool
+            instead of inline; the manifest records the file once merged.
+        store (VideoStore): Moves the finished file into the store and
+            leaves a link to it in save_path.
+        budget (StorageBudget): Holds estimated_size against the topic while
+            the merge is queued, so the next budget choice counts the video
+            before the manifest records it.
+        estimated_size (float): Estimated bytes of the chosen format.
+
+    Returns:
+        int: Bytes that did not have to be downloaded again because an
+        interrupted partial download was resumed.
     """
 
     if type(video_url) is list:
-        for url in video_url:
-            download_video(url, save_path, format)
-        return
+        return sum(
+            download_video(
+                url, save_path, format, manifest, topic, postprocess, store, budget, estimated_size
+            )
+            for url in video_url
+        )
 
     if type(video_url) is not str:
         raise ValueError("video_url must be a string or list of strings")
 
+    metrics = get_run_metrics()
     try:
-        random_string = get_url_random_string(video_url)
+        random_string = video_id_from_url(video_url)
+        if not random_string:
+            raise ValueError(f"no video ID in {video_url}")
+
+        # Partial files of this video left by an interrupted run; they only
+        # count as resumed if the download continues from them
+        partials = get_partial_sizes(save_path, random_string)
+        resumed = {"bytes": 0, "files": set()}
+
+        def resume_hook(d):
+            tmpfilename = d.get("tmpfilename")
+            if d["status"] != "downloading" or not tmpfilename or tmpfilename in resumed["files"]:
+                return
+            resumed["files"].add(tmpfilename)
+            prefix = os.path.abspath(tmpfilename)
+            before = sum(size for path, size in partials.items() if path.startswith(prefix))
+            # A restarted download (range ignored, format changed) starts from zero
+            if before and (d.get("downloaded_bytes") or 0) >= before:
+                resumed["bytes"] += before
 
         # Options for yt-dlp
         ydl_opts = {
             "format": format,  # Download best video and audio and merge
             "outtmpl": f"{save_path}/%(title)s_%(height)s_{random_string}.%(ext)s",  # Save file format
             "merge_output_format": "mp4",  # Merge video and audio into MP4 format
+            "continuedl": True,  # Resume .part files with range requests
+            # Charge every written block to the process-wide bandwidth budget
+            "progress_hooks": [
+                get_bandwidth_governor().progress_hook,
+                metrics.progress_hook,
+                resume_hook,
+            ],
         }
-
-        # Downloading the video
+        ydl_opts.update(get_bandwidth_governor().ydl_opts())
+        ydl_opts.update(metrics.hooks())
+
+        def finished(filepath):
+            if store is not None:
+                try:
+                    store.ingest(random_string, rendition_key(format), filepath)
+                except OSError as e:
+                    print(f"{Fore.YELLOW}Could not move {filepath} into the store: {e}{Style.RESET_ALL}")
+            if manifest is not None:
+                manifest.record(random_string, topic, filepath, format=format)
+
+        if manifest is not None or store is not None:
+            # post hooks receive the final path once merging is done
+            ydl_opts["post_hooks"] = [finished]
+
+        # Downloading the video; the info dict comes from the metadata cache
         print("Downloading...")
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([video_url])
+        with metrics.stage("probe", random_string):
+            info = extract_info(video_url, {"quiet": True})
+        merge_job = None
+        with metrics.downloading(random_string), metrics.stage("download", random_string), \
+                get_session_pool().session(ydl_opts) as ydl:
+            if postprocess is not None:
+                selected = ydl.process_ie_result(copy.deepcopy(info), download=False)
+                merge_job = download_streams(ydl, selected)
+            if merge_job is None:
+                ydl.process_ie_result(copy.deepcopy(info), download=True)
+        if merge_job is not None:
+
+            def on_merged(filepath):
+                try:
+                    if filepath and (manifest is not None or store is not None):
+                        finished(filepath)
+                finally:
+                    if budget is not None:
+                        budget.release(topic, estimated_size)
+
+            if budget is not None:
+                budget.reserve(topic, estimated_size)
+            try:
+                # Blocks while the pool is full, so downloads cannot run far ahead
+                postprocess.submit(random_string, merge_job, on_merged)
+            except Exception:
+                if budget is not None:
+                    budget.release(topic, estimated_size)
+                raise
         print(f"Video downloaded successfully and saved in: {save_path}")
+        if resumed["bytes"]:
+            print(f"Resumed partial download: {resumed['bytes']} bytes not fetched again")
+        return resumed["bytes"]
 
     except Exception as e:
         print(f"An error occurred: {e}")
+        return 0
 
 
 def get_file_random_string(file_name):
-    return file_name.rsplit(".", 1)[0].split("_")[-1]
+    return video_id_from_filename(file_name)
 
 
-def get_url_random_string(url):
-    return parse_qs(urlparse(url).query).get("v", [""])[0]
+def link_from_store(store, manifest, video_id, topic, topic_folder, format):
+    """
+    Link a stored copy of a video into a topic folder instead of downloading it
 
+    A copy another topic downloaded before the store existed is adopted into
+    the store first when the manifest recorded it with the same format.
 
-def download_missing_videos():
+    Returns:
+        bool: Whether the video was linked and needs no download.
+    """
+    rendition = rendition_key(format)
+    try:
+        if store.lookup(video_id, rendition) is None:
+            for record in manifest.get(video_id):
+                if record["format"] == format and os.path.exists(record["path"]):
+                    store.ingest(video_id, rendition, record["path"])
+                    break
+        path = store.link_into(video_id, rendition, topic_folder)
+    except OSError as e:
+        print(f"{Fore.YELLOW}Could not link {video_id} from the store: {e}{Style.RESET_ALL}")
+        return False
+    if path is None:
+        return False
+    manifest.record(video_id, topic, path, format=format)
+    return True
+
+
+def download_missing_videos(
+    incremental=True,
+    channel_workers=4,
+    reconcile=False,
+    partial_max_age=DEFAULT_PARTIAL_MAX_AGE,
+    format_preference="360p",
+    budget=None,
+    main_path=f"{PROJECT_ROOT_DIR}/{MAIN_FOLDER}",
+    postprocess_workers=None,
+    use_store=True,
+):
     """
     The file format of a video is FreeString_RandomString.Format
+
+    Args:
+        incremental: Page channels only up to their last known videos
+        channel_workers: Number of channels extracted concurrently
+        reconcile: Rebuild the library manifest from disk before downloading
+        partial_max_age: Seconds after which an untouched partial download
+            is considered stale and deleted instead of resumed
+        format_preference: Key of FORMAT_OPTIONS used when no budget is set
+        budget: StorageBudget; when enabled every video gets the best
+            rendition that fits the per-video and remaining per-topic budget
+        main_path: Library folder holding configs/ and the topic folders
+        postprocess_workers: Merge video and audio on a process pool of this
+            size ("auto" for one per core) while the next videos download
+        use_store: Keep every video once in the content-addressable store and
+            link it into the topic folders, so videos listed under several
+            topics are downloaded once
     """
 
     # read yaml file
-    yaml_dict = read_yaml_into_dict(max_videos=None)
+    yaml_dict = read_yaml_into_dict(
+        f"{main_path}/configs/{MAIN_YAML_FILE}",
+        max_videos=None,
+        incremental=incremental,
+        workers=channel_workers,
+    )
 
-    # for each topic, check if the video is in the folder
+    manifest = get_library_manifest(main_path)
+    topic_folders = {topic: f"{main_path}/{topic}" for topic in yaml_dict}
+    if reconcile:
+        manifest.reconcile(topic_folders)
+    resumed_bytes = 0
+    postprocess = create_postprocess_pool(postprocess_workers)
+    store = get_video_store(main_path) if use_store else None
+
+    # for each topic, check if the video is in the manifest
     for topic, urls in yaml_dict.items():
 
         # if topic folder do not exists, create it
-        topic_folder = f"{PROJECT_ROOT_DIR}/{MAIN_FOLDER}/{topic}"
+        topic_folder = topic_folders[topic]
         print(f"topic_folder: {topic_folder}")
         # if topic folder does not exist, create it
         if not os.path.exists(topic_folder):
             os.makedirs(topic_folder, exist_ok=True)
-        # Sometimes we have garbage
-        clean_up_garbage_files(topic_folder)
-
-        # read the files in the folder
-        files = os.listdir(topic_folder)
-        # filter from files all the files that are not videos of any file format (mp4, mkv, etc.)
-        videos = [
-            file
-            for file in files
-            if file.endswith((".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", ".webm"))
-        ]
-        # get the random string from the file name: throw the extension, split by underscore, and take the last part.
-        files_random_strings = [get_file_random_string(file) for file in videos]
-        urls_random_strings = {get_url_random_string(url): url for url in urls}
-
-        # get the urls that are not in the random strings
+        # Sometimes we have garbage; in-progress partials are kept for resuming
+        clean_up_garbage_files(topic_folder, partial_max_age)
+
+        # First run for this topic: seed the manifest from the files on disk
+        if not manifest.has_topic(topic):
+            manifest.reconcile({topic: topic_folder})
+
+        downloaded_ids = manifest.topic_ids(topic)
+        # watch, youtu.be and /shorts/ URLs alike are keyed by their video ID
+        urls_random_strings = {}
+        for url in urls or []:
+            video_id = video_id_from_url(url)
+            if video_id:
+                urls_random_strings.setdefault(video_id, url)
+            else:
+                print(f"{Fore.YELLOW}Skipping {url}: no video ID in the URL{Style.RESET_ALL}")
+
+        # get the urls that are not in the manifest
         urls_to_download = [
             url
             for url_random_string, url in urls_random_strings.items()
-            if url_random_string not in files_random_strings
+            if url_random_string not in downloaded_ids
         ]
-        # download the urls
 
         # download the video
-        download_video(urls_to_download, topic_folder, format=FORMAT_OPTIONS["360p"])
+        if budget is None or not budget.enabled:
+            format = FORMAT_OPTIONS[format_preference]
+            if store is not None:
+                # Videos another topic already downloaded are linked, not queued
+                urls_to_download = [
+                    url
+                    for url in urls_to_download
+                    if not link_from_store(
+                        store, manifest, video_id_from_url(url), topic, topic_folder, format
+                    )
+                ]
+            resumed_bytes += download_video(
+                urls_to_download,
+                topic_folder,
+                format=format,
+                manifest=manifest,
+                topic=topic,
+                postprocess=postprocess,
+                store=store,
+            )
+        else:
+            for url in urls_to_download:
+                # pick an explicit format ID from the probed sizes
+                try:
+                    info = extract_info(url, {"quiet": True})
+                except Exception as e:
+                    print(f"An error occurred: {e}")
+                    continue
+                # Queued merges are not in the manifest yet but use the budget
+                choice = budget.choose_rendition(
+                    info, manifest.topic_bytes(topic) + budget.pending_bytes(topic)
+                )
+                if choice is None:
+                    continue
+                format_id = choice["format_id"]
+                if store is not None and link_from_store(
+                    store, manifest, video_id_from_url(url), topic, topic_folder, format_id
+                ):
+                    continue
+                resumed_bytes += download_video(
+                    url, topic_folder, format=format_id, manifest=manifest, topic=topic,
+                    postprocess=postprocess, store=store,
+                    budget=budget, estimated_size=choice["size"],
+                )
+
+        if postprocess is not None:
+            # The topic's merges finish before its folder is cleaned up
+            postprocess.drain()
 
         # clean up garbage files
-        clean_up_garbage_files(topic_folder)
+        clean_up_garbage_files(topic_folder, partial_max_age)
+
+    print(f"Bytes saved by resuming partial downloads: {resumed_bytes}")
+    if store is not None:
+        store.print_report()
+    if postprocess is not None:
+        stats = postprocess.stats()
+        print(
+            f"Post-processing: {stats['completed']} merged / {stats['failed']} failed, "
+            f"{stats['cpu_seconds']:.1f}s in ffmpeg"
+        )
+        postprocess.shutdown()
+
+
+def harvest_videos(
+    incremental=True,
+    channel_workers=4,
+    workers=8,
+    corpus_format=AUTO,
+    subtitles=True,
+    main_path=f"{PROJECT_ROOT_DIR}/{MAIN_FOLDER}",
+):
+    """
+    Harvest metadata and English subtitles of every topic's videos into
+    <main_path>/corpus instead of downloading them; the topic goes into the
+    source column.
 
+    Args:
+        incremental: Page channels only up to their last known videos
+        channel_workers: Number of channels extracted concurrently
+        workers: Videos harvested concurrently
+        corpus_format: "parquet", "jsonl" or "auto"
+        subtitles: Fetch subtitles as well as metadata
+        main_path: Library folder holding configs/
+    """
+    yaml_dict = read_yaml_into_dict(
+        f"{main_path}/configs/{MAIN_YAML_FILE}",
+        max_videos=None,
+        incremental=incremental,
+        workers=channel_workers,
+    )
+    writer = CorpusWriter(f"{main_path}/{CORPUS_FOLDER}", corpus_format)
+    harvester = Harvester(writer, workers, subtitles=subtitles)
+    try:
+        for topic, urls in yaml_dict.items():
+            print(f"topic: {topic}")
+            harvester.harvest(urls or [], source=topic)
+    finally:
+        writer.close()
+    harvester.print_summary()
+
+
+def get_partial_sizes(folder, random_string):
+    # absolute path -> size of the partial files that belong to a video
+    if not random_string or not os.path.isdir(folder):
+        return {}
+    return {
+        os.path.abspath(f"{folder}/{file}"): os.path.getsize(f"{folder}/{file}")
+        for file in os.listdir(folder)
+        if is_partial_file(file) and random_string in file
+    }
+
+
+def clean_up_garbage_files(topic_folder, partial_max_age=DEFAULT_PARTIAL_MAX_AGE):
+    """
+    Delete everything in a topic folder that is not a video, except partial
+    downloads younger than partial_max_age, which yt-dlp resumes.
 
-def clean_up_garbage_files(topic_folder):
+    Returns:
+        dict: Number of deleted files and number/bytes of kept partials.
+    """
     # read the files in the folder
     files = os.listdir(topic_folder)
+    now = time.time()
+    files_to_delete = []
+    kept_partials = []
     # filter from files all the files that are not videos of any file format (mp4, mkv, etc.)
-    files_to_delete = [
-        file
-        for file in files
-        if not file.endswith((".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", ".webm"))
-    ]
+    for file in files:
+        if file.endswith(VIDEO_EXTENSIONS):
+            continue
+        path = f"{topic_folder}/{file}"
+        if is_partial_file(file) and now - os.path.getmtime(path) <= partial_max_age:
+            kept_partials.append(file)
+        else:
+            files_to_delete.append(file)
+    kept_bytes = sum(os.path.getsize(f"{topic_folder}/{file}") for file in kept_partials)
     print(f"Deleting {len(files_to_delete)} files")
     print(files_to_delete)
+    if kept_partials:
+        print(f"Keeping {len(kept_partials)} partial downloads ({kept_bytes} bytes) for resume")
 
     # delete the files
     for file in files_to_delete:
         os.remove(f"{topic_folder}/{file}")
 
-
-def main(verbose=True):
+    return {
+        "deleted": len(files_to_delete),
+        "kept_partials": len(kept_partials),
+        "kept_bytes": kept_bytes,
+    }
+
+
+def main(
+    verbose=True,
+    full_sync=False,
+    channel_workers=4,
+    reconcile=False,
+    partial_max_age=DEFAULT_PARTIAL_MAX_AGE,
+    format_preference="360p",
+    budget=None,
+    prometheus_textfile=None,
+    postprocess_workers=None,
+    use_store=True,
+    harvest=False,
+    harvest_workers=8,
+    corpus_format=AUTO,
+):
     # There are 2 main functions:
     # 1. prepare_main_folder: create the main folder and the configs folder
     # 2. update_missing_videos: download the videos that are not in the folder
+    #    (or, in harvest mode, collect their metadata and subtitles only)
     prepare_main_folder()
-    download_missing_videos()
+    if harvest:
+        harvest_videos(
+            incremental=not full_sync,
+            channel_workers=channel_workers,
+            workers=harvest_workers,
+            corpus_format=corpus_format,
+        )
+        get_run_metrics().finish(prometheus_textfile)
+        return
+    download_missing_videos(
+        incremental=not full_sync,
+        channel_workers=channel_workers,
+        reconcile=reconcile,
+        partial_max_age=partial_max_age,
+        format_preference=format_preference,
+        budget=budget,
+        postprocess_workers=postprocess_workers,
+        use_store=use_store,
+    )
+    get_run_metrics().finish(prometheus_textfile)
 
 
 if __name__ == "__main__":
@@ -284,11 +646,112 @@ if __name__ == "__main__":
         action="store_true",
         help="Enable verbose logging for debugging downloads",
     )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Enumerate every channel completely instead of stopping at known videos",
+    )
+    parser.add_argument(
+        "--channel-workers",
+        type=int,
+        default=4,
+        help="Number of channels extracted concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Rebuild the library manifest from the topic folders before downloading",
+    )
+    parser.add_argument(
+        "--partial-max-age-hours",
+        type=float,
+        default=DEFAULT_PARTIAL_MAX_AGE / 3600,
+        help="Delete partial downloads untouched for longer than this (default: 168)",
+    )
+    parser.add_argument(
+        "--limit-rate",
+        help="Total bandwidth across all downloads, e.g. 500K, 2M (default: unlimited)",
+    )
+    parser.add_argument(
+        "--limit-schedule",
+        help='Time-of-day limits overriding --limit-rate, e.g. "09:00-18:00=1M"',
+    )
+    parser.add_argument(
+        "--format",
+        default="360p",
+        choices=list(FORMAT_OPTIONS),
+        help="Format preference when no storage budget is set (default: 360p)",
+    )
+    parser.add_argument(
+        "--video-budget",
+        help="Best rendition that fits this size per video, e.g. 300M",
+    )
+    parser.add_argument(
+        "--topic-budget",
+        help="Total size allowed per topic folder, e.g. 50G",
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        help="Append per-stage timing events to this JSON-lines file",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        help="Write the run metrics for the node exporter textfile collector",
+    )
+    parser.add_argument(
+        "--postprocess-workers",
+        type=parse_postprocess_workers,
+        help='Merge video and audio on a process pool of this size ("auto" for one '
+        "per core) while the next videos download (default: merge inline)",
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Save every topic's videos as separate files instead of linking them "
+        f"to one copy in {MAIN_FOLDER}/{STORE_FOLDER}",
+    )
+    parser.add_argument(
+        "--harvest",
+        action="store_true",
+        help=f"Collect metadata and English subtitles into {MAIN_FOLDER}/{CORPUS_FOLDER} "
+        "instead of downloading media",
+    )
+    parser.add_argument(
+        "--harvest-workers",
+        type=int,
+        default=8,
+        help="Videos harvested concurrently (default: 8)",
+    )
+    parser.add_argument(
+        "--corpus-format",
+        default=AUTO,
+        choices=[AUTO, PARQUET, JSONL],
+        help="Corpus part file format (default: parquet when pyarrow is installed, else jsonl)",
+    )
     args = parser.parse_args()
+    configure_bandwidth(args.limit_rate, args.limit_schedule)
+    configure_metrics(args.metrics_jsonl)
 
     # if flag add_url, add url to the yaml file
     if args.add_topic_url:
         add_topic_url(args.add_topic_url)
     else:
         # Run main with verbose flag if specified
-        main(verbose=args.verbose)
+        main(
+            verbose=args.verbose,
+            full_sync=args.full_sync,
+            channel_workers=args.channel_workers,
+            reconcile=args.reconcile,
+            partial_max_age=args.partial_max_age_hours * 3600,
+            format_preference=args.format,
+            budget=StorageBudget(
+                per_video=parse_size(args.video_budget) if args.video_budget else None,
+                per_topic=parse_size(args.topic_budget) if args.topic_budget else None,
+            ),
+            prometheus_textfile=args.prometheus_textfile,
+            postprocess_workers=args.postprocess_workers,
+            use_store=not args.no_store,
+            harvest=args.harvest,
+            harvest_workers=args.harvest_workers,
+            corpus_format=args.corpus_format,
+        )
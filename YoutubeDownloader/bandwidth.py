@@ -0,0 +1,163 @@
+"""
+Bandwidth Governor - Process-wide token bucket shared by every download worker
+
+yt-dlp calls the progress hooks after every block it writes, so charging
+each block against one shared bucket (and sleeping in the hook when it runs
+dry) caps the total rate of all concurrent downloads. Downloads are forced
+onto a fixed block size while a limit is active; grants are served in arrival
+order, so every active download gets an equal share of the link.
+"""
+
+import threading
+import time
+from datetime import datetime, time as dtime
+from typing import Dict, List, Optional, Tuple
+
+from colorama import Fore, Style
+
+# Fixed yt-dlp block size while a limit is active: equal blocks plus FIFO
+# grants give each active download the same share of the bucket
+GOVERNED_BLOCK_SIZE = 64 * 1024
+
+RATE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_rate(rate: str) -> Optional[float]:
+    """Parse a rate such as 500K, 2.5M or 1G (bytes per second); 0 means unlimited"""
+    rate = rate.strip().upper().rstrip("/S").rstrip("B")
+    unit = rate[-1] if rate and rate[-1] in RATE_UNITS else ""
+    value = float(rate[: len(rate) - len(unit)]) * RATE_UNITS[unit]
+    return value or None
+
+
+def parse_schedule(schedule: str) -> List[Tuple[dtime, dtime, Optional[float]]]:
+    """
+    Parse a time-of-day schedule such as "09:00-18:00=2M,18:00-23:30=10M"
+
+    Windows whose end is before their start wrap around midnight.
+    """
+    windows = []
+    for item in schedule.split(","):
+        if not item.strip():
+            continue
+        span, rate = item.split("=")
+        start, end = span.split("-")
+        windows.append(
+            (
+                datetime.strptime(start.strip(), "%H:%M").time(),
+                datetime.strptime(end.strip(), "%H:%M").time(),
+                parse_rate(rate),
+            )
+        )
+    return windows
+
+
+class BandwidthGovernor:
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        schedule: Optional[List[Tuple[dtime, dtime, Optional[float]]]] = None,
+    ):
+        """
+        Initialize the governor
+
+        Args:
+            rate: Total bytes per second across all downloads (None for unlimited)
+            schedule: (start, end, rate) windows that override rate during
+                their time of day
+        """
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._schedule = schedule or []
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self._progress: Dict[str, int] = {}
+
+    def set_limit(self, rate: Optional[float]):
+        """Change the default limit at runtime (None for unlimited)"""
+        with self._lock:
+            self._rate = rate
+
+    def set_schedule(self, schedule: List[Tuple[dtime, dtime, Optional[float]]]):
+        """Replace the time-of-day schedule at runtime"""
+        with self._lock:
+            self._schedule = list(schedule)
+
+    def current_limit(self, now: Optional[datetime] = None) -> Optional[float]:
+        """The limit in force right now, taking the schedule into account"""
+        clock = (now or datetime.now()).time()
+        for start, end, rate in self._schedule:
+            inside = start <= clock < end if start <= end else clock >= start or clock < end
+            if inside:
+                return rate
+        return self._rate
+
+    @property
+    def active_downloads(self) -> int:
+        """Number of downloads currently reporting progress"""
+        return len(self._progress)
+
+    def consume(self, nbytes: int):
+        """Charge nbytes against the bucket, sleeping until they are covered"""
+        limit = self.current_limit()
+        if not limit or nbytes <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            # At most one second of burst accumulates while the link is idle
+            self._tokens = min(limit, self._tokens + (now - self._last_refill) * limit)
+            self._last_refill = now
+            # Going into debt makes later callers wait behind earlier ones
+            self._tokens -= nbytes
+            deficit = -self._tokens
+        if deficit > 0:
+            time.sleep(deficit / limit)
+
+    def progress_hook(self, d: Dict):
+        """yt-dlp progress hook charging every written block to the bucket"""
+        key = d.get("filename") or d.get("tmpfilename") or ""
+        if d["status"] == "downloading":
+            downloaded = d.get("downloaded_bytes") or 0
+            with self._lock:
+                previous = self._progress.get(key)
+                self._progress[key] = downloaded
+            if previous is None:
+                # The first event of a resumed .part already counts the bytes on
+                # disk; only the block just read (at most one buffer) crossed
+                # the network
+                self.consume(min(downloaded, GOVERNED_BLOCK_SIZE))
+            else:
+                self.consume(downloaded - previous)
+        else:
+            with self._lock:
+                self._progress.pop(key, None)
+
+    def ydl_opts(self) -> Dict:
+        """yt-dlp options a governed download must run with"""
+        if not self._rate and not self._schedule:
+            return {}
+        return {"buffersize": GOVERNED_BLOCK_SIZE, "noresizebuffer": True}
+
+    def describe(self) -> str:
+        limit = self.current_limit()
+        if not limit:
+            return "unlimited"
+        return f"{limit / (1024 * 1024):.2f} MB/s"
+
+
+_governor = BandwidthGovernor()
+
+
+def get_bandwidth_governor() -> BandwidthGovernor:
+    """Return the process-wide bandwidth governor"""
+    return _governor
+
+
+def configure_bandwidth(limit_rate: Optional[str] = None, limit_schedule: Optional[str] = None):
+    """Apply --limit-rate / --limit-schedule command line values to the governor"""
+    if limit_rate:
+        _governor.set_limit(parse_rate(limit_rate))
+    if limit_schedule:
+        _governor.set_schedule(parse_schedule(limit_schedule))
+    if limit_rate or limit_schedule:
+        print(f"{Fore.CYAN}Bandwidth limit: {_governor.describe()}{Style.RESET_ALL}")
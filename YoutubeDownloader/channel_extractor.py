@@ -8,31 +8,41 @@ import sys
 import argparse
 import json
 from pathlib import Path
-from typing import List, Dict, Optional
-import yt_dlp
+from typing import Iterator, List, Dict, Optional
 from colorama import init, Fore, Style
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+from YoutubeDownloader.concurrency import map_bounded
+from YoutubeDownloader.metadata_cache import extract_info
+from YoutubeDownloader.metrics import configure_metrics, get_run_metrics, timed
+from YoutubeDownloader.channel_sync import (
+    iter_channel_entries,
+    record_full_listing,
+    sync_channel_urls,
+)
 
 class YouTubeChannelExtractor:
-    def __init__(self, output_dir: str = "extracted_urls"):
+    def __init__(self, output_dir: str = "extracted_urls", workers: int = 1):
         """
         Initialize the YouTube channel extractor
         
         Args:
             output_dir: Directory to save extracted URLs
+            workers: Number of channels extracted concurrently
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.workers = max(1, workers)
     
-    def extract_channel_urls(self, channel_url: str, max_videos: Optional[int] = None) -> List[str]:
+    @timed("flat_extract")
+    def extract_channel_urls(self, channel_url: str, max_videos: Optional[int] = None,
+                             incremental: bool = False) -> List[str]:
         """
         Extract all video URLs from a YouTube channel
         
         Args:
             channel_url: YouTube channel URL
             max_videos: Maximum number of videos to extract (None for all)
+            incremental: Stop paging at the last known videos of the channel
         
         Returns:
             List of video URLs
@@ -40,6 +50,11 @@ class YouTubeChannelExtractor:
         try:
             print(f"{Fore.CYAN}Extracting URLs from channel: {channel_url}{Style.RESET_ALL}")
             
+            if incremental:
+                urls = sync_channel_urls(channel_url, max_videos) or []
+                print(f"\n{Fore.GREEN}✓ Successfully extracted {len(urls)} video URLs{Style.RESET_ALL}")
+                return urls
+            
             # Configure yt-dlp options for channel extraction
             ydl_opts = {
                 'quiet': True,
@@ -52,37 +67,38 @@ class YouTubeChannelExtractor:
                 ydl_opts['playlistend'] = max_videos
             
             urls = []
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract channel info
-                info = ydl.extract_info(channel_url, download=False)
-                
-                if not info:
-                    print(f"{Fore.RED}Error: Could not extract channel information{Style.RESET_ALL}")
-                    return []
-                
-                # Get channel title
-                channel_title = info.get('title', 'Unknown Channel')
-                print(f"{Fore.GREEN}Channel: {channel_title}{Style.RESET_ALL}")
-                
-                # Extract video URLs from entries
-                entries = info.get('entries', [])
-                if not entries:
-                    print(f"{Fore.YELLOW}No videos found in channel{Style.RESET_ALL}")
-                    return []
-                
-                print(f"{Fore.CYAN}Found {len(entries)} videos{Style.RESET_ALL}")
-                
-                for i, entry in enumerate(entries, 1):
-                    if entry and 'url' in entry:
-                        video_url = entry['url']
-                        video_title = entry.get('title', 'Unknown Title')
-                        urls.append(video_url)
-                        print(f"{Fore.GREEN}[{i}] {video_title}{Style.RESET_ALL}")
-                        print(f"    URL: {video_url}")
-                        
-                        if max_videos and i >= max_videos:
-                            break
+            # Extract channel info (flat listings go through the metadata cache)
+            info = extract_info(channel_url, ydl_opts)
+            
+            if not info:
+                print(f"{Fore.RED}Error: Could not extract channel information{Style.RESET_ALL}")
+                return []
+            
+            # Get channel title
+            channel_title = info.get('title', 'Unknown Channel')
+            print(f"{Fore.GREEN}Channel: {channel_title}{Style.RESET_ALL}")
+            
+            # Extract video URLs from entries
+            entries = info.get('entries', [])
+            if not entries:
+                print(f"{Fore.YELLOW}No videos found in channel{Style.RESET_ALL}")
+                return []
+            
+            print(f"{Fore.CYAN}Found {len(entries)} videos{Style.RESET_ALL}")
             
+            for i, entry in enumerate(entries, 1):
+                if entry and 'url' in entry:
+                    video_url = entry['url']
+                    video_title = entry.get('title', 'Unknown Title')
+                    urls.append(video_url)
+                    print(f"{Fore.GREEN}[{i}] {video_title}{Style.RESET_ALL}")
+                    print(f"    URL: {video_url}")
+                    
+                    if max_videos and i >= max_videos:
+                        break
+            
+            # Seed the sync cursor so later incremental runs can stop early
+            record_full_listing(channel_url, urls, complete=not max_videos)
             print(f"\n{Fore.GREEN}✓ Successfully extracted {len(urls)} video URLs{Style.RESET_ALL}")
             return urls
             
@@ -90,24 +106,57 @@ class YouTubeChannelExtractor:
             print(f"{Fore.RED}✗ Error extracting channel URLs: {e}{Style.RESET_ALL}")
             return []
     
-    def extract_multiple_channels(self, channel_urls: List[str], max_videos: Optional[int] = None) -> Dict[str, List[str]]:
+    def iter_channel_urls(self, channel_url: str, max_videos: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield video URLs of a channel as yt-dlp pages through it
+        
+        Args:
+            channel_url: YouTube channel URL
+            max_videos: Maximum number of videos to yield (None for all)
+        """
+        print(f"{Fore.CYAN}Streaming URLs from channel: {channel_url}{Style.RESET_ALL}")
+        count = 0
+        try:
+            for entry in iter_channel_entries(channel_url):
+                yield entry['url']
+                count += 1
+                if max_videos and count >= max_videos:
+                    break
+        except Exception as e:
+            print(f"{Fore.RED}✗ Error streaming channel URLs: {e}{Style.RESET_ALL}")
+    
+    def extract_multiple_channels(self, channel_urls: List[str], max_videos: Optional[int] = None,
+                                  incremental: bool = False, workers: Optional[int] = None) -> Dict[str, List[str]]:
         """
         Extract URLs from multiple channels
         
         Args:
             channel_urls: List of channel URLs
             max_videos: Maximum number of videos per channel
+            incremental: Stop paging each channel at its last known videos
+            workers: Number of channels extracted concurrently (default: self.workers)
         
         Returns:
-            Dict mapping channel URLs to lists of video URLs
+            Dict mapping channel URLs to lists of video URLs, in input order
         """
-        results = {}
+        workers = max(1, workers or self.workers)
         
         print(f"{Fore.CYAN}Starting extraction from {len(channel_urls)} channels...{Style.RESET_ALL}")
         
-        for i, channel_url in enumerate(channel_urls, 1):
+        def process(item):
+            i, channel_url = item
             print(f"\n{Fore.YELLOW}[{i}/{len(channel_urls)}] Processing: {channel_url}{Style.RESET_ALL}")
-            urls = self.extract_channel_urls(channel_url, max_videos)
+            try:
+                return self.extract_channel_urls(channel_url, max_videos, incremental)
+            except Exception as e:
+                # A failing channel must not take the others down with it
+                print(f"{Fore.RED}✗ Error extracting {channel_url}: {e}{Style.RESET_ALL}")
+                return []
+        
+        # Flat extraction is almost all network wait, so channels overlap well
+        extracted = map_bounded(process, enumerate(channel_urls, 1), workers)
+        results = {}
+        for channel_url, urls in zip(channel_urls, extracted):
             results[channel_url] = urls
         
         # Summary
@@ -178,6 +227,8 @@ def load_channels_from_file(filename: str) -> List[str]:
         return []
 
 def main():
+    # Initialize colorama for cross-platform colored output
+    init(autoreset=True)
     parser = argparse.ArgumentParser(
         description="Extract all video URLs from YouTube channels",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -206,8 +257,13 @@ Examples:
     parser.add_argument('-j', '--json-file', help='Output JSON file for detailed results')
     parser.add_argument('-d', '--output-dir', default='extracted_urls', help='Output directory (default: extracted_urls)')
     parser.add_argument('-m', '--max-videos', type=int, help='Maximum number of videos to extract per channel')
+    parser.add_argument('--incremental', action='store_true', help='Stop paging each channel at its last known videos')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Number of channels extracted concurrently (default: 1)')
+    parser.add_argument('--metrics-jsonl', help='Append per-stage timing events to this JSON-lines file')
+    parser.add_argument('--prometheus-textfile', help='Write the run metrics for the node exporter textfile collector')
     
     args = parser.parse_args()
+    configure_metrics(args.metrics_jsonl)
     
     # Collect channel URLs
     channels = []
@@ -222,10 +278,11 @@ Examples:
         sys.exit(1)
     
     # Create extractor
-    extractor = YouTubeChannelExtractor(args.output_dir)
+    extractor = YouTubeChannelExtractor(args.output_dir, workers=args.workers)
     
     # Extract URLs
-    results = extractor.extract_multiple_channels(channels, args.max_videos)
+    results = extractor.extract_multiple_channels(channels, args.max_videos, args.incremental)
+    get_run_metrics().finish(args.prometheus_textfile)
     
     # Save results
     if results:
@@ -0,0 +1,238 @@
+"""
+Channel Sync - Incremental channel enumeration with a persistent per-channel cursor
+
+Channel listings are newest first, so once a sync has seen the whole channel
+later runs only page until they reach videos the cursor already knows.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from colorama import Fore, Style
+
+from YoutubeDownloader.definitions import CACHE_FOLDER
+from YoutubeDownloader.session_pool import get_session_pool
+from YoutubeDownloader.metadata_cache import video_id_from_url
+
+CHANNEL_SYNC_DB_FILE = "channel_sync.sqlite"
+
+# Consecutive known videos that end an incremental sync; more than one keeps a
+# re-ordered upload (e.g. a premiere going live) from ending the sync early
+DEFAULT_STOP_AFTER_KNOWN = 3
+
+FLAT_YDL_OPTS = {
+    "quiet": True,
+    "extract_flat": True,  # Don't download, just extract info
+    "ignoreerrors": True,
+    "no_warnings": True,
+}
+
+
+class ChannelSyncState:
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the sync cursor store
+
+        Args:
+            path: SQLite file (default: CACHE_FOLDER/channel_sync.sqlite)
+        """
+        if path is None:
+            os.makedirs(CACHE_FOLDER, exist_ok=True)
+            path = os.path.join(CACHE_FOLDER, CHANNEL_SYNC_DB_FILE)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS channel_cursor (
+                channel_url TEXT PRIMARY KEY,
+                entries TEXT NOT NULL,
+                complete INTEGER NOT NULL,
+                last_sync REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, channel_url: str) -> Optional[Dict]:
+        """
+        Return the cursor of a channel
+
+        Returns:
+            Dict with "entries" (list of [video_id, url], newest first),
+            "complete" (the whole channel has been enumerated at least once)
+            and "last_sync" (epoch seconds), or None for an unknown channel
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entries, complete, last_sync FROM channel_cursor WHERE channel_url = ?",
+                (channel_url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"entries": json.loads(row[0]), "complete": bool(row[1]), "last_sync": row[2]}
+
+    def update(self, channel_url: str, entries: List[List[str]], complete: bool):
+        """Store the known [video_id, url] entries of a channel, newest first"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channel_cursor VALUES (?, ?, ?, ?)",
+                (channel_url, json.dumps(entries), int(complete), time.time()),
+            )
+            self._conn.commit()
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def get_channel_sync_state() -> ChannelSyncState:
+    """Return the process-wide channel sync state"""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = ChannelSyncState()
+        return _state
+
+
+def iter_channel_entries(channel_url: str, ydl_opts: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Yield flat video entries of a channel as yt-dlp pages through it
+
+    Extraction runs with process=False so entries are produced lazily and the
+    caller can stop paging at any point.
+
+    Args:
+        channel_url: YouTube channel, tab or playlist URL
+        ydl_opts: yt-dlp options (default: FLAT_YDL_OPTS)
+    """
+    for _, entries in iter_channel_tabs(channel_url, ydl_opts):
+        yield from entries
+
+
+def iter_channel_tabs(
+    channel_url: str, ydl_opts: Optional[Dict] = None
+) -> Iterator[Tuple[str, Iterable[Dict]]]:
+    """
+    Yield (tab URL, lazy entries) for each tab of a channel (Videos, Shorts,
+    Live) in listing order
+
+    Leaving a tab's entries early skips the rest of that tab, so a caller can
+    stop paging one tab and carry on with the next.
+
+    Args:
+        channel_url: YouTube channel, tab or playlist URL
+        ydl_opts: yt-dlp options (default: FLAT_YDL_OPTS)
+    """
+    with get_session_pool().session(ydl_opts or FLAT_YDL_OPTS) as ydl:
+        yield from _iter_tabs(ydl, channel_url)
+
+
+def _is_tab(entry: Dict) -> bool:
+    return entry.get("_type") in ("url", "url_transparent") and entry.get("ie_key") == "YoutubeTab"
+
+
+def _iter_tabs(ydl, url: str) -> Iterator[Tuple[str, Iterable[Dict]]]:
+    info = ydl.extract_info(url, download=False, process=False)
+    # A channel URL may redirect to one of its tabs
+    while info and info.get("_type") in ("url", "url_transparent") and info.get("ie_key") != "Youtube":
+        info = ydl.extract_info(info["url"], download=False, process=False)
+    if not info:
+        return
+    entries = iter(info.get("entries") or [])
+    for entry in entries:
+        if not entry:
+            continue
+        if _is_tab(entry):
+            # Channel home pages list their tabs (Videos, Shorts, Live) as playlists
+            yield from _iter_tabs(ydl, entry["url"])
+        elif "url" in entry:
+            # A list of videos: this entry and the rest of the page form one tab
+            yield url, _iter_videos(entry, entries)
+            return
+
+
+def _iter_videos(first: Dict, rest: Iterator) -> Iterator[Dict]:
+    yield first
+    for entry in rest:
+        if entry and "url" in entry and not _is_tab(entry):
+            yield entry
+
+
+def sync_channel_urls(
+    channel_url: str,
+    max_videos: Optional[int] = None,
+    incremental: bool = True,
+    stop_after_known: int = DEFAULT_STOP_AFTER_KNOWN,
+    state: Optional[ChannelSyncState] = None,
+) -> Optional[List[str]]:
+    """
+    Enumerate a channel, stopping at known content when a complete cursor exists
+
+    Args:
+        channel_url: YouTube channel URL
+        max_videos: Maximum number of videos to return (None for all)
+        incremental: Stop paging at the last known videos (False re-enumerates)
+        stop_after_known: Consecutive known videos that end the sync
+        state: Cursor store (default: the process-wide state)
+
+    Returns:
+        Video URLs newest first (new videos followed by known ones), or None
+        if the channel could not be extracted
+    """
+    state = state or get_channel_sync_state()
+    cursor = state.get(channel_url)
+    known = {}
+    if incremental and cursor and cursor["complete"]:
+        known = {video_id: url for video_id, url in cursor["entries"]}
+
+    new_entries = []
+    reached_end = True
+    try:
+        for _, tab_entries in iter_channel_tabs(channel_url):
+            # Known videos end the paging of their own tab only; the Shorts and
+            # Live tabs still get checked for new content
+            consecutive_known = 0
+            for entry in tab_entries:
+                video_id = entry.get("id") or entry["url"]
+                if video_id in known:
+                    consecutive_known += 1
+                    if consecutive_known >= stop_after_known:
+                        break
+                    continue
+                consecutive_known = 0
+                new_entries.append([video_id, entry["url"]])
+                print(f"{Fore.GREEN}[new] {entry.get('title', 'Unknown Title')}{Style.RESET_ALL}")
+                print(f"    URL: {entry['url']}")
+                if max_videos and len(new_entries) >= max_videos:
+                    reached_end = False
+                    break
+            if not reached_end:
+                break
+    except Exception as e:
+        print(f"{Fore.RED}✗ Error syncing channel {channel_url}: {e}{Style.RESET_ALL}")
+        return None
+
+    new_ids = {video_id for video_id, _ in new_entries}
+    previous = cursor["entries"] if cursor else []
+    entries = new_entries + [entry for entry in previous if entry[0] not in new_ids]
+    # The cursor only counts as complete when every tab was paged to its end
+    # or to known content; a run cut short by max_videos leaves videos past
+    # the cap unlisted, so the next run must not stop at the entries stored now
+    complete = reached_end
+    state.update(channel_url, entries, complete)
+
+    print(
+        f"{Fore.CYAN}Channel sync: {len(new_entries)} new, {len(entries)} known videos{Style.RESET_ALL}"
+    )
+    urls = [url for _, url in entries]
+    return urls[:max_videos] if max_videos else urls
+
+
+def record_full_listing(channel_url: str, urls: List[str], complete: bool):
+    """Seed the cursor of a channel from a full (non-incremental) enumeration"""
+    entries = [[video_id_from_url(url) or url, url] for url in urls]
+    get_channel_sync_state().update(channel_url, entries, complete)
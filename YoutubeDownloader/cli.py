@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+YoutubeDownloader command line entry point
+
+Maps sub-commands to their modules and imports a module only when its command
+runs, so `--help` and quick commands do not pay for yt-dlp and the download
+machinery:
+
+    python -m YoutubeDownloader.cli download -i urls.txt -f 720p
+    python -m YoutubeDownloader.cli collect --add_topic_url "topic|https://..."
+"""
+
+import runpy
+import sys
+
+COMMANDS = {
+    "download": ("YoutubeDownloader.youtube_downloader", "Download videos in specific formats"),
+    "extract": ("YoutubeDownloader.channel_extractor", "Extract video URLs from channels"),
+    "toolkit": ("YoutubeDownloader.youtube_toolkit", "Extract channel URLs and download videos"),
+    "collect": ("YoutubeDownloader.autonomous_videos_collector", "Download missing videos of the topic library"),
+    "harvest": ("YoutubeDownloader.harvest", "Collect metadata and English subtitles without media"),
+    "scenes": ("YoutubeDownloader.scene_export", "Export GIFs or clips of scenes of a downloaded video"),
+    "store": ("YoutubeDownloader.video_store", "Report the downloads saved by the video store"),
+    "analyze": ("YoutubeDownloader.video_analysis", "Run a Gemini prompt over downloaded videos"),
+}
+
+
+def print_usage(prog: str):
+    print(f"usage: {prog} <command> [options]\n\ncommands:")
+    for name, (_, help_text) in COMMANDS.items():
+        print(f"  {name:<10} {help_text}")
+    print(f"\nRun '{prog} <command> --help' for the options of a command.")
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    prog = "python -m YoutubeDownloader.cli"
+    if not argv or argv[0] in ("-h", "--help"):
+        print_usage(prog)
+        return 0
+    if argv[0] not in COMMANDS:
+        print(f"{prog}: unknown command '{argv[0]}'", file=sys.stderr)
+        print_usage(prog)
+        return 2
+
+    module = COMMANDS[argv[0]][0]
+    # The command module parses sys.argv exactly as when run directly
+    sys.argv = [f"{prog} {argv[0]}"] + argv[1:]
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
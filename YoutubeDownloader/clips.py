@@ -0,0 +1,106 @@
+"""
+Clips - Time-range downloads of videos
+
+Scene work usually needs a few short segments of a long video. With ranges
+set, yt-dlp hands each range to ffmpeg, which seeks in the remote file with
+HTTP range requests (or fetches only the covering DASH/HLS fragments) and
+copies the streams without re-encoding, so cuts land on the nearest keyframe
+and only the bytes around the segment are downloaded. Exact cuts re-encode
+the segment instead.
+
+Ranges are written "START-END" with "SS", "MM:SS" or "HH:MM:SS" timestamps;
+an input file line may follow its URL with ranges:
+
+    https://www.youtube.com/watch?v=09839DpTctU 0:11-0:20 2:05-2:40
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from YoutubeDownloader.metadata_cache import video_id_from_url
+from YoutubeDownloader.youtube_utils import parse_timestamp
+
+# File name part telling the clips of one video apart
+CLIP_OUTTMPL = "%(section_start)d-%(section_end)ds"
+
+
+def parse_range(value: str) -> Tuple[float, float]:
+    """(start, end) in seconds from "START-END" """
+    start, sep, end = value.strip().partition("-")
+    if not sep:
+        raise ValueError(f"Time range '{value}' is not START-END")
+    start, end = parse_timestamp(start), parse_timestamp(end)
+    if end <= start:
+        raise ValueError(f"Time range '{value}' ends before it starts")
+    return start, end
+
+
+def merge_ranges(ranges: Iterable[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Sorted ranges with overlapping ones joined, so no segment is fetched twice"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_clip_line(line: str) -> Tuple[str, List[Tuple[float, float]]]:
+    """URL and time ranges of an input file line ("URL [START-END ...]")"""
+    url, *ranges = line.replace(",", " ").split()
+    return url, [parse_range(value) for value in ranges]
+
+
+def parse_clip_lines(
+    lines: Iterable[str], extra_ranges: Optional[List[Tuple[float, float]]] = None
+) -> Tuple[List[str], Dict[str, List[Tuple[float, float]]]]:
+    """
+    Split input lines into URLs and per-URL ranges
+
+    Args:
+        lines: "URL [START-END ...]" lines
+        extra_ranges: Ranges applied to every URL (e.g. from --clip)
+
+    Returns:
+        The URLs in order and a mapping of URL to merged ranges for the URLs
+        that have any
+
+    Raises:
+        ValueError: A video is listed both with and without ranges; one
+            download cannot be both the whole video and clips of it
+    """
+    urls, clips = [], {}
+    whole, clipped = {}, {}
+    for line in lines:
+        url, ranges = parse_clip_line(line)
+        ranges = ranges + list(extra_ranges or [])
+        video = video_id_from_url(url) or url
+        seen = clipped if ranges else whole
+        other = whole if ranges else clipped
+        if video in other:
+            raise ValueError(
+                f"'{url}' is listed with and without time ranges "
+                f"(also as '{other[video]}'); list it one way only"
+            )
+        seen.setdefault(video, url)
+        urls.append(url)
+        if ranges:
+            clips[url] = merge_ranges(clips.get(url, []) + ranges)
+    return urls, clips
+
+
+def clip_ydl_opts(ranges: List[Tuple[float, float]], exact_cuts: bool = False) -> Dict:
+    """
+    yt-dlp options that download only the given ranges
+
+    Args:
+        ranges: (start, end) pairs in seconds
+        exact_cuts: Re-encode to cut exactly at the range boundaries instead
+            of copying from the nearest keyframes
+    """
+    from yt_dlp.utils import download_range_func
+
+    return {
+        "download_ranges": download_range_func(None, merge_ranges(ranges)),
+        "force_keyframes_at_cuts": exact_cuts,
+    }
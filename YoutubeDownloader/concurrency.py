@@ -0,0 +1,79 @@
+"""
+Concurrency helpers - bounded worker pools shared by the downloader and extractor
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    def __init__(self, per_host: Optional[int] = None):
+        """
+        Cap the number of concurrent requests per host
+
+        Args:
+            per_host: Maximum in-flight requests per host (None for no cap)
+        """
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+
+    def _semaphore(self, url: str) -> Optional[threading.Semaphore]:
+        if not self.per_host:
+            return None
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def limit(self, url: str):
+        """Hold a slot for the host of url while the block runs"""
+        semaphore = self._semaphore(url)
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+
+def map_bounded(
+    func: Callable,
+    items: Iterable,
+    workers: int = 1,
+    on_result: Optional[Callable] = None,
+) -> List:
+    """
+    Run func over items with at most `workers` calls in flight
+
+    Args:
+        func: Callable taking a single item
+        items: Items to process
+        workers: Maximum number of concurrent calls (1 runs inline)
+        on_result: Optional callback(item, result) invoked as each call finishes
+
+    Returns:
+        List of results in the same order as items
+    """
+    items = list(items)
+    results = [None] * len(items)
+
+    if workers <= 1 or len(items) <= 1:
+        for index, item in enumerate(items):
+            results[index] = func(item)
+            if on_result:
+                on_result(item, results[index])
+        return results
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(func, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_result:
+                on_result(items[index], results[index])
+    return results
@@ -9,5 +9,33 @@ SEPARATOR_LINE = "\u0002"
 SEPARATOR_N = "\u0001\n"
 SEPARATOR_LINE_N = "\u0002\n"
 
-CONFIG = configparser.ConfigParser()
-CONFIG.read(f"{PROJECT_ROOT_DIR}/config.txt")
+# yt-dlp format selectors shared by the downloaders
+FORMAT_OPTIONS = {
+    "best": "bestvideo+bestaudio/best",
+    "worst": "worstvideo+worstaudio/worst",
+    "mp4": "best[ext=mp4]/best",
+    "webm": "best[ext=webm]/best",
+    "360p": "best[height<=360]/best",
+    "720p": "best[height<=720]/best",
+    "1080p": "best[height<=1080]/best",
+    "audio_only": "bestaudio[ext=m4a]/bestaudio",
+    "audio_mp3": "bestaudio[ext=mp3]/bestaudio",
+}
+
+_config = None
+
+
+def get_config() -> configparser.ConfigParser:
+    """config.txt, read on first use rather than at import"""
+    global _config
+    if _config is None:
+        _config = configparser.ConfigParser()
+        _config.read(f"{PROJECT_ROOT_DIR}/config.txt")
+    return _config
+
+
+def __getattr__(name):
+    # Keeps "from YoutubeDownloader.definitions import CONFIG" working lazily
+    if name == "CONFIG":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
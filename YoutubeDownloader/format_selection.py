@@ -0,0 +1,186 @@
+"""
+Format Selection - Pick the best rendition that fits a storage budget
+
+Sizes come from filesize, then filesize_approx, then bitrate x duration, so
+the choice can be made from the probed info dict before anything is
+downloaded. The result is an explicit yt-dlp format ID ("18" or "137+140").
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from colorama import Fore, Style
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(size: str) -> int:
+    """Parse a size such as 700M, 1.5G or 500GB into bytes"""
+    size = size.strip().upper().rstrip("B")
+    unit = size[-1] if size and size[-1] in SIZE_UNITS else ""
+    return int(float(size[: len(size) - len(unit)]) * SIZE_UNITS[unit])
+
+
+def estimate_size(fmt: Dict, duration: Optional[float]) -> Optional[float]:
+    """Estimated size of a format in bytes (None if nothing to estimate from)"""
+    size = fmt.get("filesize") or fmt.get("filesize_approx")
+    if size:
+        return float(size)
+    # tbr is in kbit/s
+    if fmt.get("tbr") and duration:
+        return fmt["tbr"] * 1000 / 8 * duration
+    return None
+
+
+def _has_video(fmt: Dict) -> bool:
+    return fmt.get("vcodec") not in (None, "none")
+
+
+def _has_audio(fmt: Dict) -> bool:
+    return fmt.get("acodec") not in (None, "none")
+
+
+def _quality(video: Dict, audio: Optional[Dict] = None) -> tuple:
+    return (
+        video.get("height") or 0,
+        video.get("fps") or 0,
+        video.get("vbr") or video.get("tbr") or 0,
+        (audio or video).get("abr") or 0,
+    )
+
+
+def get_renditions(formats: List[Dict], duration: Optional[float]) -> List[Dict]:
+    """
+    All downloadable renditions with a size estimate: progressive formats and
+    every video-only + audio-only pair
+
+    Returns:
+        List of dicts with format_id, size, height and a sortable quality key
+    """
+    renditions = []
+    audios = [f for f in formats if _has_audio(f) and not _has_video(f)]
+    for fmt in formats:
+        if not _has_video(fmt):
+            continue
+        video_size = estimate_size(fmt, duration)
+        if video_size is None:
+            continue
+        if _has_audio(fmt):
+            renditions.append(
+                {"format_id": fmt["format_id"], "size": video_size,
+                 "height": fmt.get("height"), "quality": _quality(fmt)}
+            )
+            continue
+        for audio in audios:
+            audio_size = estimate_size(audio, duration)
+            if audio_size is None:
+                continue
+            renditions.append(
+                {"format_id": f"{fmt['format_id']}+{audio['format_id']}",
+                 "size": video_size + audio_size,
+                 "height": fmt.get("height"), "quality": _quality(fmt, audio)}
+            )
+    return renditions
+
+
+def select_format(
+    formats: List[Dict],
+    duration: Optional[float],
+    max_bytes: Optional[float],
+    max_height: Optional[int] = None,
+) -> Optional[Dict]:
+    """
+    Pick the best rendition whose estimated size fits max_bytes
+
+    Args:
+        formats: The "formats" list of a probed info dict
+        duration: Video duration in seconds (used for bitrate estimates)
+        max_bytes: Byte budget for this video (None for no limit)
+        max_height: Optional resolution cap
+
+    Returns:
+        The chosen rendition (format_id, size, height), or None if nothing fits
+    """
+    renditions = [
+        r for r in get_renditions(formats, duration)
+        if (max_bytes is None or r["size"] <= max_bytes)
+        and (max_height is None or (r["height"] or 0) <= max_height)
+    ]
+    if not renditions:
+        return None
+    # Among equal quality prefer the smaller file
+    return max(renditions, key=lambda r: (r["quality"], -r["size"]))
+
+
+class StorageBudget:
+    def __init__(self, per_video: Optional[int] = None, per_topic: Optional[int] = None):
+        """
+        Byte budgets for format selection
+
+        Args:
+            per_video: Maximum bytes for a single video (None for no limit)
+            per_topic: Maximum bytes for all videos of a topic (None for no limit)
+        """
+        self.per_video = per_video
+        self.per_topic = per_topic
+        # Estimated bytes of downloads whose files are not recorded yet
+        # (merges still queued), per topic
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.per_video or self.per_topic)
+
+    def allowance(self, topic_used: int = 0) -> Optional[int]:
+        """Bytes the next video of a topic may take (None for no limit)"""
+        limits = []
+        if self.per_video:
+            limits.append(self.per_video)
+        if self.per_topic:
+            limits.append(self.per_topic - topic_used)
+        return min(limits) if limits else None
+
+    def reserve(self, topic: str, size: float):
+        """Charge a download to its topic until release() (e.g. while its merge is queued)"""
+        with self._lock:
+            self._pending[topic] = self._pending.get(topic, 0) + size
+
+    def release(self, topic: str, size: float):
+        """Undo a reserve() once the download's file is recorded or failed"""
+        with self._lock:
+            self._pending[topic] = max(self._pending.get(topic, 0) - size, 0)
+
+    def pending_bytes(self, topic: str) -> float:
+        """Reserved bytes of a topic not yet recorded anywhere else"""
+        with self._lock:
+            return self._pending.get(topic, 0)
+
+    def choose(self, info: Dict, topic_used: int = 0) -> Optional[str]:
+        """
+        Explicit format ID for a probed video under the budget
+
+        Returns:
+            The format ID, or None (with a message) when nothing fits
+        """
+        choice = self.choose_rendition(info, topic_used)
+        return choice["format_id"] if choice is not None else None
+
+    def choose_rendition(self, info: Dict, topic_used: int = 0) -> Optional[Dict]:
+        """Like choose(), but returns the whole rendition (format_id, size, height)"""
+        allowance = self.allowance(topic_used)
+        if allowance is not None and allowance <= 0:
+            print(f"{Fore.YELLOW}Storage budget exhausted{Style.RESET_ALL}")
+            return None
+        choice = select_format(info.get("formats", []), info.get("duration"), allowance)
+        if choice is None:
+            print(
+                f"{Fore.YELLOW}No rendition of {info.get('id')} fits the budget "
+                f"of {allowance} bytes{Style.RESET_ALL}"
+            )
+            return None
+        print(
+            f"Budget format: {choice['format_id']} "
+            f"({choice['height']}p, ~{choice['size'] / (1024 * 1024):.1f}MB)"
+        )
+        return choice
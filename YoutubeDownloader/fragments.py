@@ -0,0 +1,179 @@
+"""
+Fragment Concurrency - Per-video fragment parallelism for DASH/HLS downloads
+
+yt-dlp fetches the fragments of a DASH/HLS format concurrently when
+concurrent_fragment_downloads is set; the value is fixed for the duration of a
+download. In auto mode the tuner picks it per download by hill climbing on the
+measured throughput of previous downloads and halves it when fragment
+requests start being retried (throttling). A global ceiling bounds the
+fragments in flight across all concurrently downloading videos.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+from colorama import Fore, Style
+
+AUTO = "auto"
+
+# Throughput has to move by more than this to change the level
+TUNE_MARGIN = 0.05
+# Weight of the newest measurement in the per-level throughput average
+EWMA_WEIGHT = 0.5
+
+
+def parse_concurrent_fragments(value: str) -> Union[int, str]:
+    """Parse --concurrent-fragments: a positive number or "auto" """
+    if value.strip().lower() == AUTO:
+        return AUTO
+    count = int(value)
+    if count < 1:
+        raise ValueError("concurrent fragments must be at least 1")
+    return count
+
+
+class FragmentTuner:
+    def __init__(
+        self,
+        fragments: Union[int, str, None] = None,
+        max_total: Optional[int] = None,
+        minimum: int = 1,
+        maximum: int = 16,
+        initial: int = 4,
+    ):
+        """
+        Initialize the tuner
+
+        Args:
+            fragments: Fragments per video, "auto" to tune, None for yt-dlp's default
+            max_total: Ceiling on fragments in flight across all videos (None for none)
+            minimum: Lowest level auto mode goes down to
+            maximum: Highest level auto mode goes up to
+            initial: Starting level in auto mode
+        """
+        if max_total:
+            maximum = min(maximum, max_total)
+        self.auto = fragments == AUTO
+        self.enabled = fragments is not None or max_total is not None
+        self.level = min(initial, maximum) if self.auto else int(fragments or 1)
+        self.max_total = max_total
+        self.minimum = minimum
+        self.maximum = maximum
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._leases: Dict[str, Dict] = {}
+        self._rates: Dict[int, float] = {}
+
+    def _acquire(self) -> int:
+        with self._cond:
+            if self.max_total:
+                while self._in_use >= self.max_total:
+                    self._cond.wait()
+                granted = max(1, min(self.level, self.max_total - self._in_use))
+            else:
+                granted = self.level
+            self._in_use += granted
+            return granted
+
+    def _release(self, granted: int):
+        with self._cond:
+            self._in_use -= granted
+            self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, video: str) -> Iterator[int]:
+        """
+        Reserve fragment slots for one download
+
+        Yields:
+            The concurrent_fragment_downloads value to run the download with
+        """
+        granted = self._acquire()
+        state = {
+            "granted": granted, "bytes": 0, "fragmented": False,
+            "retries": 0, "start": time.monotonic(),
+        }
+        with self._cond:
+            self._leases[video] = state
+        try:
+            yield granted
+        finally:
+            with self._cond:
+                self._leases.pop(video, None)
+            self._release(granted)
+            if self.auto:
+                self._adapt(state, time.monotonic() - state["start"])
+
+    def progress_hook(self, d: Dict):
+        """yt-dlp progress hook measuring fragmented downloads"""
+        video = (d.get("info_dict") or {}).get("id")
+        with self._cond:
+            state = self._leases.get(video)
+            if state is None:
+                return
+            if d.get("fragment_count"):
+                state["fragmented"] = True
+            if d["status"] == "finished":
+                state["bytes"] += d.get("total_bytes") or d.get("downloaded_bytes") or 0
+
+    def retry_sleep(self, video: str, n: int) -> float:
+        """
+        Fragment retry sleep of one download: the retry counts as a throttling
+        signal against that download's lease, and retries back off
+        exponentially
+        """
+        with self._cond:
+            state = self._leases.get(video)
+            if state is not None:
+                state["retries"] += 1
+        return min(0.5 * 2**n, 10.0)
+
+    def ydl_opts(self, video: str) -> Dict:
+        """
+        yt-dlp options the tuner relies on for one download
+
+        Args:
+            video: Key the download's lease() is taken under; yt-dlp only
+                passes the attempt number to retry_sleep_functions, so the
+                video is bound here
+        """
+        if not self.enabled:
+            return {}
+        return {"retry_sleep_functions": {"fragment": lambda n: self.retry_sleep(video, n)}}
+
+    def _adapt(self, state: Dict, elapsed: float):
+        if not state["fragmented"] or elapsed <= 0:
+            return
+        granted = state["granted"]
+        rate = state["bytes"] / elapsed
+        with self._cond:
+            previous = self._rates.get(granted)
+            self._rates[granted] = (
+                rate if previous is None else EWMA_WEIGHT * rate + (1 - EWMA_WEIGHT) * previous
+            )
+            old_level = self.level
+            if state["retries"]:
+                # Multiplicative decrease as soon as the server pushes back
+                self.level = max(self.minimum, granted // 2)
+            elif granted >= self.level:
+                lower = self._rates.get(granted - 1)
+                if lower is None or self._rates[granted] > lower * (1 + TUNE_MARGIN):
+                    self.level = min(self.maximum, granted + 1)
+                elif self._rates[granted] < lower * (1 - TUNE_MARGIN):
+                    self.level = max(self.minimum, granted - 1)
+            new_level = self.level
+        if new_level != old_level:
+            reason = f"{state['retries']} fragment retries" if state["retries"] else (
+                f"{rate / (1024 * 1024):.2f} MB/s at {granted}"
+            )
+            print(
+                f"{Fore.CYAN}Fragment concurrency {old_level} -> {new_level} ({reason}){Style.RESET_ALL}"
+            )
+
+    def describe(self) -> str:
+        mode = f"auto (now {self.level})" if self.auto else str(self.level)
+        if self.max_total:
+            mode += f", at most {self.max_total} in flight"
+        return mode
@@ -1,15 +1,58 @@
-import google.generativeai as genai
+from typing import Dict, List, Optional
+
+
+def _genai():
+    # google.generativeai is slow to import and only needed for Gemini calls
+    import google.generativeai as genai
+
+    return genai
+
 
 def get_gemini_api_key():
     with open("api_keys/gemini_api_key.txt", "r") as f:
         return f.read().strip()
-    
+
 def set_gemini_api_key():
-    genai.configure(api_key=get_gemini_api_key())
-    
+    _genai().configure(api_key=get_gemini_api_key())
+
 def get_gemini_client(model_name="gemini-2.5-pro"):
-    return genai.GenerativeModel(model_name, api_key=get_gemini_api_key())
+    return _genai().GenerativeModel(model_name, api_key=get_gemini_api_key())
 
 def list_gemini_models():
     set_gemini_api_key()
-    return [model.name for model in genai.list_models()]
\ No newline at end of file
+    return [model.name for model in _genai().list_models()]
+
+
+class GeminiClient:
+    """
+    The Gemini calls the analysis pipeline makes, in one place
+
+    Files returned by upload_file/get_file expose name, uri and state.name;
+    FakeGemini in scripts/fake_gemini.py implements the same methods for
+    offline runs.
+    """
+
+    def __init__(self, api_key: Optional[str] = None):
+        self._genai = _genai()
+        self._genai.configure(api_key=api_key or get_gemini_api_key())
+
+    def upload_file(self, path: str, display_name: Optional[str] = None):
+        return self._genai.upload_file(path=path, display_name=display_name)
+
+    def get_file(self, name: str):
+        return self._genai.get_file(name)
+
+    def generate_content(
+        self,
+        model_name: str,
+        parts: List,
+        generation_config: Optional[Dict] = None,
+        timeout: float = 600,
+    ) -> str:
+        model = self._genai.GenerativeModel(model_name=model_name)
+        response = model.generate_content(
+            parts,
+            generation_config=generation_config,
+            request_options={"timeout": timeout},
+        )
+        return response.text
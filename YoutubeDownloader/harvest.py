@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Harvest - Metadata and English subtitles of videos, without their media
+
+Jobs that need only titles, descriptions, durations and transcripts skip the
+media, thumbnail and subtitle file downloads entirely. The info dict comes
+through the metadata cache, the English subtitle track (manual, else
+automatic) is fetched over the pooled yt-dlp sessions and flattened to text,
+and many videos are harvested concurrently.
+
+Rows are appended to a columnar corpus: every batch becomes a new part file
+in a harvest-date partition (date=YYYY-MM-DD/part-*.parquet, or .jsonl when
+pyarrow is not installed), so runs never rewrite earlier data and the corpus
+loads directly into pandas, DuckDB or Spark. An index in the corpus folder
+records the harvested video IDs, so re-runs only harvest new videos.
+
+    python -m YoutubeDownloader.harvest -i urls.txt -o corpus -w 16
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from colorama import Fore, Style, init
+
+from YoutubeDownloader.concurrency import map_bounded
+from YoutubeDownloader.metadata_cache import extract_info, video_id_from_url
+from YoutubeDownloader.metrics import configure_metrics, get_run_metrics
+from YoutubeDownloader.session_pool import get_session_pool
+
+INDEX_FILE = "_index.sqlite"
+DEFAULT_BATCH_SIZE = 1000
+PARQUET = "parquet"
+JSONL = "jsonl"
+AUTO = "auto"
+
+# Corpus columns and their types; every part file has exactly these columns
+COLUMNS = [
+    ("video_id", "string"),
+    ("title", "string"),
+    ("description", "string"),
+    ("duration", "double"),
+    ("upload_date", "string"),
+    ("channel", "string"),
+    ("channel_id", "string"),
+    ("uploader", "string"),
+    ("view_count", "int64"),
+    ("like_count", "int64"),
+    ("tags", "list"),
+    ("categories", "list"),
+    ("language", "string"),
+    ("webpage_url", "string"),
+    ("source", "string"),
+    ("subtitle_kind", "string"),
+    ("subtitle_lang", "string"),
+    ("subtitles", "string"),
+    ("harvested_at", "double"),
+]
+
+# Subtitle formats that can be flattened to text, in order of preference
+SUBTITLE_FORMATS = ("vtt", "json3")
+VTT_TAG = re.compile(r"<[^>]+>")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def select_subtitle(info: Dict, language: str = "en") -> Optional[Tuple[str, str, Dict]]:
+    """
+    Best subtitle track of a language: manual before automatic, and for
+    automatic captions the original ("en-orig") before translations
+
+    Returns:
+        (kind, language code, format entry) or None when there is no track
+    """
+    candidates = [
+        ("manual", info.get("subtitles") or {}, [language]),
+        ("manual", info.get("subtitles") or {}, None),
+        ("automatic", info.get("automatic_captions") or {}, [f"{language}-orig", language]),
+        ("automatic", info.get("automatic_captions") or {}, None),
+    ]
+    for kind, tracks, codes in candidates:
+        if codes is None:
+            codes = sorted(code for code in tracks if code.startswith(f"{language}-"))
+        for code in codes:
+            entries = {entry.get("ext"): entry for entry in tracks.get(code) or []}
+            for ext in SUBTITLE_FORMATS:
+                if ext in entries and entries[ext].get("url"):
+                    return kind, code, entries[ext]
+    return None
+
+
+def vtt_to_text(data: str) -> str:
+    """Plain text of a WebVTT file, without timings, tags or rolled-up repeats"""
+    lines = []
+    in_note = False
+    for line in data.splitlines():
+        line = line.strip()
+        if not line:
+            in_note = False
+            continue
+        if in_note or line.startswith(("WEBVTT", "Kind:", "Language:", "STYLE", "REGION")):
+            continue
+        if line.startswith("NOTE"):
+            in_note = True
+            continue
+        if "-->" in line or line.isdigit():
+            continue
+        text = html.unescape(VTT_TAG.sub("", line)).strip()
+        # Automatic captions repeat the previous line at the top of every cue
+        if text and (not lines or lines[-1] != text):
+            lines.append(text)
+    return "\n".join(lines)
+
+
+def json3_to_text(data: str) -> str:
+    """Plain text of a YouTube json3 subtitle file"""
+    lines = []
+    for event in json.loads(data).get("events") or []:
+        text = "".join(seg.get("utf8", "") for seg in event.get("segs") or []).strip()
+        if text and (not lines or lines[-1] != text):
+            lines.append(text)
+    return "\n".join(lines)
+
+
+def fetch_subtitle_text(entry: Dict) -> str:
+    """Download a subtitle track and flatten it to text"""
+    with get_session_pool().session({"quiet": True}) as ydl:
+        data = ydl.urlopen(entry["url"]).read().decode("utf-8", "replace")
+    if entry.get("ext") == "json3":
+        return json3_to_text(data)
+    return vtt_to_text(data)
+
+
+def _as_type(value, kind: str):
+    if value is None:
+        return None
+    try:
+        if kind == "double":
+            return float(value)
+        if kind == "int64":
+            return int(value)
+        if kind == "list":
+            return [str(item) for item in value]
+        return str(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def make_row(info: Dict, source: Optional[str] = None, subtitle: Optional[Tuple] = None) -> Dict:
+    """
+    Corpus row of a video
+
+    Args:
+        info: yt-dlp info dict
+        source: Topic or channel the video was harvested for
+        subtitle: (kind, language code, text) of the harvested track
+    """
+    subtitle_kind, subtitle_lang, text = subtitle or (None, None, None)
+    values = {
+        "video_id": info.get("id"),
+        "title": info.get("title"),
+        "description": info.get("description"),
+        "duration": info.get("duration"),
+        "upload_date": info.get("upload_date"),
+        "channel": info.get("channel"),
+        "channel_id": info.get("channel_id"),
+        "uploader": info.get("uploader"),
+        "view_count": info.get("view_count"),
+        "like_count": info.get("like_count"),
+        "tags": info.get("tags"),
+        "categories": info.get("categories"),
+        "language": info.get("language"),
+        "webpage_url": info.get("webpage_url"),
+        "source": source,
+        "subtitle_kind": subtitle_kind,
+        "subtitle_lang": subtitle_lang,
+        "subtitles": text,
+        "harvested_at": time.time(),
+    }
+    return {name: _as_type(values[name], kind) for name, kind in COLUMNS}
+
+
+class CorpusWriter:
+    def __init__(self, output_dir: str, format: str = AUTO, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the corpus writer
+
+        Args:
+            output_dir: Corpus folder holding the date partitions and the index
+            format: "parquet", "jsonl" or "auto" (Parquet when pyarrow is installed)
+            batch_size: Rows buffered before a part file is written
+        """
+        if format == AUTO:
+            format = PARQUET if parquet_available() else JSONL
+        elif format == PARQUET and not parquet_available():
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.format = format
+        self.batch_size = max(1, batch_size)
+        self.rows_written = 0
+        self.parts_written = 0
+        self._rows: List[Dict] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(output_dir, INDEX_FILE), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS harvested (
+                video_id TEXT PRIMARY KEY,
+                part TEXT NOT NULL,
+                harvested_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def harvested_ids(self, video_ids: Iterable[str]) -> set:
+        """The given video IDs that are in the corpus already"""
+        video_ids = list(video_ids)
+        found = set()
+        with self._lock:
+            # SQLite limits the number of bound parameters per statement
+            for start in range(0, len(video_ids), 500):
+                chunk = video_ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT video_id FROM harvested WHERE video_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def add(self, row: Dict):
+        """Buffer a row; a full buffer is written out as a new part file"""
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) < self.batch_size:
+                return
+            rows, self._rows = self._rows, []
+        self._write_part(rows)
+
+    def flush(self):
+        """Write the buffered rows"""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if rows:
+            self._write_part(rows)
+
+    def _write_part(self, rows: List[Dict]):
+        partition = os.path.join(self.output_dir, f"date={time.strftime('%Y-%m-%d')}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, f"part-{time.time_ns()}-{os.getpid()}.{self.format}")
+        tmp = f"{path}.tmp"
+        with self._write_lock:
+            if self.format == PARQUET:
+                _write_parquet(rows, tmp)
+            else:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            # Readers never see a half-written part
+            os.replace(tmp, path)
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO harvested VALUES (?, ?, ?)",
+                    [(row["video_id"], os.path.relpath(path, self.output_dir), row["harvested_at"])
+                     for row in rows],
+                )
+                self._conn.commit()
+                self.rows_written += len(rows)
+                self.parts_written += 1
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+def _write_parquet(rows: List[Dict], path: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"string": pa.string(), "double": pa.float64(), "int64": pa.int64(), "list": pa.list_(pa.string())}
+    schema = pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+    table = pa.Table.from_pylist(rows, schema=schema)
+    pq.write_table(table, path, compression="zstd")
+
+
+class Harvester:
+    def __init__(self, writer: CorpusWriter, workers: int = 8, language: str = "en", subtitles: bool = True):
+        """
+        Initialize the harvester
+
+        Args:
+            writer: Corpus the rows are appended to
+            workers: Videos harvested concurrently
+            language: Subtitle language code
+            subtitles: Fetch subtitles (False for metadata only)
+        """
+        self.writer = writer
+        self.workers = max(1, workers)
+        self.language = language
+        self.subtitles = subtitles
+        self.metrics = get_run_metrics()
+        self._lock = threading.Lock()
+        self.counts = {"harvested": 0, "skipped": 0, "failed": 0, "with_subtitles": 0}
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.counts[key] += amount
+
+    def harvest_one(self, url: str, source: Optional[str] = None) -> bool:
+        """Harvest the metadata and subtitles of one video into the corpus"""
+        video_id = video_id_from_url(url) or url
+        try:
+            with self.metrics.stage("probe", video_id):
+                info = extract_info(url, {"quiet": True})
+            if not info:
+                raise ValueError("no metadata returned")
+            subtitle = None
+            track = select_subtitle(info, self.language) if self.subtitles else None
+            if track is not None:
+                kind, lang, entry = track
+                try:
+                    with self.metrics.stage("subtitles", video_id):
+                        subtitle = (kind, lang, fetch_subtitle_text(entry))
+                    self._count("with_subtitles")
+                except Exception as e:
+                    # Metadata is still worth keeping without the transcript
+                    print(f"{Fore.YELLOW}Subtitles of {url} failed: {e}{Style.RESET_ALL}")
+            self.writer.add(make_row(info, source, subtitle))
+            self._count("harvested")
+            return True
+        except Exception as e:
+            print(f"{Fore.RED}✗ Harvest of {url} failed: {e}{Style.RESET_ALL}")
+            self._count("failed")
+            return False
+
+    def harvest(self, urls: List[str], source: Optional[str] = None) -> Dict[str, bool]:
+        """
+        Harvest many videos concurrently, skipping those already in the corpus
+
+        Returns:
+            Dict mapping each harvested URL to whether it succeeded
+        """
+        ids = {url: video_id_from_url(url) or url for url in dict.fromkeys(urls)}
+        done = self.writer.harvested_ids(ids.values())
+        pending = [url for url, video_id in ids.items() if video_id not in done]
+        self._count("skipped", len(ids) - len(pending))
+        print(
+            f"{Fore.CYAN}Harvesting {len(pending)} videos "
+            f"({len(ids) - len(pending)} already in the corpus)...{Style.RESET_ALL}"
+        )
+        results = map_bounded(lambda url: self.harvest_one(url, source), pending, self.workers)
+        self.writer.flush()
+        return dict(zip(pending, results))
+
+    def print_summary(self):
+        counts = self.counts
+        print(
+            f"{Fore.CYAN}Harvest: {counts['harvested']} videos ({counts['with_subtitles']} with subtitles), "
+            f"{counts['skipped']} already harvested, {counts['failed']} failed; "
+            f"{self.writer.rows_written} rows in {self.writer.parts_written} {self.writer.format} parts "
+            f"under {self.writer.output_dir}{Style.RESET_ALL}"
+        )
+
+
+def main():
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(
+        description="Harvest video metadata and English subtitles into a columnar corpus, without media"
+    )
+    parser.add_argument("urls", nargs="*", help="YouTube video URLs")
+    parser.add_argument("-i", "--input-file", help="File containing URLs (one per line)")
+    parser.add_argument("-o", "--output-dir", default="corpus", help="Corpus folder (default: corpus)")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Videos harvested concurrently (default: 8)")
+    parser.add_argument(
+        "--format",
+        default=AUTO,
+        choices=[AUTO, PARQUET, JSONL],
+        help="Part file format (default: parquet when pyarrow is installed, else jsonl)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per part file (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument("--language", default="en", help="Subtitle language (default: en)")
+    parser.add_argument("--no-subtitles", action="store_true", help="Harvest metadata only")
+    parser.add_argument("--source", help="Value of the source column (e.g. a topic name)")
+    parser.add_argument("--metrics-jsonl", help="Append per-stage timing events to this JSON-lines file")
+    args = parser.parse_args()
+    configure_metrics(args.metrics_jsonl)
+
+    urls = list(args.urls)
+    if args.input_file:
+        with open(args.input_file, "r") as f:
+            urls.extend(line.split()[0] for line in f if line.strip() and not line.startswith("#"))
+    if not urls:
+        parser.print_help()
+        sys.exit(1)
+
+    writer = CorpusWriter(args.output_dir, args.format, args.batch_size)
+    harvester = Harvester(writer, args.workers, args.language, subtitles=not args.no_subtitles)
+    try:
+        harvester.harvest(urls, args.source)
+    finally:
+        writer.close()
+    harvester.print_summary()
+    get_run_metrics().finish()
+
+
+if __name__ == "__main__":
+    main()
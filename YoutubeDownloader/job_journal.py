@@ -0,0 +1,122 @@
+"""
+Job Journal - Crash-safe write-ahead log of batch download state
+
+Every state transition of every URL (queued, in progress, done, failed) is
+appended as a JSON line and fsynced before the work it describes starts, so a
+batch that dies halfway can be resumed from the journal alone.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from colorama import Fore, Style
+
+QUEUED = "queued"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_JOURNAL_FILE = ".download_journal.jsonl"
+
+
+class JobJournal:
+    def __init__(self, path: str, resume: bool = True):
+        """
+        Open a job journal
+
+        Args:
+            path: Journal file (JSON lines)
+            resume: Replay an existing journal (False starts a fresh one)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.states: Dict[str, Dict] = self._replay() if resume else {}
+        if resume and self.states:
+            # Rewrite the replayed state so the log does not grow across resumes
+            self._compact()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _replay(self) -> Dict[str, Dict]:
+        states = {}
+        if not os.path.exists(self.path):
+            return states
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    continue
+                states[record["url"]] = record
+        return states
+
+    def _compact(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self.states.values():
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _append(self, records: List[Dict]):
+        with self._lock:
+            for record in records:
+                self.states[record["url"]] = record
+                self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def mark(self, url: str, state: str, error: Optional[str] = None):
+        """Record a state transition of a URL"""
+        record = {"url": url, "state": state, "ts": time.time()}
+        if error:
+            record["error"] = error
+        self._append([record])
+
+    def mark_many(self, urls: Iterable[str], state: str):
+        """Record the same state transition for many URLs with a single fsync"""
+        now = time.time()
+        self._append([{"url": url, "state": state, "ts": now} for url in urls])
+
+    def state(self, url: str) -> Optional[str]:
+        """Last recorded state of a URL (None if never seen)"""
+        record = self.states.get(url)
+        return record["state"] if record else None
+
+    def pending(self, urls: Iterable[str]) -> List[str]:
+        """
+        URLs still to do: everything not recorded as done. Items that were
+        in flight or failed when the previous run stopped are requeued.
+        """
+        return [url for url in urls if self.state(url) != DONE]
+
+    def summary(self) -> Dict[str, int]:
+        """Number of URLs per state"""
+        counts = {QUEUED: 0, IN_PROGRESS: 0, DONE: 0, FAILED: 0}
+        for record in self.states.values():
+            counts[record["state"]] = counts.get(record["state"], 0) + 1
+        return counts
+
+    def report_resume(self, urls: List[str]):
+        """Print what a resumed run will skip and requeue"""
+        done = sum(1 for url in urls if self.state(url) == DONE)
+        requeued = sum(1 for url in urls if self.state(url) in (IN_PROGRESS, FAILED))
+        print(
+            f"{Fore.CYAN}Resuming from {self.path}: {done} done, "
+            f"{requeued} requeued, {len(urls) - done - requeued} new{Style.RESET_ALL}"
+        )
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
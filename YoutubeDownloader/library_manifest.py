@@ -0,0 +1,185 @@
+"""
+Library Manifest - Persistent record of downloaded videos per topic
+
+Replaces per-run directory scans: every completed download is recorded as
+video ID -> path, size, format and timestamp, and membership checks are set
+lookups. reconcile() rebuilds the records from disk when the two drift apart.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from colorama import Fore, Style
+
+from YoutubeDownloader.concurrency import map_bounded
+
+MANIFEST_FILE = "library.sqlite"
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", ".webm")
+
+# YouTube video IDs are 11 characters and may themselves contain "_" and "-"
+VIDEO_ID_SUFFIX = re.compile(r"([A-Za-z0-9_-]{11})$")
+# yt-dlp in-progress files: .part downloads, their fragments and .ytdl state
+PARTIAL_FILE_PATTERN = re.compile(r"(\.part(-Frag\d+)?(\.part)?|\.ytdl)$")
+
+
+def is_partial_file(file_name: str) -> bool:
+    """Whether a file is an in-progress yt-dlp download rather than a video"""
+    return PARTIAL_FILE_PATTERN.search(file_name) is not None
+
+
+def video_id_from_filename(file_name: str) -> str:
+    """Return the video ID at the end of a FreeString_VideoID.Format file name"""
+    stem = file_name.rsplit(".", 1)[0]
+    match = VIDEO_ID_SUFFIX.search(stem)
+    if match:
+        return match.group(1)
+    return stem.split("_")[-1]
+
+
+class LibraryManifest:
+    def __init__(self, path: str):
+        """
+        Initialize the manifest
+
+        Args:
+            path: SQLite file holding the manifest
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS downloads (
+                video_id TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER,
+                format TEXT,
+                downloaded_at REAL NOT NULL,
+                PRIMARY KEY (video_id, topic)
+            )"""
+        )
+        self._conn.commit()
+
+    def record(
+        self,
+        video_id: str,
+        topic: str,
+        path: str,
+        size: Optional[int] = None,
+        format: Optional[str] = None,
+    ):
+        """Record a completed download"""
+        if size is None and os.path.exists(path):
+            size = os.path.getsize(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downloads VALUES (?, ?, ?, ?, ?, ?)",
+                (video_id, topic, os.path.abspath(path), size, format, time.time()),
+            )
+            self._conn.commit()
+
+    def contains(self, video_id: str, topic: Optional[str] = None) -> bool:
+        """Whether a video was downloaded (into a given topic, if set)"""
+        query = "SELECT 1 FROM downloads WHERE video_id = ?"
+        params = [video_id]
+        if topic is not None:
+            query += " AND topic = ?"
+            params.append(topic)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone() is not None
+
+    def get(self, video_id: str) -> List[Dict]:
+        """All records of a video, one per topic"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT topic, path, size, format, downloaded_at FROM downloads WHERE video_id = ?",
+                (video_id,),
+            ).fetchall()
+        return [
+            {"video_id": video_id, "topic": topic, "path": path, "size": size,
+             "format": format, "downloaded_at": downloaded_at}
+            for topic, path, size, format, downloaded_at in rows
+        ]
+
+    def topic_ids(self, topic: str) -> Set[str]:
+        """Video IDs downloaded into a topic, as a set for O(1) lookups"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id FROM downloads WHERE topic = ?", (topic,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def topic_bytes(self, topic: str) -> int:
+        """Total size of the videos recorded for a topic"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM downloads WHERE topic = ?", (topic,)
+            ).fetchone()[0]
+
+    def has_topic(self, topic: str) -> bool:
+        """Whether the manifest holds any record for a topic"""
+        with self._lock:
+            return (
+                self._conn.execute(
+                    "SELECT 1 FROM downloads WHERE topic = ? LIMIT 1", (topic,)
+                ).fetchone()
+                is not None
+            )
+
+    def remove(self, video_id: str, topic: str):
+        """Forget a download"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM downloads WHERE video_id = ? AND topic = ?",
+                (video_id, topic),
+            )
+            self._conn.commit()
+
+    def reconcile(self, topic_folders: Dict[str, str], workers: int = 8) -> int:
+        """
+        Rebuild the records of the given topics from the files on disk
+
+        Args:
+            topic_folders: Mapping of topic name to topic folder
+            workers: Number of topic folders scanned concurrently
+
+        Returns:
+            Number of videos recorded
+        """
+        topics = list(topic_folders.items())
+        scanned = map_bounded(lambda item: _scan_topic_folder(item[1]), topics, workers)
+
+        recorded = 0
+        with self._lock:
+            for (topic, _), rows in zip(topics, scanned):
+                self._conn.execute("DELETE FROM downloads WHERE topic = ?", (topic,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO downloads VALUES (?, ?, ?, ?, ?, ?)",
+                    [(video_id, topic, path, size, None, mtime)
+                     for video_id, path, size, mtime in rows],
+                )
+                recorded += len(rows)
+            self._conn.commit()
+        print(f"{Fore.CYAN}Manifest reconciled: {recorded} videos in {len(topics)} topics{Style.RESET_ALL}")
+        return recorded
+
+
+def _scan_topic_folder(folder: str) -> List:
+    if not os.path.isdir(folder):
+        return []
+    rows = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(VIDEO_EXTENSIONS):
+                stat = entry.stat()
+                rows.append(
+                    (video_id_from_filename(entry.name), os.path.abspath(entry.path),
+                     stat.st_size, stat.st_mtime)
+                )
+    return rows
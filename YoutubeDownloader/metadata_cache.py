@@ -0,0 +1,264 @@
+"""
+Metadata Cache - Persistent SQLite cache of yt-dlp extract_info results
+
+Entries are keyed by video ID (or by channel URL for flat listings) and split
+into field classes with their own TTL: immutable fields such as title and
+duration are kept for weeks, volatile fields such as signed format URLs only
+for a short while.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+
+from YoutubeDownloader.definitions import CACHE_FOLDER
+from YoutubeDownloader.session_pool import get_session_pool
+from YoutubeDownloader.sqlite_lru import LRUStore
+
+METADATA_DB_FILE = "metadata.sqlite"
+
+IMMUTABLE = "immutable"
+VOLATILE = "volatile"
+LISTING = "listing"
+
+DEFAULT_TTL = {
+    IMMUTABLE: 30 * 24 * 3600,
+    # Signed googlevideo URLs expire after roughly six hours
+    VOLATILE: 3600,
+    LISTING: 3600,
+}
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Fields that go stale quickly: format URLs, the format chosen from them and
+# counters. Everything else in an info dict is treated as immutable.
+VOLATILE_FIELDS = {
+    "formats",
+    "requested_formats",
+    "requested_downloads",
+    "requested_subtitles",
+    "subtitles",
+    "automatic_captions",
+    "url",
+    "manifest_url",
+    "fragment_base_url",
+    "fragments",
+    "http_headers",
+    "protocol",
+    "format",
+    "format_id",
+    "format_note",
+    "ext",
+    "width",
+    "height",
+    "resolution",
+    "aspect_ratio",
+    "fps",
+    "dynamic_range",
+    "vcodec",
+    "acodec",
+    "audio_channels",
+    "asr",
+    "tbr",
+    "vbr",
+    "abr",
+    "filesize",
+    "filesize_approx",
+    "stretched_ratio",
+    "view_count",
+    "like_count",
+    "comment_count",
+    "concurrent_view_count",
+    "live_status",
+    "is_live",
+    "was_live",
+    "availability",
+    "epoch",
+    "_has_drm",
+    "_format_sort_fields",
+}
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    """Return the video ID of a watch, youtu.be or shorts URL (None otherwise)"""
+    parsed = urlparse(url)
+    video_id = parse_qs(parsed.query).get("v", [None])[0]
+    if video_id:
+        return video_id
+    parts = [part for part in parsed.path.split("/") if part]
+    if parsed.netloc.endswith("youtu.be") and parts:
+        return parts[0]
+    if len(parts) >= 2 and parts[0] in ("shorts", "embed", "live"):
+        return parts[1]
+    return None
+
+
+class MetadataCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[Dict[str, float]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize the metadata cache
+
+        Args:
+            path: SQLite file (default: CACHE_FOLDER/metadata.sqlite)
+            ttl: Seconds to keep each field class, merged over DEFAULT_TTL
+            max_bytes: Total payload size above which least recently used
+                entries are evicted
+        """
+        if path is None:
+            os.makedirs(CACHE_FOLDER, exist_ok=True)
+            path = os.path.join(CACHE_FOLDER, METADATA_DB_FILE)
+        self.path = path
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self.max_bytes = max_bytes
+        self.store = LRUStore(
+            path,
+            "metadata",
+            (
+                "key TEXT NOT NULL",
+                "field_class TEXT NOT NULL",
+                "payload TEXT NOT NULL",
+                "size INTEGER NOT NULL",
+                "fetched_at REAL NOT NULL",
+                "accessed_at REAL NOT NULL",
+            ),
+            ("key", "field_class"),
+            max_bytes,
+        )
+
+    def _read(self, key: str, field_class: str, now: float) -> Optional[Dict]:
+        row = self.store.read(("payload", "fetched_at"), key=key, field_class=field_class)
+        if row is None or now - row[1] > self.ttl[field_class]:
+            return None
+        return json.loads(row[0])
+
+    def get(self, key: str, need_volatile: bool = True) -> Optional[Dict]:
+        """
+        Look up a cached video info dict
+
+        Args:
+            key: Video ID
+            need_volatile: Require fresh format URLs (False returns the
+                immutable fields alone when the volatile ones have expired)
+
+        Returns:
+            The cached info dict, or None on a miss
+        """
+        now = time.time()
+        with self.store.lock:
+            info = self._read(key, IMMUTABLE, now)
+            volatile = self._read(key, VOLATILE, now) if info is not None else None
+            if info is None or (need_volatile and volatile is None):
+                self.store.miss()
+                return None
+            self.store.hit(now, key=key)
+        if volatile:
+            info.update(volatile)
+        return info
+
+    def put(self, key: str, info: Dict):
+        """Store a video info dict, split into immutable and volatile fields"""
+        immutable = {k: v for k, v in info.items() if k not in VOLATILE_FIELDS}
+        volatile = {k: v for k, v in info.items() if k in VOLATILE_FIELDS}
+        self._write(key, {IMMUTABLE: immutable, VOLATILE: volatile})
+
+    def get_listing(self, key: str) -> Optional[Dict]:
+        """Look up a cached flat channel/playlist listing"""
+        now = time.time()
+        with self.store.lock:
+            info = self._read(key, LISTING, now)
+            if info is None:
+                self.store.miss()
+                return None
+            self.store.hit(now, key=key)
+        return info
+
+    def put_listing(self, key: str, info: Dict):
+        """Store a flat channel/playlist listing"""
+        self._write(key, {LISTING: info})
+
+    def _write(self, key: str, payloads: Dict[str, Dict]):
+        now = time.time()
+        rows = []
+        for field_class, payload in payloads.items():
+            data = json.dumps(payload, ensure_ascii=False, default=str)
+            rows.append(
+                {"key": key, "field_class": field_class, "payload": data,
+                 "size": len(data), "fetched_at": now, "accessed_at": now}
+            )
+        self.store.write(rows)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size of the cache"""
+        return self.store.stats()
+
+    def clear(self):
+        """Remove every cached entry"""
+        self.store.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Return the process-wide metadata cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache()
+        return _cache
+
+
+def extract_info(
+    url: str,
+    ydl_opts: Optional[Dict] = None,
+    need_volatile: bool = True,
+    cache: Optional[MetadataCache] = None,
+) -> Optional[Dict]:
+    """
+    extract_info through the metadata cache
+
+    Videos are cached by video ID; URLs extracted with extract_flat (channels,
+    playlists) are cached as listings keyed by URL and playlist limit.
+
+    Args:
+        url: Video, channel or playlist URL
+        ydl_opts: yt-dlp options used on a cache miss
+        need_volatile: Require fresh format URLs for video entries
+        cache: Cache to use (default: the process-wide cache)
+
+    Returns:
+        The info dict, or None if yt-dlp returned nothing
+    """
+    ydl_opts = ydl_opts or {"quiet": True}
+    cache = cache or get_metadata_cache()
+
+    if ydl_opts.get("extract_flat"):
+        key = f"{url}|{ydl_opts.get('playlistend') or ''}"
+        info = cache.get_listing(key)
+        if info is None:
+            info = _extract(url, ydl_opts)
+            if info:
+                cache.put_listing(key, info)
+        return info
+
+    key = video_id_from_url(url) or url
+    info = cache.get(key, need_volatile=need_volatile)
+    if info is None:
+        info = _extract(url, ydl_opts)
+        if info:
+            cache.put(key, info)
+    return info
+
+
+def _extract(url: str, ydl_opts: Dict) -> Optional[Dict]:
+    with get_session_pool().session(ydl_opts) as ydl:
+        return ydl.sanitize_info(ydl.extract_info(url, download=False))
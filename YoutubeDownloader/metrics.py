@@ -0,0 +1,256 @@
+"""
+Run Metrics - Per-stage timings, JSON-lines events and end-of-run reports
+
+Stages are timed with the stage() context manager (flat_extract, probe,
+download) and from yt-dlp hooks: pre_download is the time from the start of a
+download to its first progress callback (subtitle and thumbnail writes),
+postprocess is timed per postprocessor (ffmpeg merge, subtitle embed, ...).
+Every finished stage is one JSON line when a metrics file is configured.
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from colorama import Fore, Style
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (None for no values)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class RunMetrics:
+    def __init__(self, jsonl_path: Optional[str] = None):
+        """
+        Initialize the metrics collector
+
+        Args:
+            jsonl_path: File the stage events are appended to (None to keep
+                them in memory only)
+        """
+        self._lock = threading.Lock()
+        self._file = None
+        self.stages: Dict[str, List[float]] = {}
+        self.videos: Dict[str, Dict] = {}
+        self._download_started: Dict[str, float] = {}
+        self._postprocess_started: Dict[tuple, float] = {}
+        self.started = time.time()
+        if jsonl_path:
+            self.open(jsonl_path)
+
+    def open(self, jsonl_path: str):
+        """Start appending stage events to a JSON-lines file"""
+        os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+        with self._lock:
+            self._file = open(jsonl_path, "a", encoding="utf-8")
+
+    def record(self, stage: str, duration: float, video: Optional[str] = None, **fields):
+        """Record one finished stage"""
+        event = {"ts": time.time(), "stage": stage, "duration": round(duration, 6)}
+        if video:
+            event["video"] = video
+        event.update(fields)
+        with self._lock:
+            self.stages.setdefault(stage, []).append(duration)
+            if video:
+                entry = self.videos.setdefault(video, {"bytes": 0, "stages": {}})
+                entry["stages"][stage] = entry["stages"].get(stage, 0) + duration
+            if self._file is not None:
+                self._file.write(json.dumps(event) + "\n")
+                self._file.flush()
+
+    @contextmanager
+    def stage(self, name: str, video: Optional[str] = None, **fields):
+        """Time the enclosed block as one stage"""
+        start = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, time.monotonic() - start, video, ok=ok, **fields)
+
+    def begin_download(self, video: str):
+        """Mark the start of a download; its first progress callback ends pre_download"""
+        with self._lock:
+            self._download_started[video] = time.monotonic()
+
+    def end_download(self, video: str):
+        """Forget a download that ended without a progress callback (failed or skipped)"""
+        with self._lock:
+            self._download_started.pop(video, None)
+
+    @contextmanager
+    def downloading(self, video: str):
+        """begin_download() for the enclosed block, end_download() after it"""
+        self.begin_download(video)
+        try:
+            yield
+        finally:
+            self.end_download(video)
+
+    def progress_hook(self, d: Dict):
+        """yt-dlp progress hook timing pre_download and counting bytes"""
+        video = (d.get("info_dict") or {}).get("id")
+        if not video:
+            return
+        if d["status"] == "downloading":
+            with self._lock:
+                start = self._download_started.pop(video, None)
+            if start is not None:
+                self.record("pre_download", time.monotonic() - start, video)
+        elif d["status"] == "finished":
+            nbytes = d.get("total_bytes") or d.get("downloaded_bytes") or 0
+            with self._lock:
+                entry = self.videos.setdefault(video, {"bytes": 0, "stages": {}})
+                entry["bytes"] += nbytes
+
+    def postprocessor_hook(self, d: Dict):
+        """yt-dlp postprocessor hook timing each postprocessor of a video"""
+        video = (d.get("info_dict") or {}).get("id")
+        key = (video, d.get("postprocessor"))
+        if d["status"] == "started":
+            with self._lock:
+                self._postprocess_started[key] = time.monotonic()
+        elif d["status"] == "finished":
+            with self._lock:
+                start = self._postprocess_started.pop(key, None)
+            if start is not None:
+                self.record(
+                    "postprocess", time.monotonic() - start, video,
+                    postprocessor=d.get("postprocessor"),
+                )
+
+    def hooks(self) -> Dict:
+        """yt-dlp options installing the metrics hooks next to existing ones"""
+        return {"postprocessor_hooks": [self.postprocessor_hook]}
+
+    def report(self) -> Dict:
+        """Per-stage latency percentiles and per-video bytes and throughput"""
+        with self._lock:
+            stages = {
+                name: {
+                    "count": len(values),
+                    "total": sum(values),
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                }
+                for name, values in self.stages.items()
+            }
+            videos = {}
+            for video, entry in self.videos.items():
+                download = entry["stages"].get("download")
+                videos[video] = {
+                    "bytes": entry["bytes"],
+                    "duration": download,
+                    "throughput": entry["bytes"] / download if download else None,
+                    "stages": dict(entry["stages"]),
+                }
+        return {
+            "wall_time": time.time() - self.started,
+            "stages": stages,
+            "videos": videos,
+            "bytes": sum(v["bytes"] for v in videos.values()),
+        }
+
+    def print_report(self):
+        """Print the end-of-run report"""
+        report = self.report()
+        if not report["stages"]:
+            return
+        print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}STAGE TIMINGS{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
+        print(f"{'Stage':<15} {'Count':>6} {'Total (s)':>10} {'p50 (s)':>9} {'p95 (s)':>9}")
+        for name, stage in sorted(report["stages"].items()):
+            print(
+                f"{name:<15} {stage['count']:>6} {stage['total']:>10.2f} "
+                f"{stage['p50']:>9.2f} {stage['p95']:>9.2f}"
+            )
+        for video, entry in report["videos"].items():
+            if entry["throughput"]:
+                print(
+                    f"{video}: {entry['bytes'] / (1024 * 1024):.1f}MB in "
+                    f"{entry['duration']:.1f}s ({entry['throughput'] / (1024 * 1024):.2f} MB/s)"
+                )
+        print(f"Wall time: {report['wall_time']:.1f}s")
+
+    def write_prometheus(self, path: str, prefix: str = "youtube_downloader"):
+        """Write the report in the Prometheus textfile collector format"""
+        report = self.report()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Duration of each pipeline stage",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, stage in sorted(report["stages"].items()):
+            for quantile, label in (("p50", "0.5"), ("p95", "0.95")):
+                lines.append(
+                    f'{prefix}_stage_seconds{{stage="{name}",quantile="{label}"}} '
+                    f"{stage[quantile]:.6f}"
+                )
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {stage["total"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+        lines += [
+            f"# HELP {prefix}_bytes Bytes downloaded in the last run",
+            f"# TYPE {prefix}_bytes gauge",
+            f"{prefix}_bytes {report['bytes']}",
+            f"# HELP {prefix}_videos Videos downloaded in the last run",
+            f"# TYPE {prefix}_videos gauge",
+            f"{prefix}_videos {len(report['videos'])}",
+            f"# HELP {prefix}_wall_seconds Wall time of the last run",
+            f"# TYPE {prefix}_wall_seconds gauge",
+            f"{prefix}_wall_seconds {report['wall_time']:.3f}",
+        ]
+        # The node exporter may read at any moment; publish atomically
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def finish(self, prometheus_textfile: Optional[str] = None):
+        """Print the report, export it if asked and close the events file"""
+        self.print_report()
+        if prometheus_textfile:
+            self.write_prometheus(prometheus_textfile)
+            print(f"Metrics written to: {prometheus_textfile}")
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_metrics = RunMetrics()
+
+
+def get_run_metrics() -> RunMetrics:
+    """Return the process-wide metrics collector"""
+    return _metrics
+
+
+def timed(stage: str):
+    """Decorator timing every call of a function as one stage"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _metrics.stage(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def configure_metrics(metrics_jsonl: Optional[str] = None):
+    """Apply the --metrics-jsonl command line value to the collector"""
+    if metrics_jsonl:
+        _metrics.open(metrics_jsonl)
@@ -0,0 +1,268 @@
+"""
+Post-processing Pool - ffmpeg merges and subtitle embeds off the download workers
+
+yt-dlp merges bestvideo+bestaudio (and would embed subtitles) inline, right
+after the streams are fetched, so a download worker's network sits idle while
+ffmpeg runs. In offloaded mode the streams of a merged format are downloaded
+as separate files and the merge runs on a process pool sized to the cores.
+Submitting blocks while the pool already has its fill of pending merges, which
+holds the download workers back instead of piling up unmerged streams on disk.
+"""
+
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+
+from colorama import Fore, Style
+
+from YoutubeDownloader.metrics import get_run_metrics
+from YoutubeDownloader.progress import get_progress_dashboard
+
+AUTO = "auto"
+
+# Subtitle codec per container when embedding text subtitles
+SUBTITLE_CODECS = {"mp4": "mov_text", "m4v": "mov_text", "mov": "mov_text", "webm": "webvtt"}
+
+
+def parse_postprocess_workers(value: str) -> Union[int, str]:
+    """Parse --postprocess-workers: a positive number or "auto" (one per core)"""
+    if value.strip().lower() == AUTO:
+        return AUTO
+    count = int(value)
+    if count < 1:
+        raise ValueError("post-processing workers must be at least 1")
+    return count
+
+
+def merge_streams(
+    pieces: List[str], output: str, subtitles: List[str], ffmpeg: str = "ffmpeg"
+) -> float:
+    """
+    Mux separately downloaded streams (and subtitle files) into one file
+
+    Runs in a pool process. The pieces are removed once the output is in place.
+
+    Returns:
+        Seconds spent in ffmpeg
+    """
+    start = time.monotonic()
+    root, ext = os.path.splitext(output)
+    temp = f"{root}.temp{ext}"
+    command = [ffmpeg, "-y", "-nostdin", "-loglevel", "error"]
+    for path in pieces + subtitles:
+        command += ["-i", path]
+    for index in range(len(pieces) + len(subtitles)):
+        command += ["-map", str(index)]
+    command += ["-c", "copy"]
+    if subtitles:
+        command += ["-c:s", SUBTITLE_CODECS.get(ext.lstrip(".").lower(), "copy")]
+    command.append(temp)
+
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        if os.path.exists(temp):
+            os.remove(temp)
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"ffmpeg exited with {result.returncode}")
+    os.replace(temp, output)
+    for path in pieces:
+        os.remove(path)
+    return time.monotonic() - start
+
+
+def download_streams(ydl, info: Dict) -> Optional[Dict]:
+    """
+    Download the streams of a merged format without merging them
+
+    Args:
+        ydl: YoutubeDL session whose outtmpl names the merged output
+        info: Processed info dict (format selection already applied)
+
+    Returns:
+        Merge job {"pieces", "output", "subtitles"} for PostProcessPool.submit,
+        or None when the selected format is a single file (nothing to merge)
+    """
+    if not info.get("requested_formats"):
+        return None
+    output = ydl.prepare_filename(info)
+    saved_outtmpl, saved_fixup = ydl.params["outtmpl"], ydl.params.get("fixup")
+    # Post hooks announce finished files; the pieces are not, the merge output is
+    saved_post_hooks, ydl._post_hooks = ydl._post_hooks, []
+    outtmpl = dict(saved_outtmpl)
+    # Pieces are named like yt-dlp's own pre-merge files; subtitles and the
+    # thumbnail keep the final name so the second stream reuses them
+    default = outtmpl.get("default", "%(title)s [%(id)s].%(ext)s")
+    for kind in ("subtitle", "thumbnail"):
+        outtmpl[kind] = outtmpl.get(kind) or default
+    outtmpl["default"] = default.rsplit(".%(ext)s", 1)[0] + ".f%(format_id)s.%(ext)s"
+    ydl.params["outtmpl"] = outtmpl
+    # The merge remuxes every stream, which covers yt-dlp's container fixups
+    ydl.params["fixup"] = "never"
+    pieces, subtitles = [], []
+    try:
+        for requested in info["requested_formats"]:
+            piece = dict(info)
+            del piece["requested_formats"]
+            piece.update(requested)
+            ydl.process_info(piece)
+            pieces.append(piece["filepath"])
+            for sub in (piece.get("requested_subtitles") or {}).values():
+                path = sub.get("filepath")
+                if path and path not in subtitles and os.path.exists(path):
+                    subtitles.append(path)
+    finally:
+        ydl.params["outtmpl"] = saved_outtmpl
+        ydl._post_hooks = saved_post_hooks
+        if saved_fixup is None:
+            ydl.params.pop("fixup", None)
+        else:
+            ydl.params["fixup"] = saved_fixup
+    return {"pieces": pieces, "output": output, "subtitles": subtitles}
+
+
+class PostProcessPool:
+    def __init__(
+        self,
+        workers: Union[int, str, None] = None,
+        max_pending: Optional[int] = None,
+        ffmpeg: str = "ffmpeg",
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            workers: ffmpeg processes run in parallel ("auto" or None for one per core)
+            max_pending: Merges queued or running before submit() blocks
+                (default: twice the workers)
+            ffmpeg: ffmpeg executable
+        """
+        self.workers = (os.cpu_count() or 1) if workers in (None, AUTO) else int(workers)
+        self.max_pending = max_pending or 2 * self.workers
+        self.ffmpeg = ffmpeg
+        self.available = shutil.which(ffmpeg) is not None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._callbacks_done: Dict[str, threading.Event] = {}
+        self.completed = 0
+        self.failed = 0
+        self.cpu_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs download threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(
+        self, key: str, job: Dict, on_done: Optional[Callable[[Optional[str]], None]] = None
+    ) -> Future:
+        """
+        Queue a merge job from download_streams
+
+        Blocks while max_pending merges are already queued or running.
+
+        Args:
+            key: Video key the merge is tracked under (see pending())
+            job: Merge job from download_streams
+            on_done: Called with the output path, or None if the merge failed
+        """
+        start = time.monotonic()
+        self._slots.acquire()
+        waited = time.monotonic() - start
+        try:
+            future = self._get_executor().submit(
+                merge_streams, job["pieces"], job["output"], job["subtitles"], self.ffmpeg
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        callback_done = threading.Event()
+        with self._lock:
+            self.blocked_seconds += waited
+            self._futures[key] = future
+            self._callbacks_done[key] = callback_done
+
+        def finished(f: Future):
+            self._slots.release()
+            error = f.exception()
+            with self._lock:
+                if error is None:
+                    self.completed += 1
+                    self.cpu_seconds += f.result()
+                else:
+                    self.failed += 1
+            if error is None:
+                get_run_metrics().record("postprocess", f.result(), key, postprocessor="Merger")
+                get_progress_dashboard().write(
+                    f"{Fore.GREEN}✓ Merged: {job['output']}{Style.RESET_ALL}"
+                )
+            else:
+                get_progress_dashboard().write(
+                    f"{Fore.RED}✗ Merge failed for {job['output']}: {error}{Style.RESET_ALL}"
+                )
+            if on_done is not None:
+                on_done(job["output"] if error is None else None)
+            callback_done.set()
+
+        future.add_done_callback(finished)
+        return future
+
+    def pending(self, key: str) -> Optional[Future]:
+        """The merge future submitted under key, if any"""
+        with self._lock:
+            return self._futures.get(key)
+
+    def drain(self) -> Dict[str, bool]:
+        """
+        Wait for every submitted merge
+
+        Returns:
+            Dict mapping each key to whether its merge succeeded
+        """
+        with self._lock:
+            futures, self._futures = self._futures, {}
+            callbacks_done, self._callbacks_done = self._callbacks_done, {}
+        for done in callbacks_done.values():
+            done.wait()
+        return {key: future.exception() is None for key, future in futures.items()}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cpu_seconds": self.cpu_seconds,
+                "blocked_seconds": self.blocked_seconds,
+            }
+
+    def shutdown(self):
+        """Wait for the pending merges and stop the pool processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def create_postprocess_pool(workers: Union[int, str, None]) -> Optional[PostProcessPool]:
+    """A PostProcessPool for --postprocess-workers, or None to merge inline"""
+    if workers is None:
+        return None
+    pool = PostProcessPool(workers)
+    if not pool.available:
+        print(
+            f"{Fore.YELLOW}ffmpeg not found; post-processing stays inline{Style.RESET_ALL}"
+        )
+        return None
+    return pool
@@ -0,0 +1,222 @@
+"""
+Progress Dashboard - One throttled progress renderer for every in-flight download
+
+yt-dlp calls progress hooks thousands of times per video. The hooks only
+record state here; a single background thread renders it at a fixed rate:
+a status line rewritten in place on a terminal, or compact periodic status
+lines when output goes to a file or pipe. The thread ends once nothing is
+active or queued (and on flush), so it never draws over later output, and
+starts again with the next item.
+"""
+
+import shutil
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ProgressDashboard:
+    def __init__(
+        self,
+        refresh_interval: float = 0.5,
+        status_interval: float = 10.0,
+        stream=None,
+    ):
+        """
+        Initialize the dashboard
+
+        Args:
+            refresh_interval: Seconds between redraws on a terminal
+            status_interval: Seconds between status lines when not on a terminal
+            stream: Output stream (default: sys.stdout)
+        """
+        self.stream = stream or sys.stdout
+        self.tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.refresh_interval = refresh_interval
+        self.status_interval = status_interval
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._items: Dict[str, Dict] = {}
+        self._queued = 0
+        self._done = 0
+        self._failed = 0
+        self._finished_bytes = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_status = 0.0
+        self._last_line = ""
+
+    def hook(self, d: Dict):
+        """yt-dlp progress hook; records state only, never writes"""
+        key = d.get("filename") or d.get("tmpfilename") or ""
+        info = d.get("info_dict") or {}
+        with self._lock:
+            if d["status"] == "downloading":
+                self._items[key] = {
+                    "label": info.get("title") or info.get("id") or key,
+                    "downloaded": d.get("downloaded_bytes") or 0,
+                    "total": d.get("total_bytes") or d.get("total_bytes_estimate"),
+                    "speed": d.get("speed") or 0,
+                    "eta": d.get("eta"),
+                }
+            else:
+                item = self._items.pop(key, None)
+                if d["status"] == "finished":
+                    self._finished_bytes += d.get("total_bytes") or (item or {}).get("downloaded", 0)
+        self._ensure_running()
+
+    def add_queued(self, count: int):
+        """Register items waiting for a worker"""
+        with self._lock:
+            self._queued += count
+        self._ensure_running()
+
+    def item_started(self):
+        """A queued item was picked up by a worker"""
+        with self._lock:
+            self._queued = max(0, self._queued - 1)
+        self._ensure_running()
+
+    def item_done(self, success: bool):
+        """A worker finished an item"""
+        with self._lock:
+            if success:
+                self._done += 1
+            else:
+                self._failed += 1
+
+    def snapshot(self) -> Dict:
+        """Aggregate state: active items, queue depth, bytes/s and ETA"""
+        with self._lock:
+            items = [dict(item) for item in self._items.values()]
+            speed = sum(item["speed"] for item in items)
+            remaining = sum(
+                item["total"] - item["downloaded"] for item in items if item["total"]
+            )
+            return {
+                "items": items,
+                "active": len(items),
+                "queued": self._queued,
+                "done": self._done,
+                "failed": self._failed,
+                "speed": speed,
+                "eta": remaining / speed if speed else None,
+                "bytes": self._finished_bytes + sum(item["downloaded"] for item in items),
+            }
+
+    def format_status(self, width: Optional[int] = None) -> str:
+        """One status line: aggregate figures followed by per-item progress"""
+        from tqdm import tqdm
+
+        state = self.snapshot()
+        eta = tqdm.format_interval(state["eta"]) if state["eta"] is not None else "--:--"
+        line = (
+            f"[{state['active']} active | {state['queued']} queued | "
+            f"{state['done']} done | {state['failed']} failed] "
+            f"{tqdm.format_sizeof(state['bytes'], 'B', 1024)} at "
+            f"{tqdm.format_sizeof(state['speed'], 'B/s', 1024)} ETA {eta}"
+        )
+        for item in state["items"]:
+            percent = (
+                f"{item['downloaded'] / item['total'] * 100:.0f}%"
+                if item["total"]
+                else tqdm.format_sizeof(item["downloaded"], "B", 1024)
+            )
+            item_eta = item["eta"]
+            if item_eta is None and item["total"] and item["speed"]:
+                item_eta = (item["total"] - item["downloaded"]) / item["speed"]
+            line += (
+                f" | {item['label'][:24]} {percent} "
+                f"{tqdm.format_sizeof(item['speed'], 'B/s', 1024)} "
+                f"ETA {tqdm.format_interval(item_eta) if item_eta is not None else '--:--'}"
+            )
+        if width:
+            line = line[: width - 1]
+        return line
+
+    def _idle(self) -> bool:
+        return not self._items and not self._queued
+
+    def _ensure_running(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name="progress-dashboard", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self, stop: threading.Event):
+        while not stop.wait(self.refresh_interval):
+            with self._lock:
+                if self._idle():
+                    # Restarted by the next queued item or progress event
+                    self._thread = None
+                    return
+            self.render()
+
+    def _stop_thread(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def render(self, force: bool = False):
+        """Draw the current state (rate limited unless force is set)"""
+        if self.tty:
+            with self._lock:
+                idle = self._idle()
+            if idle and not force:
+                return
+            width = shutil.get_terminal_size((120, 20)).columns
+            line = self.format_status(width)
+            with self._write_lock:
+                if line != self._last_line or force:
+                    self.stream.write(f"\r{line}\x1b[K")
+                    self.stream.flush()
+                    self._last_line = line
+            return
+        now = time.monotonic()
+        if force or now - self._last_status >= self.status_interval:
+            state = self.snapshot()
+            if force or state["active"] or state["queued"]:
+                with self._write_lock:
+                    self.stream.write(self.format_status() + "\n")
+                    self.stream.flush()
+            self._last_status = now
+
+    def write(self, message: str):
+        """Print a message without tearing the in-place status line"""
+        with self._write_lock:
+            if self.tty and self._last_line:
+                self.stream.write("\r\x1b[K")
+                self._last_line = ""
+            self.stream.write(message + "\n")
+            self.stream.flush()
+
+    def flush(self):
+        """Stop redrawing, draw a final status and end the in-place line"""
+        self._stop_thread()
+        self.render(force=True)
+        if self.tty:
+            with self._write_lock:
+                self.stream.write("\n")
+                self.stream.flush()
+                self._last_line = ""
+
+
+_dashboard = None
+_dashboard_lock = threading.Lock()
+
+
+def get_progress_dashboard() -> ProgressDashboard:
+    """Return the process-wide progress dashboard"""
+    global _dashboard
+    with _dashboard_lock:
+        if _dashboard is None:
+            _dashboard = ProgressDashboard()
+        return _dashboard
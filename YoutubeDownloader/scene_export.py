@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Scene Export - GIFs and clips of many scenes of a video from shared decodes
+
+Running one `ffmpeg -ss ... -to ... palettegen/paletteuse` command per scene
+decodes the source once per scene. Here scenes lying close together form a
+group that is exported by a single ffmpeg run: the group's time range is
+decoded once, scaled once, split, and trimmed into one output per scene inside
+the filter graph. Groups that cannot share a decode run in parallel across the
+cores. GIF palettes are cached per scene in CACHE_FOLDER, so re-exporting a
+scene reuses its palette instead of buffering the scene for palettegen.
+
+    python -m YoutubeDownloader.scene_export Alternators.mp4 scenes.txt -o gifs
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from colorama import init, Fore, Style
+
+from YoutubeDownloader.concurrency import map_bounded
+from YoutubeDownloader.definitions import CACHE_FOLDER
+from YoutubeDownloader.youtube_utils import parse_timestamp
+
+PALETTE_CACHE_FOLDER = os.path.join(CACHE_FOLDER, "palettes")
+# Scenes whose gap is at most this many seconds share one decode
+DEFAULT_MAX_GAP = 5.0
+# Outputs per ffmpeg run; every GIF branch buffers its scene for palettegen
+DEFAULT_MAX_GROUP_SCENES = 8
+
+
+def format_timestamp(seconds: float) -> str:
+    return f"{seconds:.3f}"
+
+
+def safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name.strip()).strip("_") or "scene"
+
+
+def load_scenes(filename: str) -> List[Dict]:
+    """
+    Load a scene list
+
+    Either a JSON list of {"start", "end", "name"} objects or a text file
+    with one "START END NAME" (or "START-END NAME") line per scene; "#" starts
+    a comment line.
+
+    Returns:
+        Scenes as dicts with start/end in seconds, in file order
+    """
+    with open(filename, "r") as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        raw = json.loads(content)
+        scenes = [
+            {
+                "start": parse_timestamp(str(item["start"])),
+                "end": parse_timestamp(str(item["end"])),
+                "name": item.get("name") or f"scene{index}",
+            }
+            for index, item in enumerate(raw, 1)
+        ]
+    else:
+        scenes = []
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            match = re.match(r"^(\S+?)\s*(?:-|\s)\s*(\S+)\s*(.*)$", line)
+            if not match:
+                raise ValueError(f"Cannot parse scene line: {line}")
+            start, end, name = match.groups()
+            scenes.append({
+                "start": parse_timestamp(start),
+                "end": parse_timestamp(end),
+                "name": name or f"scene{len(scenes) + 1}",
+            })
+    for scene in scenes:
+        if scene["end"] <= scene["start"]:
+            raise ValueError(f"Scene {scene['name']} ends before it starts")
+    return scenes
+
+
+def group_scenes(
+    scenes: List[Dict],
+    max_gap: float = DEFAULT_MAX_GAP,
+    max_scenes: int = DEFAULT_MAX_GROUP_SCENES,
+) -> List[List[Dict]]:
+    """
+    Group scenes that are close enough to be cut from one decode
+
+    A scene joins the current group when it starts at most max_gap seconds
+    after the furthest end seen so far (overlaps always join) and the group
+    has room; decoding the gap is cheaper than another seek and decoder start.
+    """
+    groups: List[List[Dict]] = []
+    group_end = None
+    for scene in sorted(scenes, key=lambda s: (s["start"], s["end"])):
+        if (
+            groups
+            and scene["start"] - group_end <= max_gap
+            and len(groups[-1]) < max_scenes
+        ):
+            groups[-1].append(scene)
+            group_end = max(group_end, scene["end"])
+        else:
+            groups.append([scene])
+            group_end = scene["end"]
+    return groups
+
+
+class SceneExporter:
+    def __init__(
+        self,
+        source: str,
+        output_dir: str = "scenes",
+        mode: str = "gif",
+        fps: int = 15,
+        width: int = 480,
+        workers: Optional[int] = None,
+        max_gap: float = DEFAULT_MAX_GAP,
+        max_group_scenes: int = DEFAULT_MAX_GROUP_SCENES,
+        palette_cache: Optional[str] = PALETTE_CACHE_FOLDER,
+        ffmpeg: str = "ffmpeg",
+    ):
+        """
+        Initialize the exporter
+
+        Args:
+            source: Downloaded video to cut scenes from
+            output_dir: Directory the GIFs/clips are written to
+            mode: "gif" or "clip" (H.264/AAC MP4)
+            fps: GIF frame rate
+            width: Output width in pixels (height keeps the aspect ratio)
+            workers: ffmpeg runs in parallel (default: one per core)
+            max_gap: Largest gap in seconds between scenes sharing a decode
+            max_group_scenes: Most scenes exported by one ffmpeg run
+            palette_cache: Folder caching GIF palettes (None disables the cache)
+            ffmpeg: ffmpeg executable
+        """
+        if mode not in ("gif", "clip"):
+            raise ValueError(f"Unknown export mode: {mode}")
+        self.source = source
+        self.output_dir = output_dir
+        self.mode = mode
+        self.fps = fps
+        self.width = width
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_gap = max_gap
+        self.max_group_scenes = max_group_scenes
+        self.palette_cache = palette_cache
+        self.ffmpeg = ffmpeg
+        self._has_audio: Optional[bool] = None
+
+    def output_path(self, scene: Dict) -> str:
+        ext = "gif" if self.mode == "gif" else "mp4"
+        return os.path.join(self.output_dir, f"{safe_name(scene['name'])}.{ext}")
+
+    def palette_path(self, scene: Dict) -> Optional[str]:
+        """Cache file of a scene's palette, keyed by the source file and the render settings"""
+        if self.palette_cache is None:
+            return None
+        stat = os.stat(self.source)
+        key = json.dumps([
+            os.path.abspath(self.source), stat.st_size, stat.st_mtime_ns,
+            round(scene["start"], 3), round(scene["end"], 3), self.fps, self.width,
+        ])
+        return os.path.join(self.palette_cache, hashlib.sha1(key.encode()).hexdigest() + ".png")
+
+    def has_audio(self) -> bool:
+        if self._has_audio is None:
+            ffprobe = os.path.join(os.path.dirname(self.ffmpeg), "ffprobe")
+            try:
+                result = subprocess.run(
+                    [ffprobe, "-v", "error", "-select_streams", "a",
+                     "-show_entries", "stream=index", "-of", "csv=p=0", self.source],
+                    capture_output=True, text=True,
+                )
+                self._has_audio = bool(result.stdout.strip())
+            except OSError:
+                self._has_audio = False
+        return self._has_audio
+
+    def build_command(self, group: List[Dict], threads: int = 0) -> List[str]:
+        """
+        The ffmpeg command exporting every scene of a group in one decode
+
+        The group's range is seeked to once; scene times inside the filter
+        graph are relative to the group start.
+        """
+        start = min(scene["start"] for scene in group)
+        end = max(scene["end"] for scene in group)
+        command = [self.ffmpeg, "-y", "-nostdin", "-loglevel", "error"]
+        if threads:
+            command += ["-threads", str(threads)]
+        command += [
+            "-ss", format_timestamp(start), "-to", format_timestamp(end), "-i", self.source,
+        ]
+
+        count = len(group)
+        filters = []
+        outputs = []
+        if self.mode == "gif":
+            palettes = [self.palette_path(scene) for scene in group]
+            cached = {}
+            for index, palette in enumerate(palettes):
+                if palette and os.path.exists(palette):
+                    cached[index] = 1 + len(cached)
+                    command += ["-i", palette]
+            filters.append(
+                f"[0:v]fps={self.fps},scale={self.width}:-1:flags=lanczos,split={count}"
+                + "".join(f"[v{i}]" for i in range(count))
+            )
+            for i, scene in enumerate(group):
+                trim = (
+                    f"[v{i}]trim=start={format_timestamp(scene['start'] - start)}"
+                    f":end={format_timestamp(scene['end'] - start)},setpts=PTS-STARTPTS"
+                )
+                if i in cached:
+                    filters.append(f"{trim}[s{i}];[s{i}][{cached[i]}:v]paletteuse[out{i}]")
+                elif palettes[i]:
+                    # Generate the palette once and keep a copy for the next export
+                    filters.append(
+                        f"{trim},split[s{i}][t{i}];[t{i}]palettegen,split[p{i}][pc{i}];"
+                        f"[s{i}][p{i}]paletteuse[out{i}]"
+                    )
+                    outputs += ["-map", f"[pc{i}]", "-frames:v", "1", "-update", "1", palettes[i]]
+                else:
+                    filters.append(
+                        f"{trim},split[s{i}][t{i}];[t{i}]palettegen[p{i}];[s{i}][p{i}]paletteuse[out{i}]"
+                    )
+                outputs += ["-map", f"[out{i}]", self.output_path(scene)]
+        else:
+            audio = self.has_audio()
+            filters.append(
+                f"[0:v]scale={self.width}:-2,split={count}" + "".join(f"[v{i}]" for i in range(count))
+            )
+            if audio:
+                filters.append(f"[0:a]asplit={count}" + "".join(f"[a{i}]" for i in range(count)))
+            for i, scene in enumerate(group):
+                rel_start = format_timestamp(scene["start"] - start)
+                rel_end = format_timestamp(scene["end"] - start)
+                filters.append(
+                    f"[v{i}]trim=start={rel_start}:end={rel_end},setpts=PTS-STARTPTS[out{i}]"
+                )
+                outputs += ["-map", f"[out{i}]"]
+                if audio:
+                    filters.append(
+                        f"[a{i}]atrim=start={rel_start}:end={rel_end},asetpts=PTS-STARTPTS[aout{i}]"
+                    )
+                    outputs += ["-map", f"[aout{i}]", "-c:a", "aac"]
+                outputs += ["-c:v", "libx264", "-pix_fmt", "yuv420p", self.output_path(scene)]
+
+        command += ["-filter_complex", ";".join(filters)] + outputs
+        return command
+
+    def plan(self, scenes: List[Dict]) -> List[List[str]]:
+        """The ffmpeg commands export() would run, one per group"""
+        groups = group_scenes(scenes, self.max_gap, self.max_group_scenes)
+        threads = max(1, (os.cpu_count() or 1) // min(self.workers, len(groups) or 1))
+        return [self.build_command(group, threads) for group in groups]
+
+    def export(self, scenes: List[Dict]) -> Dict[str, bool]:
+        """
+        Export every scene
+
+        Returns:
+            Dict mapping each output path to whether it was written
+        """
+        if shutil.which(self.ffmpeg) is None:
+            print(f"{Fore.RED}ffmpeg not found: {self.ffmpeg}{Style.RESET_ALL}")
+            return {self.output_path(scene): False for scene in scenes}
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == "gif" and self.palette_cache is not None:
+            os.makedirs(self.palette_cache, exist_ok=True)
+
+        groups = group_scenes(scenes, self.max_gap, self.max_group_scenes)
+        workers = min(self.workers, len(groups)) or 1
+        # Split the cores between the ffmpeg runs instead of oversubscribing them
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        print(
+            f"{Fore.CYAN}Exporting {len(scenes)} scenes in {len(groups)} decodes "
+            f"({workers} in parallel){Style.RESET_ALL}"
+        )
+
+        def run(group):
+            started = time.monotonic()
+            result = subprocess.run(self.build_command(group, threads), capture_output=True, text=True)
+            names = ", ".join(scene["name"] for scene in group)
+            if result.returncode != 0:
+                lines = result.stderr.strip().splitlines()
+                print(f"{Fore.RED}✗ {names}: {lines[-1] if lines else 'ffmpeg failed'}{Style.RESET_ALL}")
+                return False
+            print(f"{Fore.GREEN}✓ {names} ({time.monotonic() - started:.1f}s){Style.RESET_ALL}")
+            return True
+
+        outcome = map_bounded(run, groups, workers)
+        return {
+            self.output_path(scene): success and os.path.exists(self.output_path(scene))
+            for group, success in zip(groups, outcome)
+            for scene in group
+        }
+
+
+def main():
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(
+        description="Export GIFs or clips of many scenes of a video with shared decodes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Scene file: one "START END NAME" line per scene, e.g.
+  00:00:00 00:00:10 scene1_warehouse
+  00:00:11 00:00:20 scene2_dismantling
+or a JSON list of {"start": ..., "end": ..., "name": ...} objects.
+        """,
+    )
+    parser.add_argument("source", help="Downloaded video file")
+    parser.add_argument("scenes", help="Scene list file")
+    parser.add_argument("-o", "--output-dir", default="scenes", help="Output directory (default: scenes)")
+    parser.add_argument("--mode", choices=["gif", "clip"], default="gif", help="Export GIFs or MP4 clips")
+    parser.add_argument("--fps", type=int, default=15, help="GIF frame rate (default: 15)")
+    parser.add_argument("--width", type=int, default=480, help="Output width in pixels (default: 480)")
+    parser.add_argument("-w", "--workers", type=int, help="ffmpeg runs in parallel (default: one per core)")
+    parser.add_argument(
+        "--max-gap", type=float, default=DEFAULT_MAX_GAP,
+        help=f"Largest gap in seconds between scenes sharing a decode (default: {DEFAULT_MAX_GAP:g})",
+    )
+    parser.add_argument(
+        "--max-group-scenes", type=int, default=DEFAULT_MAX_GROUP_SCENES,
+        help=f"Most scenes exported by one ffmpeg run (default: {DEFAULT_MAX_GROUP_SCENES})",
+    )
+    parser.add_argument("--no-palette-cache", action="store_true", help="Do not cache GIF palettes")
+    parser.add_argument("--print-commands", action="store_true", help="Print the ffmpeg commands and exit")
+    args = parser.parse_args()
+
+    try:
+        scenes = load_scenes(args.scenes)
+    except (OSError, ValueError) as e:
+        print(f"{Fore.RED}Error reading scenes: {e}{Style.RESET_ALL}")
+        sys.exit(1)
+
+    exporter = SceneExporter(
+        args.source,
+        args.output_dir,
+        mode=args.mode,
+        fps=args.fps,
+        width=args.width,
+        workers=args.workers,
+        max_gap=args.max_gap,
+        max_group_scenes=args.max_group_scenes,
+        palette_cache=None if args.no_palette_cache else PALETTE_CACHE_FOLDER,
+    )
+    if args.print_commands:
+        import shlex
+
+        for command in exporter.plan(scenes):
+            print(shlex.join(command))
+        return
+
+    results = exporter.export(scenes)
+    failed = [path for path, ok in results.items() if not ok]
+    print(f"\n{Fore.CYAN}Exported {len(results) - len(failed)}/{len(results)} scenes to {args.output_dir}{Style.RESET_ALL}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
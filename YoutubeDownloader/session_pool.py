@@ -0,0 +1,193 @@
+"""
+Session Pool - Reusable yt-dlp YoutubeDL sessions
+
+Building a YoutubeDL instance initialises extractors, the cookie jar and the
+HTTP handlers, and closing it drops its keep-alive connections. The pool keeps
+idle instances keyed by their effective options and lends them out one caller
+at a time. Options that yt-dlp reads per call (format, output template,
+fragment concurrency and retry sleeps, clip ranges and the hooks) are applied for the duration
+of a checkout and restored afterwards, so they do not split the pool.
+"""
+
+import atexit
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# Options applied per checkout instead of being part of the session key
+PER_CALL_OPTIONS = (
+    "format",
+    "outtmpl",
+    "concurrent_fragment_downloads",
+    "retry_sleep_functions",
+    "download_ranges",
+    "force_keyframes_at_cuts",
+    "progress_hooks",
+    "post_hooks",
+    "postprocessor_hooks",
+)
+
+
+# Per-call options yt-dlp reads straight from params when a download starts
+PER_CALL_PARAMS = (
+    "concurrent_fragment_downloads",
+    "retry_sleep_functions",
+    "download_ranges",
+    "force_keyframes_at_cuts",
+)
+
+
+def options_key(ydl_opts: Dict) -> str:
+    """Stable key of the options that define a session"""
+    return json.dumps(
+        {k: v for k, v in ydl_opts.items() if k not in PER_CALL_OPTIONS},
+        sort_keys=True,
+        default=repr,
+    )
+
+
+class YoutubeDLPool:
+    def __init__(self, max_idle: int = 16):
+        """
+        Initialize the pool
+
+        Args:
+            max_idle: Idle sessions kept across all keys (least recently used
+                ones are closed first)
+        """
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: "OrderedDict[str, List]" = OrderedDict()
+        self.created = 0
+        self.reused = 0
+
+    def _checkout(self, key: str, ydl_opts: Dict):
+        with self._lock:
+            sessions = self._idle.get(key)
+            if sessions:
+                self.reused += 1
+                ydl = sessions.pop()
+                if not sessions:
+                    del self._idle[key]
+                return ydl
+            self.created += 1
+
+        import yt_dlp
+
+        return yt_dlp.YoutubeDL(
+            {k: v for k, v in ydl_opts.items() if k not in PER_CALL_OPTIONS}
+        )
+
+    def _checkin(self, key: str, ydl):
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(key, []).append(ydl)
+            self._idle.move_to_end(key)
+            while sum(len(s) for s in self._idle.values()) > self.max_idle:
+                oldest = next(iter(self._idle))
+                evicted.append(self._idle[oldest].pop(0))
+                if not self._idle[oldest]:
+                    del self._idle[oldest]
+        for old in evicted:
+            old.close()
+
+    @contextmanager
+    def session(self, ydl_opts: Dict) -> Iterator:
+        """
+        Borrow a YoutubeDL configured with ydl_opts
+
+        The session returns to the pool when the block exits normally; one
+        that raised is closed instead, since yt-dlp may have been left
+        mid-download.
+        """
+        key = options_key(ydl_opts)
+        ydl = self._checkout(key, ydl_opts)
+        saved = _apply_per_call(ydl, ydl_opts)
+        reusable = False
+        try:
+            yield ydl
+            reusable = True
+        except GeneratorExit:
+            # A generator holding the session was closed early; nothing failed
+            reusable = True
+            raise
+        finally:
+            _restore_per_call(ydl, saved)
+            if reusable:
+                self._checkin(key, ydl)
+            else:
+                ydl.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            idle = sum(len(s) for s in self._idle.values())
+        return {"created": self.created, "reused": self.reused, "idle": idle}
+
+    def close(self):
+        """Close every idle session"""
+        with self._lock:
+            sessions = [ydl for s in self._idle.values() for ydl in s]
+            self._idle.clear()
+        for ydl in sessions:
+            ydl.close()
+
+
+def _apply_per_call(ydl, ydl_opts: Dict) -> Dict:
+    saved = {
+        "format": ydl.params.get("format"),
+        "format_selector": ydl.format_selector,
+        "outtmpl": ydl.params["outtmpl"],
+        "params": {name: ydl.params.get(name) for name in PER_CALL_PARAMS},
+        "progress_hooks": ydl._progress_hooks,
+        "post_hooks": ydl._post_hooks,
+        "postprocessor_hooks": ydl._postprocessor_hooks,
+        "pp_hooks": [(pp, pp._progress_hooks) for pps in ydl._pps.values() for pp in pps],
+    }
+    if ydl_opts.get("format") is not None:
+        ydl.params["format"] = ydl_opts["format"]
+        ydl.format_selector = ydl.build_format_selector(ydl_opts["format"])
+    if ydl_opts.get("outtmpl") is not None:
+        outtmpl = dict(saved["outtmpl"])
+        if isinstance(ydl_opts["outtmpl"], dict):
+            outtmpl.update(ydl_opts["outtmpl"])
+        else:
+            outtmpl["default"] = ydl_opts["outtmpl"]
+        ydl.params["outtmpl"] = outtmpl
+    for name in PER_CALL_PARAMS:
+        if ydl_opts.get(name) is not None:
+            ydl.params[name] = ydl_opts[name]
+    ydl._progress_hooks = saved["progress_hooks"] + list(ydl_opts.get("progress_hooks") or [])
+    ydl._post_hooks = saved["post_hooks"] + list(ydl_opts.get("post_hooks") or [])
+    pp_hooks = list(ydl_opts.get("postprocessor_hooks") or [])
+    ydl._postprocessor_hooks = saved["postprocessor_hooks"] + pp_hooks
+    for pp, hooks in saved["pp_hooks"]:
+        pp._progress_hooks = hooks + pp_hooks
+    return saved
+
+
+def _restore_per_call(ydl, saved: Dict):
+    ydl.params["format"] = saved["format"]
+    ydl.format_selector = saved["format_selector"]
+    ydl.params["outtmpl"] = saved["outtmpl"]
+    for name, value in saved["params"].items():
+        if value is None:
+            # yt-dlp falls back to its default only when the key is absent
+            ydl.params.pop(name, None)
+        else:
+            ydl.params[name] = value
+    ydl._progress_hooks = saved["progress_hooks"]
+    ydl._post_hooks = saved["post_hooks"]
+    ydl._postprocessor_hooks = saved["postprocessor_hooks"]
+    for pp, hooks in saved["pp_hooks"]:
+        pp._progress_hooks = hooks
+
+
+_pool = YoutubeDLPool()
+atexit.register(_pool.close)
+
+
+def get_session_pool() -> YoutubeDLPool:
+    """Return the process-wide YoutubeDL session pool"""
+    return _pool
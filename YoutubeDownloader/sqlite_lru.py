@@ -0,0 +1,145 @@
+"""
+SQLite LRU Store - One table of cache entries with a byte budget
+
+The storage under the metadata and analysis caches: a WAL-mode SQLite table
+whose rows carry a size and an accessed_at time, hit/miss/eviction counters,
+and eviction of expired rows and then of least recently used rows once the
+table outgrows its budget. The caches own the columns, keys and expiry rules.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class LRUStore:
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        columns: Sequence[str],
+        key_columns: Sequence[str],
+        max_bytes: int,
+    ):
+        """
+        Open (or create) the table
+
+        Args:
+            path: SQLite file
+            table: Table name
+            columns: Column definitions; must include "size INTEGER" (payload
+                bytes) and "accessed_at REAL"
+            key_columns: Columns forming the primary key
+            max_bytes: Total size above which least recently used rows are
+                evicted
+        """
+        self.path = path
+        self.table = table
+        self.key_columns = tuple(key_columns)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            + ", ".join(list(columns) + [f"PRIMARY KEY ({', '.join(self.key_columns)})"])
+            + ")"
+        )
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)"
+        )
+        self.conn.commit()
+
+    def read(self, columns: Sequence[str], **key) -> Optional[Tuple]:
+        """Columns of the row matching key (call with lock held)"""
+        where = " AND ".join(f"{name} = ?" for name in key)
+        return self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM {self.table} WHERE {where}",
+            tuple(key.values()),
+        ).fetchone()
+
+    def hit(self, now: float, **key):
+        """Count a hit and mark the rows matching key as used (call with lock held)"""
+        self.hits += 1
+        where = " AND ".join(f"{name} = ?" for name in key)
+        self.conn.execute(
+            f"UPDATE {self.table} SET accessed_at = ? WHERE {where}",
+            (now,) + tuple(key.values()),
+        )
+        self.conn.commit()
+
+    def miss(self):
+        """Count a miss (call with lock held)"""
+        self.misses += 1
+
+    def write(self, rows: List[Dict], expired: Optional[Tuple[str, float]] = None):
+        """
+        Insert or replace rows, then evict
+
+        Args:
+            rows: Column -> value dicts; accessed_at defaults to now
+            expired: (column, cutoff): rows whose column is below cutoff are
+                dropped before the size budget is applied
+        """
+        now = time.time()
+        with self.lock:
+            for row in rows:
+                row = dict(row)
+                row.setdefault("accessed_at", now)
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} ({', '.join(row)}) "
+                    f"VALUES ({', '.join('?' for _ in row)})",
+                    tuple(row.values()),
+                )
+            self._evict(expired)
+            self.conn.commit()
+
+    def _evict(self, expired: Optional[Tuple[str, float]]):
+        if expired is not None:
+            column, cutoff = expired
+            removed = self.conn.execute(
+                f"DELETE FROM {self.table} WHERE {column} < ?", (cutoff,)
+            ).rowcount
+            self.evictions += max(removed, 0)
+        total = self.conn.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until 90% of the budget is free
+        target = self.max_bytes * 0.9
+        keys = ", ".join(self.key_columns)
+        where = " AND ".join(f"{name} = ?" for name in self.key_columns)
+        rows = self.conn.execute(
+            f"SELECT {keys}, size FROM {self.table} ORDER BY accessed_at"
+        ).fetchall()
+        for row in rows:
+            if total <= target:
+                break
+            self.conn.execute(f"DELETE FROM {self.table} WHERE {where}", row[:-1])
+            total -= row[-1]
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size of the table"""
+        with self.lock:
+            entries, size = self.conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self):
+        """Remove every row"""
+        with self.lock:
+            self.conn.execute(f"DELETE FROM {self.table}")
+            self.conn.commit()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Video Analysis - Run a Gemini prompt over many downloaded videos
+
+Videos are uploaded and analysed concurrently. Responses are served from
+the analysis cache when the same content was analysed with the same prompt,
+model and config before, and an upload is skipped when a file with the same
+content (sha256) was uploaded before and Gemini still has it. Processing
+state is polled with backoff: the first poll is timed from the processing
+speed seen on earlier files, later polls back off geometrically, instead of
+a fixed sleep per check.
+
+    python -m YoutubeDownloader.video_analysis data/denso.mp4 data/borg.mp4 -w 4
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from colorama import init, Fore, Style
+
+from YoutubeDownloader.analysis_cache import AnalysisCache, analysis_key, get_analysis_cache, parse_scenes
+from YoutubeDownloader.concurrency import map_bounded
+from YoutubeDownloader.definitions import CACHE_FOLDER
+from YoutubeDownloader.metrics import configure_metrics, get_run_metrics
+
+UPLOAD_DB_FILE = "gemini_uploads.sqlite"
+DEFAULT_MODEL = "gemini-2.5-pro"
+# Gemini deletes uploaded files after 48 hours; stop reusing them a bit earlier
+UPLOAD_TTL = 47 * 3600
+
+DEFAULT_PROMPT = (
+    "Please describe the video in detail. Please include the following: \n"
+    "1. The times for every scene.\n"
+    "2. Describe the setup that is seen in each scene.\n"
+    "3. Provide a a list of the tools that are used in each scene.\n"
+    "4. Provide the actions that are taken in each scene.\n"
+    "5. Also provide what the narrator says in each scene.\n"
+    "6. Enumerate the scenes in the order they are seen in the video.\n"
+)
+
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+_hash_memo_lock = threading.Lock()
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Content hash of a file, memoised per path, size and mtime"""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _hash_memo_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+class UploadRegistry:
+    def __init__(self, path: Optional[str] = None, ttl: float = UPLOAD_TTL):
+        """
+        Gemini file names of uploaded videos, keyed by content hash
+
+        Args:
+            path: SQLite file (default: CACHE_FOLDER/gemini_uploads.sqlite)
+            ttl: Seconds an upload is reused for
+        """
+        if path is None:
+            os.makedirs(CACHE_FOLDER, exist_ok=True)
+            path = os.path.join(CACHE_FOLDER, UPLOAD_DB_FILE)
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS uploads (
+                content_hash TEXT PRIMARY KEY,
+                file_name TEXT NOT NULL,
+                uploaded_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, content_hash: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_name, uploaded_at FROM uploads WHERE content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return row[0]
+
+    def put(self, content_hash: str, file_name: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?)",
+                (content_hash, file_name, time.time()),
+            )
+            self._conn.commit()
+
+    def drop(self, content_hash: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM uploads WHERE content_hash = ?", (content_hash,))
+            self._conn.commit()
+
+
+class VideoAnalyzer:
+    def __init__(
+        self,
+        client=None,
+        model_name: str = DEFAULT_MODEL,
+        workers: int = 4,
+        registry: Optional[UploadRegistry] = None,
+        cache: Optional[AnalysisCache] = None,
+        poll_min: float = 1.0,
+        poll_max: float = 30.0,
+        poll_factor: float = 1.5,
+        processing_timeout: float = 1800,
+        request_timeout: float = 600,
+    ):
+        """
+        Initialize the analyzer
+
+        Args:
+            client: GeminiClient or a stand-in with the same methods
+                (default: a GeminiClient using api_keys/gemini_api_key.txt)
+            model_name: Gemini model used for generate_content
+            workers: Videos uploaded and analysed concurrently
+            registry: Upload registry (default: the one in CACHE_FOLDER)
+            cache: Analysis cache consulted before uploading (None for no caching)
+            poll_min: Shortest wait between processing-state polls
+            poll_max: Longest wait between processing-state polls
+            poll_factor: Growth of the wait after each poll that still shows
+                the file processing
+            processing_timeout: Seconds to wait for a file to become active
+            request_timeout: Timeout of one generate_content request
+        """
+        self._client = client
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.registry = registry or UploadRegistry()
+        self.cache = cache
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        self.processing_timeout = processing_timeout
+        self.request_timeout = request_timeout
+        self.metrics = get_run_metrics()
+        self._lock = threading.Lock()
+        self._hash_locks: Dict[str, threading.Lock] = {}
+        # Seconds of processing per MB, averaged over finished files
+        self._processing_rate: Optional[float] = None
+        self.uploads = 0
+        self.reused = 0
+        self.polls = 0
+
+    @property
+    def client(self):
+        # Created on first use, so fully cached runs need neither the SDK nor a key
+        with self._lock:
+            if self._client is None:
+                from YoutubeDownloader.gemini_utils import GeminiClient
+
+                self._client = GeminiClient()
+            return self._client
+
+    def _hash_lock(self, content_hash: str) -> threading.Lock:
+        with self._lock:
+            return self._hash_locks.setdefault(content_hash, threading.Lock())
+
+    def upload(self, path: str):
+        """
+        Upload a video, or reuse the live upload of a file with the same content
+
+        Returns:
+            The Gemini file handle
+        """
+        content_hash = file_sha256(path)
+        # Workers holding the same content wait for one upload instead of racing
+        with self._hash_lock(content_hash):
+            name = self.registry.get(content_hash)
+            if name is not None:
+                try:
+                    video_file = self.client.get_file(name)
+                    if video_file.state.name != "FAILED":
+                        with self._lock:
+                            self.reused += 1
+                        return video_file
+                except Exception:
+                    pass
+                self.registry.drop(content_hash)
+
+            with self.metrics.stage("upload", Path(path).name):
+                video_file = self.client.upload_file(path, display_name=Path(path).name)
+            self.registry.put(content_hash, video_file.name)
+            with self._lock:
+                self.uploads += 1
+            return video_file
+
+    def wait_until_active(self, video_file, size: int = 0):
+        """
+        Poll a file until Gemini has processed it
+
+        Args:
+            video_file: File handle from upload()
+            size: Size of the uploaded video in bytes, used to time the first poll
+
+        Returns:
+            The active file handle
+        """
+        start = time.monotonic()
+        delay = self.poll_min
+        polled = False
+        if self._processing_rate is not None and size:
+            # Expect the file to be ready about when earlier files were
+            delay = min(self.poll_max, max(self.poll_min, self._processing_rate * size / (1024 * 1024)))
+        while video_file.state.name == "PROCESSING":
+            if time.monotonic() - start > self.processing_timeout:
+                raise TimeoutError(f"{video_file.name} still processing after {self.processing_timeout:.0f}s")
+            # Jitter keeps concurrent workers from polling in lockstep
+            time.sleep(delay * random.uniform(0.9, 1.1))
+            delay = min(self.poll_max, delay * self.poll_factor)
+            video_file = self.client.get_file(video_file.name)
+            polled = True
+            with self._lock:
+                self.polls += 1
+        if video_file.state.name == "FAILED":
+            raise ValueError(f"Processing of {video_file.name} failed")
+
+        elapsed = time.monotonic() - start
+        # Files that were already active (reused uploads) say nothing about the speed
+        if size and polled:
+            rate = elapsed / (size / (1024 * 1024))
+            with self._lock:
+                self._processing_rate = (
+                    rate if self._processing_rate is None else 0.5 * rate + 0.5 * self._processing_rate
+                )
+        return video_file
+
+    def analyze(self, path: str, prompt: str = DEFAULT_PROMPT, generation_config: Optional[Dict] = None) -> str:
+        """
+        Upload (or reuse) a video, wait for processing and run the prompt on it
+
+        Returns:
+            The response text
+        """
+        return self.analyze_entry(path, prompt, generation_config)["response"]
+
+    def analyze_entry(
+        self, path: str, prompt: str = DEFAULT_PROMPT, generation_config: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Like analyze(), with the scenes parsed from the response
+
+        Returns:
+            {"response": text, "scenes": [...], "cached": bool}
+        """
+        name = Path(path).name
+        key = None
+        if self.cache is not None:
+            content_hash = file_sha256(path)
+            key = analysis_key(content_hash, prompt, self.model_name, generation_config)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return dict(entry, cached=True)
+
+        video_file = self.upload(path)
+        with self.metrics.stage("processing", name):
+            video_file = self.wait_until_active(video_file, os.path.getsize(path))
+        with self.metrics.stage("generate", name, model=self.model_name):
+            response = self.client.generate_content(
+                self.model_name, [prompt, video_file], generation_config, self.request_timeout
+            )
+        if key is not None:
+            entry = self.cache.put(key, content_hash, self.model_name, response)
+        else:
+            entry = {"response": response, "scenes": parse_scenes(response)}
+        return dict(entry, cached=False)
+
+    def analyze_many(
+        self, paths: List[str], prompt: str = DEFAULT_PROMPT, generation_config: Optional[Dict] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Analyse videos concurrently
+
+        Returns:
+            Dict mapping each path to its response text (None if it failed)
+        """
+
+        def process(path):
+            try:
+                text = self.analyze(path, prompt, generation_config)
+                print(f"{Fore.GREEN}✓ Analysed {path}{Style.RESET_ALL}")
+                return text
+            except Exception as e:
+                print(f"{Fore.RED}✗ Analysis of {path} failed: {e}{Style.RESET_ALL}")
+                return None
+
+        return dict(zip(paths, map_bounded(process, paths, self.workers)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"uploads": self.uploads, "reused": self.reused, "polls": self.polls}
+
+
+def main():
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Run a Gemini prompt over downloaded videos")
+    parser.add_argument("videos", nargs="+", help="Video files to analyse")
+    parser.add_argument("-p", "--prompt", help="Prompt text (default: the scene description prompt)")
+    parser.add_argument("--prompt-file", help="Read the prompt from this file")
+    parser.add_argument("-m", "--model", default=DEFAULT_MODEL, help=f"Gemini model (default: {DEFAULT_MODEL})")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Videos analysed concurrently (default: 4)")
+    parser.add_argument("-o", "--output-dir", help="Write each response to <output-dir>/<video>.txt instead of printing it")
+    parser.add_argument(
+        "--scenes-dir",
+        help="Also write the parsed scenes of each video to <scenes-dir>/<video>.scenes.txt "
+        "in the scene_export format",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not fill the analysis cache")
+    parser.add_argument("--metrics-jsonl", help="Append per-stage timing events to this JSON-lines file")
+    args = parser.parse_args()
+    configure_metrics(args.metrics_jsonl)
+
+    prompt = args.prompt or DEFAULT_PROMPT
+    if args.prompt_file:
+        with open(args.prompt_file, "r") as f:
+            prompt = f.read()
+
+    analyzer = VideoAnalyzer(
+        model_name=args.model,
+        workers=args.workers,
+        cache=None if args.no_cache else get_analysis_cache(),
+    )
+    results = analyzer.analyze_many(args.videos, prompt)
+
+    for path, text in results.items():
+        if text is None:
+            continue
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            output = os.path.join(args.output_dir, f"{Path(path).stem}.txt")
+            with open(output, "w") as f:
+                f.write(text)
+            print(f"Saved {output}")
+        else:
+            print(f"\n{Fore.CYAN}{path}{Style.RESET_ALL}\n{text}")
+        if args.scenes_dir:
+            os.makedirs(args.scenes_dir, exist_ok=True)
+            output = os.path.join(args.scenes_dir, f"{Path(path).stem}.scenes.txt")
+            with open(output, "w") as f:
+                for scene in parse_scenes(text):
+                    name = f"scene{scene['index']}_{scene['title']}"
+                    f.write(f"{scene['start']:g} {scene['end']:g} {name}\n")
+            print(f"Saved {output}")
+
+    stats = analyzer.stats()
+    print(f"\nUploads: {stats['uploads']} new / {stats['reused']} reused, {stats['polls']} processing polls")
+    if analyzer.cache is not None:
+        cache_stats = analyzer.cache.stats()
+        print(f"Analysis cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+    get_run_metrics().finish()
+    if any(text is None for text in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
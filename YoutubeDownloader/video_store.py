@@ -0,0 +1,267 @@
+"""
+Video Store - Content-addressable storage shared by the topic folders
+
+Every downloaded video is kept once under <library>/.store, keyed by video ID
+and rendition (the format it was downloaded with), and the topic folders hold
+hardlinks to the stored objects (symlinks where hardlinks are not supported,
+copies as a last resort). A video listed under several topics or channels is
+therefore downloaded and stored once; later topics get a link before any
+download is queued. The store records every link, so the report shows the
+downloads and bytes the deduplication saved.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from colorama import Fore, Style, init
+
+STORE_FOLDER = ".store"
+STORE_DB_FILE = "store.sqlite"
+
+# Plain format IDs ("18", "137+140", "hls-720p") name a rendition directly
+FORMAT_ID_PATTERN = re.compile(r"[\w.+-]+")
+
+
+def rendition_key(format: str) -> str:
+    """Rendition part of a store key: the format ID, or a digest of a selector"""
+    if FORMAT_ID_PATTERN.fullmatch(format):
+        return format
+    return "sel-" + hashlib.sha1(format.encode()).hexdigest()[:12]
+
+
+def link_file(source: str, dest: str) -> str:
+    """
+    Make dest point to source, replacing whatever dest was
+
+    Returns:
+        "hardlink", "symlink" or "copy", whichever succeeded first
+    """
+    tmp = f"{dest}.link-{os.getpid()}-{threading.get_ident()}"
+    try:
+        os.link(source, tmp)
+        method = "hardlink"
+    except OSError:
+        try:
+            os.symlink(os.path.relpath(source, os.path.dirname(os.path.abspath(dest))), tmp)
+            method = "symlink"
+        except OSError:
+            shutil.copy2(source, tmp)
+            method = "copy"
+    os.replace(tmp, dest)
+    return method
+
+
+class VideoStore:
+    def __init__(self, root: str):
+        """
+        Initialize the store
+
+        Args:
+            root: Folder holding the stored objects and the store database
+        """
+        os.makedirs(root, exist_ok=True)
+        self.root = os.path.abspath(root)
+        self.linked = 0
+        self.bytes_saved = 0
+        self.ingested = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(root, STORE_DB_FILE), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS objects (
+                video_id TEXT NOT NULL,
+                rendition TEXT NOT NULL,
+                path TEXT NOT NULL,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (video_id, rendition)
+            )"""
+        )
+        # downloaded is 1 for the link a download arrived through and 0 for
+        # links that replaced a download
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS links (
+                path TEXT PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                rendition TEXT NOT NULL,
+                method TEXT NOT NULL,
+                downloaded INTEGER NOT NULL,
+                linked_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def object_path(self, video_id: str, rendition: str, ext: str) -> str:
+        """Where the object of a video rendition is stored"""
+        return os.path.join(self.root, video_id[:2], video_id, f"{rendition}{ext}")
+
+    def lookup(self, video_id: str, rendition: str) -> Optional[Dict]:
+        """
+        Stored object of a video rendition
+
+        Returns:
+            {"path", "name", "size"} or None when the rendition is not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, name, size FROM objects WHERE video_id = ? AND rendition = ?",
+                (video_id, rendition),
+            ).fetchone()
+            if row is None:
+                return None
+            if not os.path.exists(row[0]):
+                # Deleted from outside; forget it so the video is downloaded again
+                self._conn.execute(
+                    "DELETE FROM objects WHERE video_id = ? AND rendition = ?",
+                    (video_id, rendition),
+                )
+                self._conn.commit()
+                return None
+        return {"path": row[0], "name": row[1], "size": row[2]}
+
+    def contains(self, path: str) -> bool:
+        """Whether a file already resolves to a stored object"""
+        return os.path.realpath(path).startswith(self.root + os.sep)
+
+    def ingest(self, video_id: str, rendition: str, filepath: str) -> str:
+        """
+        Move a finished file into the store and leave a link in its place
+
+        When the rendition is stored already, the file is replaced by a link
+        to the stored object instead. Library files downloaded before the
+        store existed are adopted the same way.
+
+        Args:
+            video_id: YouTube video ID
+            rendition: Key from rendition_key()
+            filepath: The downloaded file
+
+        Returns:
+            Path of the stored object
+        """
+        stored = self.lookup(video_id, rendition)
+        if self.contains(filepath):
+            return stored["path"] if stored else os.path.realpath(filepath)
+        if stored is not None and os.path.samefile(stored["path"], filepath):
+            return stored["path"]
+        if stored is None:
+            target = self.object_path(video_id, rendition, os.path.splitext(filepath)[1])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            size = os.path.getsize(filepath)
+            os.replace(filepath, target)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?)",
+                    (video_id, rendition, target, os.path.basename(filepath), size, time.time()),
+                )
+                self._conn.commit()
+                self.ingested += 1
+        else:
+            target = stored["path"]
+        self._record_link(video_id, rendition, filepath, link_file(target, filepath), True)
+        return target
+
+    def link_into(self, video_id: str, rendition: str, folder: str) -> Optional[str]:
+        """
+        Link a stored rendition into a folder instead of downloading it
+
+        Returns:
+            Path of the link, or None when the rendition is not stored
+        """
+        stored = self.lookup(video_id, rendition)
+        if stored is None:
+            return None
+        dest = os.path.abspath(os.path.join(folder, stored["name"]))
+        method = link_file(stored["path"], dest)
+        self._record_link(video_id, rendition, dest, method, False)
+        with self._lock:
+            self.linked += 1
+            self.bytes_saved += stored["size"]
+        print(f"{Fore.CYAN}Linked {stored['name']} from the store ({method}){Style.RESET_ALL}")
+        return dest
+
+    def _record_link(self, video_id: str, rendition: str, path: str, method: str, downloaded: bool):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(path), video_id, rendition, method, int(downloaded), time.time()),
+            )
+            self._conn.commit()
+
+    def report(self) -> Dict[str, int]:
+        """
+        Deduplication totals of the whole store and of this run
+
+        Returns:
+            Dict with objects/stored_bytes (on disk), links/linked_bytes (as
+            seen from the topic folders), downloads_saved/bytes_saved over the
+            store's lifetime and run_linked/run_bytes_saved/run_ingested
+        """
+        with self._lock:
+            objects, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()
+            links, linked_bytes, saved, saved_bytes = self._conn.execute(
+                """SELECT COUNT(*), COALESCE(SUM(o.size), 0),
+                          COALESCE(SUM(1 - l.downloaded), 0),
+                          COALESCE(SUM((1 - l.downloaded) * o.size), 0)
+                   FROM links l JOIN objects o
+                   ON l.video_id = o.video_id AND l.rendition = o.rendition"""
+            ).fetchone()
+        return {
+            "objects": objects,
+            "stored_bytes": stored_bytes,
+            "links": links,
+            "linked_bytes": linked_bytes,
+            "downloads_saved": saved,
+            "bytes_saved": saved_bytes,
+            "run_linked": self.linked,
+            "run_bytes_saved": self.bytes_saved,
+            "run_ingested": self.ingested,
+        }
+
+    def print_report(self, run: bool = True):
+        """Print the deduplication report (with this run's numbers if run is set)"""
+        report = self.report()
+        if run:
+            print(
+                f"{Fore.CYAN}Store: {report['run_linked']} downloads avoided this run "
+                f"({report['run_bytes_saved'] / (1024 * 1024):.1f} MB), "
+                f"{report['run_ingested']} new objects{Style.RESET_ALL}"
+            )
+        print(
+            f"Store: {report['objects']} objects ({report['stored_bytes'] / (1024 * 1024):.1f} MB) "
+            f"behind {report['links']} topic files ({report['linked_bytes'] / (1024 * 1024):.1f} MB); "
+            f"{report['downloads_saved']} downloads and "
+            f"{report['bytes_saved'] / (1024 * 1024):.1f} MB saved in total"
+        )
+
+
+def main():
+    init()
+    from YoutubeDownloader.autonomous_videos_collector import MAIN_FOLDER
+    from YoutubeDownloader.definitions import PROJECT_ROOT_DIR
+
+    parser = argparse.ArgumentParser(description="Deduplication report of the video store")
+    parser.add_argument(
+        "library",
+        nargs="?",
+        default=f"{PROJECT_ROOT_DIR}/{MAIN_FOLDER}",
+        help="Library folder holding the store (default: ZDataVideos)",
+    )
+    args = parser.parse_args()
+    VideoStore(os.path.join(args.library, STORE_FOLDER)).print_report(run=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,30 +5,36 @@ YouTube Downloader - Download multiple YouTube videos in specific formats
 
 import os
 import sys
+import copy
 import json
 import argparse
 from pathlib import Path
-from typing import List, Dict, Optional
-import yt_dlp
-from tqdm import tqdm
+from typing import List, Dict, Optional, Tuple, Union
 from colorama import init, Fore, Style
-from urllib.parse import urlparse, parse_qs
-
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
-
-FORMAT_OPTIONS = {
-    "best": "bestvideo+bestaudio/best",
-    "worst": "worstvideo+worstaudio/worst",
-    "mp4": "best[ext=mp4]/best",
-    "webm": "best[ext=webm]/best",
-    "360p": "best[height<=360]/best",
-    "720p": "best[height<=720]/best",
-    "1080p": "best[height<=1080]/best",
-    "audio_only": "bestaudio[ext=m4a]/bestaudio",
-    "audio_mp3": "bestaudio[ext=mp3]/bestaudio",
-}
 
+from YoutubeDownloader.bandwidth import configure_bandwidth, get_bandwidth_governor
+from YoutubeDownloader.clips import CLIP_OUTTMPL, clip_ydl_opts, parse_clip_lines, parse_range
+from YoutubeDownloader.concurrency import HostLimiter, map_bounded
+from YoutubeDownloader.definitions import FORMAT_OPTIONS
+from YoutubeDownloader.format_selection import StorageBudget, parse_size
+from YoutubeDownloader.fragments import FragmentTuner, parse_concurrent_fragments
+from YoutubeDownloader.job_journal import (
+    DEFAULT_JOURNAL_FILE,
+    DONE,
+    FAILED,
+    IN_PROGRESS,
+    QUEUED,
+    JobJournal,
+)
+from YoutubeDownloader.metadata_cache import extract_info, get_metadata_cache, video_id_from_url
+from YoutubeDownloader.metrics import configure_metrics, get_run_metrics
+from YoutubeDownloader.postprocess import (
+    create_postprocess_pool,
+    download_streams,
+    parse_postprocess_workers,
+)
+from YoutubeDownloader.progress import get_progress_dashboard
+from YoutubeDownloader.session_pool import get_session_pool
 
 class YouTubeDownloader:
     def __init__(
@@ -36,6 +42,13 @@ class YouTubeDownloader:
         output_dir: str = "downloads",
         format_preference: str = "best",
         verbose: bool = True,
+        workers: int = 1,
+        per_host_limit: Optional[int] = None,
+        max_video_bytes: Optional[int] = None,
+        concurrent_fragments: Union[int, str, None] = None,
+        max_total_fragments: Optional[int] = None,
+        postprocess_workers: Union[int, str, None] = None,
+        exact_cuts: bool = False,
     ):
         """
         Initialize the YouTube downloader
@@ -44,88 +57,141 @@ class YouTubeDownloader:
             output_dir: Directory to save downloaded videos
             format_preference: Preferred format (best, worst, mp4, webm, etc.)
             verbose: Enable verbose logging for debugging
+            workers: Number of downloads kept in flight by download_multiple
+            per_host_limit: Maximum concurrent downloads per host (None for no cap)
+            max_video_bytes: Pick the best rendition whose estimated size fits
+                this many bytes instead of format_preference (None for no budget)
+            concurrent_fragments: DASH/HLS fragments fetched in parallel per
+                video, or "auto" to tune it from measured throughput
+            max_total_fragments: Ceiling on fragments in flight across all
+                concurrent downloads (None for no ceiling)
+            postprocess_workers: Run ffmpeg merges on a process pool of this
+                size ("auto" for one per core) so downloads continue meanwhile;
+                None merges inline on the download worker
+            exact_cuts: Re-encode clips to cut exactly at the requested times
+                instead of copying from the nearest keyframes
         """
         self.output_dir = Path(output_dir)
         self.format_preference = format_preference
         self.verbose = verbose
-        self.output_dir.mkdir(exist_ok=True)
+        self.workers = max(1, workers)
+        self.per_host_limit = per_host_limit
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.dashboard = get_progress_dashboard()
+        self.metrics = get_run_metrics()
+        self.budget = StorageBudget(per_video=max_video_bytes)
+        self.fragments = FragmentTuner(concurrent_fragments, max_total_fragments)
+        self.postprocess = create_postprocess_pool(postprocess_workers)
+        self.exact_cuts = exact_cuts
 
         # Common format options
-        self.format_options = {
-            "best": "bestvideo+bestaudio/best",
-            "worst": "worstvideo+worstaudio/worst",
-            "mp4": "best[ext=mp4]/best",
-            "webm": "best[ext=webm]/best",
-            "720p": "best[height<=720]/best",
-            "1080p": "best[height<=1080]/best",
-            "audio_only": "bestaudio[ext=m4a]/bestaudio",
-            "audio_mp3": "bestaudio[ext=mp3]/bestaudio",
-        }
-
-    def get_available_formats(self, url: str) -> List[Dict]:
-        """Get available formats for a YouTube video"""
+        self.format_options = dict(FORMAT_OPTIONS)
+
+    def probe(self, url: str) -> Optional[Dict]:
+        """
+        Extract the info dict of a video once so it can be reused for format
+        listing and download without another network round trip
+
+        Args:
+            url: YouTube URL
+
+        Returns:
+            The yt-dlp info dict, or None if extraction failed
+        """
         try:
-            with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return info.get("formats", [])
+            with self.metrics.stage("probe", video_id_of(url)):
+                return extract_info(url, {"quiet": True})
         except Exception as e:
-            print(f"{Fore.RED}Error getting formats for {url}: {e}{Style.RESET_ALL}")
+            print(f"{Fore.RED}Error probing {url}: {e}{Style.RESET_ALL}")
+            return None
+
+    def get_available_formats(self, url: str, info: Optional[Dict] = None) -> List[Dict]:
+        """Get available formats for a YouTube video"""
+        info = info if info is not None else self.probe(url)
+        if info is None:
             return []
+        return info.get("formats", [])
 
-    def list_formats(self, url: str):
+    def list_formats(self, url: str, info: Optional[Dict] = None):
         """List all available formats for a video"""
         try:
-            with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
-                info = ydl.extract_info(url, download=False)
-                formats = info.get("formats", [])
-
-                print(f"\n{Fore.CYAN}Available formats for: {url}{Style.RESET_ALL}")
-                print("-" * 60)
-
-                for f in formats:
-                    if f.get("vcodec") != "none" and f.get("acodec") != "none":
-                        height = f.get("height", "N/A")
-                        ext = f.get("ext", "N/A")
-                        filesize = f.get("filesize")
-                        if filesize is not None:
-                            filesize = f"{filesize / (1024*1024):.1f}MB"
-                        else:
-                            filesize = "N/A"
-                        print(f"  {f['format_id']} | {height}p | {ext} | {filesize}")
+            if info is None:
+                info = extract_info(url, {"quiet": True})
+            formats = info.get("formats", [])
+
+            print(f"\n{Fore.CYAN}Available formats for: {url}{Style.RESET_ALL}")
+            print("-" * 60)
+
+            for f in formats:
+                if f.get("vcodec") != "none" and f.get("acodec") != "none":
+                    height = f.get("height", "N/A")
+                    ext = f.get("ext", "N/A")
+                    filesize = f.get("filesize")
+                    if filesize is not None:
+                        filesize = f"{filesize / (1024*1024):.1f}MB"
+                    else:
+                        filesize = "N/A"
+                    print(f"  {f['format_id']} | {height}p | {ext} | {filesize}")
         except Exception as e:
             print(f"{Fore.RED}Error getting formats: {e}{Style.RESET_ALL}")
 
-    def download_video(self, url: str, format_id: Optional[str] = None) -> bool:
+    def download_video(
+        self,
+        url: str,
+        format_id: Optional[str] = None,
+        info: Optional[Dict] = None,
+        extra_hooks: Optional[List] = None,
+        clips: Optional[List[Tuple[float, float]]] = None,
+        format_preference: Optional[str] = None,
+    ) -> bool:
         """
         Download a single video
 
         Args:
             url: YouTube URL
             format_id: Specific format ID to download (optional)
+            info: Info dict from probe(); skips a second extraction when given
+            extra_hooks: Additional yt-dlp progress hooks for this download only
+            clips: (start, end) ranges in seconds; only these segments are
+                downloaded, one file per range
+            format_preference: Key of format_options for this download only
+                (default: self.format_preference)
 
         Returns:
             bool: True if download successful, False otherwise
         """
         try:
+            if format_id is None and self.budget.enabled and info is not None:
+                # Size the rendition from the probed formats and pin its ID
+                format_id = self.budget.choose(info)
+                if format_id is None:
+                    return False
+
             # Configure yt-dlp options
             format_spec = (
                 format_id
                 if format_id
                 else self.format_options.get(
-                    self.format_preference, self.format_options["best"]
+                    format_preference or self.format_preference, self.format_options["best"]
                 )
             )
-            print(f"format_spec: {format_spec}")
 
-            # process url and get the v= field in the get params
-            parsed_url = urlparse(url)
-            query_params = parse_qs(parsed_url.query)
-            random_string = query_params.get("v", [""])[0]
+            # The video ID yt-dlp reports in info_dict["id"]; the fragment
+            # lease and the metrics are keyed by it so the hooks find them
+            random_string = video_id_of(url, info)
+            video_key = random_string or url
 
             ydl_opts = {
                 "format": format_spec,
                 "outtmpl": str(self.output_dir / f"%(title)s_{random_string}.%(ext)s"),
-                "progress_hooks": [self._progress_hook],
+                "progress_hooks": [
+                    self._progress_hook,
+                    self.metrics.progress_hook,
+                    self.fragments.progress_hook,
+                ]
+                + list(extra_hooks or []),
+                # Progress is drawn by the shared dashboard, not per download
+                "noprogress": True,
                 "ignoreerrors": False,
                 "no_warnings": False,
                 "extractaudio": False,
@@ -137,11 +203,22 @@ class YouTubeDownloader:
                 "subtitleslangs": ["en"],
                 "embed_subs": True,
             }
-            print(f"ydl_opts: {ydl_opts}")
+            # Block size settings the shared bandwidth governor relies on
+            ydl_opts.update(get_bandwidth_governor().ydl_opts())
+            # Postprocessor timings (ffmpeg merge, subtitle embed)
+            ydl_opts.update(self.metrics.hooks())
+            ydl_opts.update(self.fragments.ydl_opts(video_key))
+            if clips:
+                ydl_opts.update(clip_ydl_opts(clips, self.exact_cuts))
+                ydl_opts["outtmpl"] = str(
+                    self.output_dir / f"%(title)s_{CLIP_OUTTMPL}_{random_string}.%(ext)s"
+                )
+                # Subtitles of the whole video would not line up with a clip
+                ydl_opts.update({"writesubtitles": False, "writeautomaticsub": False, "embed_subs": False})
 
             # Add verbose logging if enabled
             if self.verbose:
-                print("Verbose mode enabled")
+                print(f"ydl_opts: {ydl_opts}")
                 ydl_opts.update(
                     {
                         "verbose": True,
@@ -153,22 +230,49 @@ class YouTubeDownloader:
                     f"{Fore.CYAN}Verbose mode enabled - showing detailed yt-dlp output{Style.RESET_ALL}"
                 )
 
-            print(f"\n{Fore.GREEN}Downloading: {url}{Style.RESET_ALL}")
-            print(f"Format: {format_spec}")
-            print(f"Output directory: {self.output_dir}")
+            # Written through the dashboard so the in-place status line stays intact
+            self.dashboard.write(f"\n{Fore.GREEN}Downloading: {url}{Style.RESET_ALL}")
+            self.dashboard.write(f"Format: {format_spec}")
+            if clips:
+                self.dashboard.write(
+                    f"Clips: {', '.join(f'{start:g}-{end:g}s' for start, end in clips)}"
+                )
             if self.verbose:
-                print(f"Video ID: {random_string}")
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-
-            print(f"{Fore.GREEN}✓ Download completed successfully!{Style.RESET_ALL}")
-            # output the file name
-            print(f"File name: {self.output_dir / '%(title)s.%(ext)s'}")
+                self.dashboard.write(f"Output directory: {self.output_dir}")
+                self.dashboard.write(f"Video ID: {random_string}")
+
+            merge_job = None
+            with self.metrics.downloading(video_key), self.fragments.lease(video_key) as fragments:
+                if self.fragments.enabled:
+                    ydl_opts["concurrent_fragment_downloads"] = fragments
+                # Pooled sessions keep extractors and keep-alive connections across videos
+                with self.metrics.stage("download", video_key), get_session_pool().session(ydl_opts) as ydl:
+                    # ffmpeg fetches and merges the streams of a clip in one pass
+                    if self.postprocess is not None and not clips:
+                        # Select the format up front so the streams of a merged
+                        # format are fetched as-is and merged on the pool
+                        if info is None:
+                            info = ydl.extract_info(url, download=False, process=False)
+                        selected = ydl.process_ie_result(copy.deepcopy(info), download=False)
+                        merge_job = download_streams(ydl, selected)
+                    if merge_job is None:
+                        if info is not None:
+                            # Format selection and download run on the probed info dict;
+                            # process_ie_result mutates it, so hand over a copy
+                            ydl.process_ie_result(copy.deepcopy(info), download=True)
+                        else:
+                            ydl.download([url])
+
+            if merge_job is not None:
+                # Blocks while the pool is full, holding this worker back
+                self.postprocess.submit(video_key, merge_job)
+                self.dashboard.write(f"{Fore.GREEN}✓ Streams downloaded, merge queued{Style.RESET_ALL}")
+                return True
+            self.dashboard.write(f"{Fore.GREEN}✓ Download completed successfully!{Style.RESET_ALL}")
             return True
 
         except Exception as e:
-            print(f"{Fore.RED}✗ Download failed: {e}{Style.RESET_ALL}")
+            self.dashboard.write(f"{Fore.RED}✗ Download failed: {e}{Style.RESET_ALL}")
             if self.verbose:
                 import traceback
 
@@ -176,18 +280,42 @@ class YouTubeDownloader:
                 traceback.print_exc()
             return False
 
-    def download_multiple(self, urls, format_id):
+    def probe_and_download(
+        self,
+        url: str,
+        format_id: Optional[str] = None,
+        clips: Optional[List[Tuple[float, float]]] = None,
+        format_preference: Optional[str] = None,
+    ) -> bool:
+        """Probe a video once and download it from the probed info dict"""
+        return self.download_video(
+            url, format_id, self.probe(url), clips=clips, format_preference=format_preference
+        )
+
+    def download_multiple(
+        self,
+        urls: List[str],
+        format_id: Optional[str] = None,
+        workers: Optional[int] = None,
+        journal: Optional[JobJournal] = None,
+        clips: Optional[Dict[str, List[Tuple[float, float]]]] = None,
+    ) -> Dict[str, bool]:
         """
         Download multiple videos
 
         Args:
             urls: List of YouTube URLs
             format_id: Specific format ID to download (optional)
+            workers: Number of downloads kept in flight (default: self.workers)
+            journal: Job journal recording each URL's state; URLs it already
+                records as done are skipped
+            clips: Mapping of URL to (start, end) ranges in seconds; only
+                those segments of the mapped URLs are downloaded
 
         Returns:
             Dict mapping URLs to success status
         """
-        results = {}
+        workers = max(1, workers or self.workers)
 
         print(
             f"{Fore.CYAN}Starting batch download of {len(urls)} videos...{Style.RESET_ALL}"
@@ -195,13 +323,90 @@ class YouTubeDownloader:
         print(f"Output directory: {self.output_dir}")
         print(f"Format preference: {self.format_preference}")
 
-        for i, url in enumerate(urls, 1):
-            print(
-                f"\n{Fore.YELLOW}[{i}/{len(urls)}] Processing: {url}{Style.RESET_ALL}"
-            )
-            formats = self.list_formats(url)
-            print(format_id)
-            results[url] = self.download_video(url, format_id)
+        # Two workers must never write the same video into the output
+        # directory, so in concurrent mode duplicate video IDs collapse onto
+        # a single download whose result is shared.
+        if self.fragments.enabled:
+            print(f"Fragment concurrency: {self.fragments.describe()}")
+        if workers > 1:
+            print(f"Workers: {workers}")
+            keys = {url: video_id_from_url(url) or url for url in urls}
+        else:
+            keys = {url: url for url in urls}
+        batch, seen = [], set()
+        for url in urls:
+            if keys[url] not in seen:
+                seen.add(keys[url])
+                batch.append(url)
+        # A collapsed duplicate contributes its ranges to the surviving URL
+        clips_by_key = {}
+        for url, ranges in (clips or {}).items():
+            clips_by_key.setdefault(keys.get(url, url), []).extend(ranges)
+
+        skipped = []
+        if journal is not None:
+            if any(journal.state(url) for url in batch):
+                journal.report_resume(batch)
+            pending = set(journal.pending(batch))
+            skipped = [url for url in batch if url not in pending]
+            batch = [url for url in batch if url in pending]
+            journal.mark_many(batch, QUEUED)
+
+        limiter = HostLimiter(self.per_host_limit)
+        total = len(batch)
+        # Key each URL's merge was queued under (see download_video)
+        merge_keys = {}
+
+        def process(item):
+            i, url = item
+            with limiter.limit(url):
+                self.dashboard.item_started()
+                self.dashboard.write(
+                    f"\n{Fore.YELLOW}[{i}/{total}] Processing: {url}{Style.RESET_ALL}"
+                )
+                # Probe once; the same info dict feeds format listing and download
+                info = self.probe(url)
+                # The format table is only readable when downloads run one by one
+                if workers == 1 and info is not None:
+                    self.list_formats(url, info)
+                if journal is not None:
+                    journal.mark(url, IN_PROGRESS)
+                success = self.download_video(
+                    url, format_id, info, clips=clips_by_key.get(keys[url])
+                )
+                merge_keys[url] = video_id_of(url, info) or url
+                merging = (
+                    success
+                    and self.postprocess is not None
+                    and self.postprocess.pending(merge_keys[url]) is not None
+                )
+                # A video being merged stays in progress until the merge is drained
+                if journal is not None and not merging:
+                    journal.mark(url, DONE if success else FAILED)
+                self.dashboard.item_done(success)
+                return success
+
+        self.dashboard.add_queued(total)
+        merged = {}
+        try:
+            outcome = map_bounded(process, enumerate(batch, 1), workers)
+            if self.postprocess is not None:
+                # Every stream is downloaded; wait for the merges still running
+                merged = self.postprocess.drain()
+        finally:
+            self.dashboard.flush()
+        for url in batch:
+            key = merge_keys.get(url)
+            if key in merged and journal is not None:
+                journal.mark(url, DONE if merged[key] else FAILED)
+        outcome = [
+            success and merged.get(merge_keys.get(url), True)
+            for url, success in zip(batch, outcome)
+        ]
+
+        outcome_by_key = {keys[url]: success for url, success in zip(batch, outcome)}
+        outcome_by_key.update({keys[url]: True for url in skipped})
+        results = {url: outcome_by_key[keys[url]] for url in urls}
 
         # Summary
         successful = sum(results.values())
@@ -210,9 +415,24 @@ class YouTubeDownloader:
         print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}DOWNLOAD SUMMARY{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
-        print(f"Total videos: {len(urls)}")
+        print(f"Total videos: {len(results)}")
         print(f"{Fore.GREEN}Successful: {successful}{Style.RESET_ALL}")
         print(f"{Fore.RED}Failed: {failed}{Style.RESET_ALL}")
+        cache_stats = get_metadata_cache().stats()
+        print(
+            f"Metadata cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses"
+        )
+        pool_stats = get_session_pool().stats()
+        print(
+            f"YoutubeDL sessions: {pool_stats['created']} created / {pool_stats['reused']} reused"
+        )
+        if self.postprocess is not None:
+            pp_stats = self.postprocess.stats()
+            print(
+                f"Post-processing: {pp_stats['completed']} merged / {pp_stats['failed']} failed "
+                f"on {pp_stats['workers']} processes, {pp_stats['cpu_seconds']:.1f}s in ffmpeg, "
+                f"downloads held back {pp_stats['blocked_seconds']:.1f}s"
+            )
 
         if failed > 0:
             print(f"\n{Fore.RED}Failed downloads:{Style.RESET_ALL}")
@@ -224,42 +444,19 @@ class YouTubeDownloader:
 
     def _progress_hook(self, d):
         """Progress hook for download progress"""
-        if d["status"] == "downloading":
-            if "total_bytes" in d and d["total_bytes"] is not None:
-                percent = d["downloaded_bytes"] / d["total_bytes"] * 100
-                speed = d.get("speed", 0)
-                if speed:
-                    speed_mb = speed / (1024 * 1024)
-                    print(
-                        f"\r{Fore.BLUE}Downloading: {percent:.1f}% | Speed: {speed_mb:.1f} MB/s{Style.RESET_ALL}",
-                        end="",
-                        flush=True,
-                    )
-                else:
-                    print(
-                        f"\r{Fore.BLUE}Downloading: {percent:.1f}%{Style.RESET_ALL}",
-                        end="",
-                        flush=True,
-                    )
-            else:
-                # Handle case where total_bytes is not available or None
-                downloaded = d.get("downloaded_bytes", 0)
-                speed = d.get("speed", 0)
-                if speed:
-                    speed_mb = speed / (1024 * 1024)
-                    print(
-                        f"\r{Fore.BLUE}Downloading: {downloaded} bytes | Speed: {speed_mb:.1f} MB/s{Style.RESET_ALL}",
-                        end="",
-                        flush=True,
-                    )
-                else:
-                    print(
-                        f"\r{Fore.BLUE}Downloading: {downloaded} bytes{Style.RESET_ALL}",
-                        end="",
-                        flush=True,
-                    )
-        elif d["status"] == "finished":
-            print(f"\n{Fore.GREEN}Download finished, processing...{Style.RESET_ALL}")
+        # Every written block is charged to the process-wide bandwidth budget
+        get_bandwidth_governor().progress_hook(d)
+        # Hooks only record state; the shared dashboard renders at a fixed rate
+        self.dashboard.hook(d)
+        if d["status"] == "finished":
+            self.dashboard.write(
+                f"{Fore.GREEN}Download finished, processing...{Style.RESET_ALL}"
+            )
+
+
+def video_id_of(url: str, info: Optional[Dict] = None) -> str:
+    """Video ID of a watch, youtu.be or shorts URL, else of its probed info dict"""
+    return video_id_from_url(url) or (info or {}).get("id") or ""
 
 
 def load_urls_from_file(filename: str) -> List[str]:
@@ -290,6 +487,8 @@ def save_urls_to_file(filename: str, urls: List[str]):
 
 
 def main():
+    # Initialize colorama for cross-platform colored output
+    init(autoreset=True)
     parser = argparse.ArgumentParser(
         description="Download YouTube videos in specific formats",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -309,6 +508,9 @@ Examples:
   
   # Download with specific format ID
   python youtube_downloader.py --format-id 22 "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+  # Download only two segments (input file lines may also list ranges after the URL)
+  python youtube_downloader.py --clip 0:11-0:20 --clip 2:05-2:40 "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         """,
     )
 
@@ -326,19 +528,14 @@ Examples:
         "-f",
         "--format",
         default="best",
-        choices=[
-            "best",
-            "worst",
-            "mp4",
-            "webm",
-            "720p",
-            "1080p",
-            "audio_only",
-            "audio_mp3",
-        ],
+        choices=list(FORMAT_OPTIONS),
         help="Preferred format (default: best)",
     )
     parser.add_argument("--format-id", help="Specific format ID to download")
+    parser.add_argument(
+        "--max-video-size",
+        help="Download the best rendition that fits this size, e.g. 300M, 1.5G",
+    )
     parser.add_argument(
         "-l",
         "--list-formats",
@@ -346,15 +543,85 @@ Examples:
         help="List available formats for URLs",
     )
     parser.add_argument("--save-urls", help="Save URLs to a file")
+    parser.add_argument(
+        "--clip",
+        action="append",
+        type=parse_range,
+        metavar="START-END",
+        help="Download only this time range of every URL, e.g. 1:30-2:05 (repeatable)",
+    )
+    parser.add_argument(
+        "--exact-cuts",
+        action="store_true",
+        help="Re-encode clips to cut exactly at the given times instead of at keyframes",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of downloads kept in flight (default: 1)",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        help="Maximum concurrent downloads per host (default: no cap)",
+    )
+    parser.add_argument(
+        "--limit-rate",
+        help="Total bandwidth across all downloads, e.g. 500K, 2M (default: unlimited)",
+    )
+    parser.add_argument(
+        "--limit-schedule",
+        help='Time-of-day limits overriding --limit-rate, e.g. "09:00-18:00=1M,18:00-23:00=5M"',
+    )
+    parser.add_argument(
+        "--concurrent-fragments",
+        type=parse_concurrent_fragments,
+        help='DASH/HLS fragments fetched in parallel per video, or "auto" to tune it',
+    )
+    parser.add_argument(
+        "--max-total-fragments",
+        type=int,
+        help="Ceiling on fragments in flight across all concurrent downloads",
+    )
+    parser.add_argument(
+        "--postprocess-workers",
+        type=parse_postprocess_workers,
+        help='Merge streams on a process pool of this size ("auto" for one per core) '
+        "while downloads continue (default: merge inline)",
+    )
+    parser.add_argument(
+        "--journal",
+        help=f"Job journal file (default: <output-dir>/{DEFAULT_JOURNAL_FILE})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the journaled batch: skip completed URLs, requeue interrupted ones",
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        help="Append per-stage timing events to this JSON-lines file",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        help="Write the run metrics for the node exporter textfile collector",
+    )
 
     args = parser.parse_args()
+    configure_metrics(args.metrics_jsonl)
 
-    # Collect URLs
-    urls = []
+    # Collect URLs; input file lines may list time ranges after the URL
+    lines = []
     if args.input_file:
-        urls.extend(load_urls_from_file(args.input_file))
+        lines.extend(load_urls_from_file(args.input_file))
     if args.urls:
-        urls.extend(args.urls)
+        lines.extend(args.urls)
+    try:
+        urls, clips = parse_clip_lines(lines, args.clip)
+    except ValueError as e:
+        parser.error(str(e))
 
     if not urls:
         print(
@@ -367,8 +634,20 @@ Examples:
     if args.save_urls:
         save_urls_to_file(args.save_urls, urls)
 
+    configure_bandwidth(args.limit_rate, args.limit_schedule)
+
     # Create downloader
-    downloader = YouTubeDownloader(args.output_dir, args.format)
+    downloader = YouTubeDownloader(
+        args.output_dir,
+        args.format,
+        workers=args.workers,
+        per_host_limit=args.per_host,
+        max_video_bytes=parse_size(args.max_video_size) if args.max_video_size else None,
+        concurrent_fragments=args.concurrent_fragments,
+        max_total_fragments=args.max_total_fragments,
+        postprocess_workers=args.postprocess_workers,
+        exact_cuts=args.exact_cuts,
+    )
 
     # List formats if requested
     if args.list_formats:
@@ -376,17 +655,28 @@ Examples:
             downloader.list_formats(url)
         return
 
-    # Download videos
-    downloader.download_multiple(urls, args.format_id)
+    # Download videos, journaling every state transition
+    journal_path = args.journal or str(Path(args.output_dir) / DEFAULT_JOURNAL_FILE)
+    with JobJournal(journal_path, resume=args.resume) as journal:
+        downloader.download_multiple(urls, args.format_id, journal=journal, clips=clips)
+    get_run_metrics().finish(args.prometheus_textfile)
 
 
-def download_urls(urls, output_dir, format_preference, verbose):
+def download_urls(
+    urls,
+    output_dir="downloads",
+    format_preference="best",
+    verbose=True,
+    workers=1,
+    resume=False,
+):
 
     # Create downloader instance
     downloader = YouTubeDownloader(
         output_dir=output_dir,
         format_preference=format_preference,  # Download in 720p quality
         verbose=verbose,
+        workers=workers,
     )
 
     # List available formats for first video
@@ -395,7 +685,11 @@ def download_urls(urls, output_dir, format_preference, verbose):
 
     # Download all videos
     print("\nStarting downloads...")
-    results = downloader.download_multiple(urls, format_preference)
+    journal_path = str(Path(output_dir) / DEFAULT_JOURNAL_FILE)
+    with JobJournal(journal_path, resume=resume) as journal:
+        results = downloader.download_multiple(
+            urls, format_preference, journal=journal
+        )
 
     # Print results
     print("\nDownload Results:")
@@ -5,18 +5,18 @@ YouTube Toolkit - Complete solution for extracting channel URLs and downloading
 
 import os
 import sys
+import queue
 import argparse
+import threading
 from pathlib import Path
 from typing import List
 from colorama import init, Fore, Style
 
 # Import our modules
-from channel_extractor import YouTubeChannelExtractor
+from YoutubeDownloader.channel_extractor import YouTubeChannelExtractor
+from YoutubeDownloader.harvest import AUTO, JSONL, PARQUET, CorpusWriter, Harvester
 from YoutubeDownloader.youtube_downloader import YouTubeDownloader
 
-# Initialize colorama
-init(autoreset=True)
-
 class YouTubeToolkit:
     def __init__(self, output_dir: str = "youtube_content"):
         """
@@ -31,6 +31,7 @@ class YouTubeToolkit:
         # Create subdirectories
         self.urls_dir = self.output_dir / "extracted_urls"
         self.downloads_dir = self.output_dir / "downloads"
+        self.corpus_dir = self.output_dir / "corpus"
         self.urls_dir.mkdir(exist_ok=True)
         self.downloads_dir.mkdir(exist_ok=True)
         
@@ -39,7 +40,8 @@ class YouTubeToolkit:
         self.downloader = YouTubeDownloader(str(self.downloads_dir))
     
     def extract_and_download(self, channels: List[str], format_preference: str = "720p", 
-                           max_videos: int = None, download: bool = True):
+                           max_videos: int = None, download: bool = True,
+                           stream: bool = False, workers: int = 4, queue_size: int = 32):
         """
         Extract URLs from channels and optionally download videos
         
@@ -48,11 +50,19 @@ class YouTubeToolkit:
             format_preference: Video format preference
             max_videos: Maximum videos per channel
             download: Whether to download videos after extraction
+            stream: Start downloading while channels are still being paged
+            workers: Number of download workers in streaming mode
+            queue_size: Maximum extracted URLs waiting for a download worker
         """
         print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}YouTube Toolkit - Extract & Download{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
         
+        if stream and download:
+            self.stream_extract_and_download(channels, format_preference, max_videos,
+                                             workers, queue_size)
+            return
+        
         # Step 1: Extract URLs
         print(f"\n{Fore.YELLOW}Step 1: Extracting URLs from {len(channels)} channels...{Style.RESET_ALL}")
         results = self.extractor.extract_multiple_channels(channels, max_videos)
@@ -89,6 +99,141 @@ class YouTubeToolkit:
         print(f"- URLs: {self.urls_dir / urls_file}")
         print(f"- Downloads: {self.downloads_dir}")
     
+    def stream_extract_and_download(self, channels: List[str], format_preference: str = "720p",
+                                    max_videos: int = None, workers: int = 4, queue_size: int = 32):
+        """
+        Download videos while the channels are still being extracted
+        
+        The extractor pages through each channel and puts every video URL on a
+        bounded queue that download workers drain right away. A full queue
+        blocks the extractor, so memory stays flat for very large channels.
+        An error or Ctrl-C in the calling thread stops the extractor and the
+        workers; downloads already running are not waited for.
+        
+        Args:
+            channels: List of channel URLs
+            format_preference: Video format preference
+            max_videos: Maximum videos per channel
+            workers: Number of download workers
+            queue_size: Maximum extracted URLs waiting for a download worker
+        """
+        urls_file = "extracted_urls.txt"
+        workers = max(1, workers)
+        url_queue = queue.Queue(maxsize=queue_size)
+        results = {}
+        results_lock = threading.Lock()
+        stop = threading.Event()
+        
+        dashboard = self.downloader.dashboard
+        
+        def put(item) -> bool:
+            # Wait for room in the queue, but give up once stopped
+            while not stop.is_set():
+                try:
+                    url_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            seen = set()
+            try:
+                with open(self.urls_dir / urls_file, 'w', encoding='utf-8') as f:
+                    f.write("# YouTube video URLs extracted from channel\n")
+                    f.write("# Generated by YouTube Toolkit (streaming)\n\n")
+                    for channel in channels:
+                        for url in self.extractor.iter_channel_urls(channel, max_videos):
+                            if stop.is_set():
+                                return
+                            if url in seen:
+                                continue
+                            seen.add(url)
+                            f.write(f"{url}\n")
+                            f.flush()
+                            dashboard.add_queued(1)
+                            if not put(url):
+                                return
+            finally:
+                for _ in range(workers):
+                    put(None)
+        
+        def consume():
+            while not stop.is_set():
+                try:
+                    url = url_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if url is None:
+                    return
+                dashboard.item_started()
+                success = self.downloader.probe_and_download(
+                    url, format_preference=format_preference
+                )
+                dashboard.item_done(success)
+                with results_lock:
+                    results[url] = success
+        
+        print(f"\n{Fore.YELLOW}Streaming {len(channels)} channels into {workers} download workers...{Style.RESET_ALL}")
+        # Daemon threads, so a download still running after a stop does not
+        # hold the interpreter open
+        threads = [threading.Thread(target=produce, name="extractor", daemon=True)]
+        threads += [
+            threading.Thread(target=consume, name=f"downloader-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            stop.set()
+            dashboard.flush()
+        
+        successful = sum(results.values())
+        print(f"\n{Fore.GREEN}✓ Extracted {len(results)} video URLs{Style.RESET_ALL}")
+        print(f"\n{Fore.GREEN}Download Summary: {successful}/{len(results)} videos downloaded successfully{Style.RESET_ALL}")
+        print(f"\n{Fore.CYAN}Files saved:{Style.RESET_ALL}")
+        print(f"- URLs: {self.urls_dir / urls_file}")
+        print(f"- Downloads: {self.downloads_dir}")
+        return results
+    
+    def harvest(self, urls: List[str], workers: int = 8, corpus_format: str = AUTO,
+                subtitles: bool = True, source: str = None):
+        """
+        Harvest metadata and English subtitles of videos, without their media
+        
+        Args:
+            urls: Video URLs
+            workers: Videos harvested concurrently
+            corpus_format: "parquet", "jsonl" or "auto"
+            subtitles: Fetch subtitles as well as metadata
+            source: Value of the corpus source column
+        """
+        writer = CorpusWriter(str(self.corpus_dir), corpus_format)
+        harvester = Harvester(writer, workers, subtitles=subtitles)
+        try:
+            results = harvester.harvest(urls, source)
+        finally:
+            writer.close()
+        harvester.print_summary()
+        return results
+    
+    def extract_and_harvest(self, channels: List[str], max_videos: int = None, workers: int = 8,
+                            corpus_format: str = AUTO, subtitles: bool = True):
+        """Extract URLs from channels and harvest each channel's videos into the corpus"""
+        print(f"{Fore.CYAN}Extracting URLs from {len(channels)} channels for harvesting...{Style.RESET_ALL}")
+        results = self.extractor.extract_multiple_channels(channels, max_videos)
+        writer = CorpusWriter(str(self.corpus_dir), corpus_format)
+        harvester = Harvester(writer, workers, subtitles=subtitles)
+        try:
+            for channel, urls in results.items():
+                harvester.harvest(urls, source=channel)
+        finally:
+            writer.close()
+        harvester.print_summary()
+    
     def extract_only(self, channels: List[str], max_videos: int = None, 
                     output_file: str = "channel_urls.txt"):
         """Extract URLs only, without downloading"""
@@ -131,6 +276,8 @@ class YouTubeToolkit:
         print(f"\n{Fore.GREEN}Download Summary: {successful}/{len(urls)} videos downloaded successfully{Style.RESET_ALL}")
 
 def main():
+    # Initialize colorama
+    init(autoreset=True)
     parser = argparse.ArgumentParser(
         description="YouTube Toolkit - Extract channel URLs and download videos",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -150,6 +297,9 @@ Examples:
   
   # Extract from channels and save URLs
   python youtube_toolkit.py -c "https://www.youtube.com/@example" --extract-only -o my_urls.txt
+  
+  # Harvest metadata and English subtitles only, into youtube_content/corpus
+  python youtube_toolkit.py -c "https://www.youtube.com/@example" --harvest -w 16
         """
     )
     
@@ -167,6 +317,17 @@ Examples:
                        help='Video format preference')
     parser.add_argument('-o', '--output-file', help='Output file for extracted URLs')
     parser.add_argument('-d', '--output-dir', default='youtube_content', help='Base output directory')
+    parser.add_argument('--stream', action='store_true',
+                       help='Start downloading while channels are still being extracted')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='Download workers in streaming mode (default: 4)')
+    parser.add_argument('--queue-size', type=int, default=32,
+                       help='Maximum extracted URLs waiting for a download worker (default: 32)')
+    parser.add_argument('--harvest', action='store_true',
+                       help='Collect metadata and English subtitles into <output-dir>/corpus instead of '
+                            'downloading media (-w sets the concurrent videos)')
+    parser.add_argument('--corpus-format', default=AUTO, choices=[AUTO, PARQUET, JSONL],
+                       help='Corpus part file format (default: parquet when pyarrow is installed, else jsonl)')
+    parser.add_argument('--no-subtitles', action='store_true', help='Harvest metadata only')
     
     args = parser.parse_args()
     
@@ -174,7 +335,13 @@ Examples:
     toolkit = YouTubeToolkit(args.output_dir)
     
     # Handle different modes
-    if args.download_only:
+    if args.download_only and args.harvest:
+        # Harvest the videos of a URL file
+        with open(args.download_only, 'r') as f:
+            urls = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        toolkit.harvest(urls, args.workers, args.corpus_format, not args.no_subtitles)
+    
+    elif args.download_only:
         # Download only mode
         toolkit.download_only(args.download_only, args.format)
     
@@ -195,13 +362,18 @@ Examples:
             print(f"{Fore.RED}Error: No channels provided{Style.RESET_ALL}")
             sys.exit(1)
         
-        if args.extract_only:
+        if args.harvest:
+            toolkit.extract_and_harvest(channels, args.max_videos, args.workers,
+                                        args.corpus_format, not args.no_subtitles)
+        elif args.extract_only:
             # Extract only
             output_file = args.output_file or "channel_urls.txt"
             toolkit.extract_only(channels, args.max_videos, output_file)
         else:
             # Extract and download
-            toolkit.extract_and_download(channels, args.format, args.max_videos, download=True)
+            toolkit.extract_and_download(channels, args.format, args.max_videos, download=True,
+                                         stream=args.stream, workers=args.workers,
+                                         queue_size=args.queue_size)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,7 +1,18 @@
-from YoutubeDownloader.channel_extractor import get_channel_urls
 from YoutubeDownloader.definitions import PROJECT_ROOT_DIR
 
+
+def parse_timestamp(value: str) -> float:
+    """Seconds from "SS", "MM:SS" or "HH:MM:SS" (fractions allowed)"""
+    seconds = 0.0
+    for part in value.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
 def parse_file(file_path):
+    # Imported here so the timestamp helper does not pull in the extractor
+    from YoutubeDownloader.channel_extractor import get_channel_urls
+
     with open(file_path, 'r') as file:
         lines = file.readlines()
 
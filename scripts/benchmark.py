@@ -0,0 +1,163 @@
+"""
+Offline benchmark of the download and extraction paths
+
+Runs YouTubeDownloader.download_multiple, YouTubeChannelExtractor.
+extract_multiple_channels, download_missing_videos and Harvester.harvest
+against the local fake YouTube backend, and VideoAnalyzer.analyze_many
+against the fake Gemini client, and reports wall time and throughput, so
+regressions show up without network access.
+
+    python scripts/benchmark.py --channels 2 --videos 10 --size 4M --bandwidth 2M -w 1 4
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import yaml
+
+from YoutubeDownloader import autonomous_videos_collector
+from YoutubeDownloader.bandwidth import parse_rate
+from YoutubeDownloader.channel_extractor import YouTubeChannelExtractor
+from YoutubeDownloader.format_selection import parse_size
+from YoutubeDownloader.harvest import CorpusWriter, Harvester
+from YoutubeDownloader.video_analysis import UploadRegistry, VideoAnalyzer
+from YoutubeDownloader.youtube_downloader import YouTubeDownloader
+
+# The fakes live next to this script, outside the installed package
+from fake_gemini import FakeGemini
+from fake_youtube import FakeYouTube, offline_youtube
+
+SCENARIOS = ("download", "extract", "collector", "analysis", "harvest")
+
+
+def bench_download(backend, workdir, workers):
+    downloader = YouTubeDownloader(
+        os.path.join(workdir, "downloads"), "720p", verbose=False, workers=workers
+    )
+    results = downloader.download_multiple(backend.video_urls)
+    return sum(results.values())
+
+
+def bench_extract(backend, workdir, workers):
+    extractor = YouTubeChannelExtractor(os.path.join(workdir, "urls"), workers=workers)
+    results = extractor.extract_multiple_channels(list(backend.channels))
+    return sum(len(urls) for urls in results.values())
+
+
+def bench_collector(backend, workdir, workers):
+    main_path = os.path.join(workdir, "library")
+    autonomous_videos_collector.prepare_main_folder(main_path)
+    with open(f"{main_path}/configs/{autonomous_videos_collector.MAIN_YAML_FILE}", "w") as f:
+        # Every other video is also listed under a topic of its own, which the
+        # video store links instead of downloading again
+        yaml.dump({"channel": list(backend.channels), "overlap": backend.video_urls[::2]}, f)
+    autonomous_videos_collector.download_missing_videos(
+        incremental=False, channel_workers=workers, main_path=main_path
+    )
+    manifest = autonomous_videos_collector.get_library_manifest(main_path)
+    topics = [autonomous_videos_collector.process_channel_name(c) for c in backend.channels]
+    topics.append("overlap")
+    return sum(len(manifest.topic_ids(topic)) for topic in topics)
+
+
+def bench_analysis(backend, workdir, workers):
+    # One file per fake video; every fourth file has the same content and
+    # must reuse the first one's upload
+    videos = os.path.join(workdir, "videos")
+    os.makedirs(videos)
+    paths = []
+    for index in range(len(backend.video_urls)):
+        path = os.path.join(videos, f"{index:04d}.mp4")
+        with open(path, "wb") as f:
+            f.write(os.urandom(backend.video_size) if index % 4 else b"x" * backend.video_size)
+        paths.append(path)
+    client = FakeGemini(generate_latency=backend.extract_latency * 5)
+    analyzer = VideoAnalyzer(
+        client, workers=workers, poll_min=0.05,
+        registry=UploadRegistry(os.path.join(workdir, "uploads.sqlite")),
+    )
+    results = analyzer.analyze_many(paths)
+    print(f"Gemini calls: {client.calls}")
+    return sum(text is not None for text in results.values())
+
+
+def bench_harvest(backend, workdir, workers):
+    writer = CorpusWriter(os.path.join(workdir, "corpus"), batch_size=max(1, len(backend.video_urls) // 4))
+    harvester = Harvester(writer, workers)
+    results = harvester.harvest(backend.video_urls)
+    writer.close()
+    harvester.print_summary()
+    return sum(results.values())
+
+
+BENCHMARKS = {
+    "download": bench_download,
+    "extract": bench_extract,
+    "collector": bench_collector,
+    "analysis": bench_analysis,
+    "harvest": bench_harvest,
+}
+
+
+def run(scenario, workers, args):
+    backend = FakeYouTube(
+        channels=args.channels,
+        videos_per_channel=args.videos,
+        video_size=args.size,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        extract_latency=args.extract_latency,
+    )
+    with tempfile.TemporaryDirectory() as workdir, offline_youtube(backend):
+        start = time.perf_counter()
+        items = BENCHMARKS[scenario](backend, workdir, workers)
+        wall = time.perf_counter() - start
+    return {
+        "scenario": scenario,
+        "workers": workers,
+        "items": items,
+        "wall_time": round(wall, 3),
+        "items_per_s": round(items / wall, 2) if wall else None,
+        "mb_per_s": round(backend.bytes_served / wall / (1024 * 1024), 2) if wall else None,
+        "bytes": backend.bytes_served,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline download/extraction benchmark")
+    parser.add_argument(
+        "-s", "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS),
+        help="Scenarios to run (default: all)",
+    )
+    parser.add_argument("--channels", type=int, default=2, help="Fake channels (default: 2)")
+    parser.add_argument("--videos", type=int, default=8, help="Videos per channel (default: 8)")
+    parser.add_argument("--size", type=parse_size, default="2M", help="Largest rendition size (default: 2M)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before each media response (default: 0.05)")
+    parser.add_argument("--bandwidth", type=parse_rate, help="Bytes/s per connection, e.g. 2M (default: unlimited)")
+    parser.add_argument("--extract-latency", type=float, default=0.1, help="Seconds per extract_info call (default: 0.1)")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[1, 4], help="Worker counts to compare (default: 1 4)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = [
+        run(scenario, workers, args)
+        for scenario in args.scenarios
+        for workers in args.workers
+    ]
+
+    print(f"\n{'Scenario':<10} {'Workers':>7} {'Items':>6} {'Wall (s)':>9} {'Items/s':>8} {'MB/s':>8}")
+    for r in results:
+        print(
+            f"{r['scenario']:<10} {r['workers']:>7} {r['items']:>6} {r['wall_time']:>9.2f} "
+            f"{r['items_per_s']:>8.2f} {r['mb_per_s']:>8.2f}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
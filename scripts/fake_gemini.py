@@ -0,0 +1,109 @@
+"""
+Fake Gemini - Local stand-in for the Gemini file and generation API
+
+Implements the GeminiClient methods the analysis pipeline calls: uploads take
+a configurable time per MB, files stay PROCESSING for a configurable time per
+MB, and generate_content answers after a fixed latency with a scene listing
+derived from the file. Call counters let benchmarks check upload reuse and
+polling behaviour without network access or an API key.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class FakeState:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeFile:
+    def __init__(self, name: str, display_name: str, size: int, ready_at: float):
+        self.name = name
+        self.display_name = display_name
+        self.uri = f"https://generativelanguage.invalid/v1beta/{name}"
+        self.size = size
+        self.ready_at = ready_at
+
+    @property
+    def state(self) -> FakeState:
+        return FakeState("ACTIVE" if time.monotonic() >= self.ready_at else "PROCESSING")
+
+
+class FakeGemini:
+    def __init__(
+        self,
+        upload_seconds_per_mb: float = 0.05,
+        processing_seconds_per_mb: float = 0.5,
+        generate_latency: float = 0.5,
+        scenes: int = 5,
+    ):
+        """
+        Initialize the stand-in
+
+        Args:
+            upload_seconds_per_mb: Time upload_file takes per MB
+            processing_seconds_per_mb: Time a file stays PROCESSING per MB
+            generate_latency: Time generate_content takes
+            scenes: Scenes listed in every response
+        """
+        self.upload_seconds_per_mb = upload_seconds_per_mb
+        self.processing_seconds_per_mb = processing_seconds_per_mb
+        self.generate_latency = generate_latency
+        self.scenes = scenes
+        self._lock = threading.Lock()
+        self._files: Dict[str, FakeFile] = {}
+        self.calls = {"upload_file": 0, "get_file": 0, "generate_content": 0}
+
+    def _count(self, call: str):
+        with self._lock:
+            self.calls[call] += 1
+
+    def upload_file(self, path: str, display_name: Optional[str] = None) -> FakeFile:
+        self._count("upload_file")
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        time.sleep(size_mb * self.upload_seconds_per_mb)
+        with self._lock:
+            name = f"files/fake{len(self._files):06d}"
+            self._files[name] = FakeFile(
+                name, display_name or os.path.basename(path), os.path.getsize(path),
+                time.monotonic() + size_mb * self.processing_seconds_per_mb,
+            )
+            return self._files[name]
+
+    def get_file(self, name: str) -> FakeFile:
+        self._count("get_file")
+        with self._lock:
+            if name not in self._files:
+                raise KeyError(f"File {name} not found")
+            return self._files[name]
+
+    def forget(self, name: str):
+        """Drop an uploaded file, as Gemini does after 48 hours"""
+        with self._lock:
+            self._files.pop(name, None)
+
+    def generate_content(
+        self,
+        model_name: str,
+        parts: List,
+        generation_config: Optional[Dict] = None,
+        timeout: float = 600,
+    ) -> str:
+        self._count("generate_content")
+        video_file = next(part for part in parts if isinstance(part, FakeFile))
+        if video_file.state.name != "ACTIVE":
+            raise ValueError(f"File {video_file.name} is not in an ACTIVE state")
+        time.sleep(self.generate_latency)
+        lines = [f"Scene breakdown of {video_file.display_name} ({model_name}):", ""]
+        for index in range(self.scenes):
+            start, end = index * 10, index * 10 + 9
+            lines += [
+                f"**Scene {index + 1}: Step {index + 1}**",
+                f"* **Time:** {start // 60:02d}:{start % 60:02d} - {end // 60:02d}:{end % 60:02d}",
+                f"* **Description:** Step {index + 1} of {video_file.display_name}.",
+                "",
+            ]
+        return "\n".join(lines)
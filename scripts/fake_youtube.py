@@ -0,0 +1,263 @@
+"""
+Fake YouTube - Local stand-in backend for offline benchmarks
+
+A threaded HTTP server serves synthetic media (and English captions) with
+configurable latency and per-connection bandwidth, and a stub extractor
+answers yt-dlp extract_info calls with recorded info dicts and flat channel
+listings whose formats point at that server. Downloads still go through the real yt-dlp download path.
+"""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from unittest import mock
+
+import yt_dlp
+
+from YoutubeDownloader import channel_sync, metadata_cache
+
+CHUNK_SIZE = 64 * 1024
+MEDIA_PATH = re.compile(r"^/media/([A-Za-z0-9_-]{11})/(\d+)\.mp4$")
+SUBTITLE_PATH = re.compile(r"^/subs/([A-Za-z0-9_-]{11})\.en\.vtt$")
+VIDEO_URL = re.compile(r"[?&]v=([A-Za-z0-9_-]{11})")
+
+# Progressive renditions offered for every video: format ID, height, share of
+# the nominal video size
+RENDITIONS = [("18", 360, 0.4), ("22", 720, 1.0)]
+
+
+class FakeYouTube:
+    def __init__(
+        self,
+        channels: int = 2,
+        videos_per_channel: int = 10,
+        video_size: int = 2 * 1024 * 1024,
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+        extract_latency: float = 0.0,
+    ):
+        """
+        Initialize the fake backend
+
+        Args:
+            channels: Number of fake channels
+            videos_per_channel: Videos listed by each channel
+            video_size: Size in bytes of the largest rendition of a video
+            latency: Seconds before the server answers a media request
+            bandwidth: Bytes per second per connection (None for unlimited)
+            extract_latency: Seconds every stub extract_info call takes
+        """
+        self.video_size = video_size
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.extract_latency = extract_latency
+        self.channels: Dict[str, List[str]] = {}
+        for c in range(channels):
+            ids = [f"c{c:02d}v{v:06d}"[:11].ljust(11, "x") for v in range(videos_per_channel)]
+            self.channels[f"https://www.youtube.com/@fakechannel{c}"] = ids
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._block = os.urandom(CHUNK_SIZE)
+
+    @property
+    def video_urls(self) -> List[str]:
+        return [watch_url(video_id) for ids in self.channels.values() for video_id in ids]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rendition_size(self, fmt: str) -> int:
+        share = dict((f, s) for f, _, s in RENDITIONS)[fmt]
+        return int(self.video_size * share)
+
+    # ---- HTTP server ----
+
+    def start(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                backend._serve(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def subtitle_vtt(self, video_id: str) -> str:
+        """Automatic English captions of a video, rolled up like YouTube's"""
+        cues = ["WEBVTT", "Kind: captions", "Language: en", ""]
+        previous = ""
+        for index in range(12):
+            line = f"line {index} of {video_id}"
+            cues += [
+                f"00:00:{index * 5:02d}.000 --> 00:{(index * 5 + 5) // 60:02d}:{(index * 5 + 5) % 60:02d}.000",
+                previous,
+                f"<c>{line}</c>",
+                "",
+            ]
+            previous = line
+        return "\n".join(cues)
+
+    def _serve(self, request):
+        subtitle = SUBTITLE_PATH.match(request.path)
+        if subtitle:
+            if self.latency:
+                time.sleep(self.latency)
+            body = self.subtitle_vtt(subtitle.group(1)).encode()
+            request.send_response(200)
+            request.send_header("Content-Type", "text/vtt")
+            request.send_header("Content-Length", str(len(body)))
+            request.end_headers()
+            request.wfile.write(body)
+            with self._lock:
+                self.bytes_served += len(body)
+            return
+        match = MEDIA_PATH.match(request.path)
+        if not match:
+            request.send_error(404)
+            return
+        size = self.rendition_size(match.group(2))
+        start = 0
+        range_match = re.match(r"bytes=(\d+)-", request.headers.get("Range", ""))
+        if range_match:
+            start = min(int(range_match.group(1)), size)
+        if self.latency:
+            time.sleep(self.latency)
+        request.send_response(206 if range_match else 200)
+        request.send_header("Content-Type", "video/mp4")
+        request.send_header("Content-Length", str(size - start))
+        request.send_header("Accept-Ranges", "bytes")
+        if range_match:
+            request.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        request.end_headers()
+        sent = start
+        began = time.monotonic()
+        try:
+            while sent < size:
+                chunk = self._block[: min(CHUNK_SIZE, size - sent)]
+                request.wfile.write(chunk)
+                sent += len(chunk)
+                with self._lock:
+                    self.bytes_served += len(chunk)
+                if self.bandwidth:
+                    ahead = (sent - start) / self.bandwidth - (time.monotonic() - began)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    # ---- Stub extractor ----
+
+    def video_info(self, video_id: str) -> Dict:
+        """Recorded info dict of a video, with formats served locally"""
+        formats = [
+            {
+                "format_id": fmt,
+                "url": f"{self.base_url}/media/{video_id}/{fmt}.mp4",
+                "ext": "mp4",
+                "protocol": "http",
+                "height": height,
+                "width": height * 16 // 9,
+                "vcodec": "avc1.4d401e",
+                "acodec": "mp4a.40.2",
+                "filesize": self.rendition_size(fmt),
+            }
+            for fmt, height, _ in RENDITIONS
+        ]
+        return {
+            "id": video_id,
+            "title": f"Fake video {video_id}",
+            "duration": 60,
+            "description": f"Description of fake video {video_id}",
+            "channel": "Fake channel",
+            "formats": formats,
+            "automatic_captions": {
+                "en": [{"ext": "vtt", "url": f"{self.base_url}/subs/{video_id}.en.vtt"}],
+            },
+            "webpage_url": watch_url(video_id),
+            "original_url": watch_url(video_id),
+            "extractor": "youtube",
+            "extractor_key": "Youtube",
+        }
+
+    def channel_info(self, channel_url: str, playlistend: Optional[int] = None, lazy: bool = False) -> Dict:
+        """Recorded flat listing of a channel"""
+        ids = self.channels[channel_url][:playlistend]
+        entries = (
+            {"_type": "url", "ie_key": "Youtube", "id": video_id,
+             "url": watch_url(video_id), "title": f"Fake video {video_id}"}
+            for video_id in ids
+        )
+        return {
+            "_type": "playlist",
+            "id": channel_url.rsplit("@", 1)[-1],
+            "title": channel_url.rsplit("@", 1)[-1],
+            "webpage_url": channel_url,
+            "extractor": "youtube:tab",
+            "extractor_key": "YoutubeTab",
+            "entries": entries if lazy else list(entries),
+        }
+
+    def extract_info(self, ydl, url, download=True, ie_key=None, extra_info=None,
+                     process=True, force_generic_extractor=False):
+        """Stand-in for yt_dlp.YoutubeDL.extract_info"""
+        if self.extract_latency:
+            time.sleep(self.extract_latency)
+        if url in self.channels:
+            return self.channel_info(url, ydl.params.get("playlistend"), lazy=not process)
+        match = VIDEO_URL.search(url)
+        if not match:
+            raise yt_dlp.utils.DownloadError(f"Unsupported URL: {url}")
+        info = self.video_info(match.group(1))
+        if not process:
+            return info
+        return ydl.process_ie_result(info, download=download)
+
+
+def watch_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+@contextmanager
+def offline_youtube(backend: FakeYouTube, cache_dir: Optional[str] = None):
+    """
+    Route yt-dlp extraction to the fake backend for the duration of the block
+
+    The metadata cache and channel sync state are replaced by fresh ones in
+    cache_dir (a temporary directory by default) so benchmark runs neither
+    read nor pollute the real caches.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = cache_dir or tmp
+        backend.start()
+
+        def extract_info(ydl, *args, **kwargs):
+            return backend.extract_info(ydl, *args, **kwargs)
+
+        try:
+            with mock.patch.object(yt_dlp.YoutubeDL, "extract_info", extract_info), \
+                 mock.patch.object(metadata_cache, "_cache", metadata_cache.MetadataCache(
+                     os.path.join(cache_dir, metadata_cache.METADATA_DB_FILE))), \
+                 mock.patch.object(channel_sync, "_state", channel_sync.ChannelSyncState(
+                     os.path.join(cache_dir, channel_sync.CHANNEL_SYNC_DB_FILE))):
+                yield backend
+        finally:
+            backend.stop()
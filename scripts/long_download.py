@@ -1,8 +1,22 @@
+import argparse
+
 from YoutubeDownloader.definitions import PROJECT_ROOT_DIR
 from YoutubeDownloader import youtube_utils 
 from YoutubeDownloader import youtube_downloader
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output-dir", default="downloads", help="Output directory")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Downloads kept in flight")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip URLs the job journal records as done and requeue interrupted ones",
+    )
+    args = parser.parse_args()
+
     urls = youtube_utils.parse_file(f"{PROJECT_ROOT_DIR}/scripts/long_list.txt")
     print(f"Total urls: {len(urls)}")
-    youtube_downloader.download_urls(urls)
+    youtube_downloader.download_urls(
+        urls, output_dir=args.output_dir, workers=args.workers, resume=args.resume
+    )
@@ -0,0 +1,84 @@
+"""
+Startup-time benchmark of the command line tools
+
+Runs each command in a fresh interpreter several times and reports the best
+and median wall time, so import-time regressions (a heavy module imported at
+the top level, work done at import) show up before they reach cron.
+
+    python scripts/startup_benchmark.py -n 10 --importtime
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from YoutubeDownloader.definitions import PROJECT_ROOT_DIR
+
+COMMANDS = {
+    "interpreter": ["-c", "pass"],
+    "cli --help": ["-m", "YoutubeDownloader.cli", "--help"],
+    "download --help": ["-m", "YoutubeDownloader.youtube_downloader", "--help"],
+    "extract --help": ["-m", "YoutubeDownloader.channel_extractor", "--help"],
+    "toolkit --help": ["-m", "YoutubeDownloader.youtube_toolkit", "--help"],
+    "collect --help": ["-m", "YoutubeDownloader.autonomous_videos_collector", "--help"],
+    "import yt_dlp": ["-c", "import yt_dlp"],
+}
+
+
+def time_command(args, runs):
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT_DIR)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + args, env=env, cwd=PROJECT_ROOT_DIR,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False,
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def slowest_imports(args, top):
+    """The top cumulative imports of a command, from python -X importtime"""
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args, env=env, cwd=PROJECT_ROOT_DIR,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command line startup-time benchmark")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Runs per command (default: 5)")
+    parser.add_argument(
+        "--importtime", action="store_true",
+        help="Also list the slowest imports of each command",
+    )
+    args = parser.parse_args()
+
+    print(f"{'Command':<18} {'Best (ms)':>10} {'Median (ms)':>12}")
+    for name, command in COMMANDS.items():
+        best, median = time_command(command, args.runs)
+        print(f"{name:<18} {best * 1000:>10.1f} {median * 1000:>12.1f}")
+
+    if args.importtime:
+        for name, command in COMMANDS.items():
+            if command[0] != "-m":
+                continue
+            print(f"\n{name}:")
+            for cumulative, module in slowest_imports(command, 8):
+                print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()